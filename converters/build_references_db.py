@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Run from the project root: python3 converters/build_references_db.py [--export]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from book_normalizer import BookNormalizer
+from references_sqlite import SqliteReferenceDatabase, REFERENCES_DB_FILENAME
+
+# Configuration
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+DB_PATH = os.environ.get("SCRIPTURES_REFERENCES_DB", os.path.join(DATA_DIR, REFERENCES_DB_FILENAME))
+
+if __name__ == '__main__':
+    db = SqliteReferenceDatabase(DATA_DIR, BookNormalizer(DATA_DIR), db_path=DB_PATH)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--export":
+        # Write every collection back to data/references_*.json
+        for filename in db.collections():
+            print(f"  {db.export_json(filename)}")
+        print("Export complete.")
+    else:
+        # Import the given files, or every data/references_*.json
+        filenames = sys.argv[1:] or None
+        print(f"Importing cross-references into {DB_PATH}...")
+        for filename, count in db.import_json(filenames).items():
+            print(f"  {filename}: {count} relations")
+        print("Import complete.")
+    db.close()
@@ -0,0 +1,33 @@
+import os
+import sys
+
+# Run from the project root: python3 converters/build_search_index.py [VERSIONS]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from application.services import AdapterFactory
+from search_index import FullTextIndex, search_index_dir
+from morphology_index import MorphologyIndexes
+
+# Configuration
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+INDEX_DIR = search_index_dir(DATA_DIR)
+
+# Versions to index (versions without verses are skipped)
+VERSIONS = ["N1904", "N1904_EN", "LXX", "BHSA", "TOB", "BJ", "NAV"]
+
+if __name__ == '__main__':
+    versions = sys.argv[1].split(",") if len(sys.argv) > 1 else VERSIONS
+    print(f"Indexing {', '.join(versions)} into {INDEX_DIR}...")
+
+    # Verse store when exported (make verse-store), Text-Fabric otherwise
+    adapter = AdapterFactory.get()
+    index = FullTextIndex(INDEX_DIR, adapter.normalizer.book_codes, adapter)
+    morphology = MorphologyIndexes(INDEX_DIR, adapter.normalizer.book_codes, adapter)
+    for version in versions:
+        print(f"  {version.upper()}: {index.build(version)} verses")
+        # Versions with word features (N1904, BHSA) also get a lemma/morphology index
+        words = morphology.build(version)
+        if words:
+            print(f"  {version.upper()}: {words} words (morphology)")
+    print("Indexing complete.")
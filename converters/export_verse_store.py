@@ -0,0 +1,32 @@
+import os
+import sys
+
+# Run from the project root: python3 converters/export_verse_store.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from application.services import build_text_fabric_adapter
+from adapters.verse_store import write_verse_store, STORE_FILENAME
+
+# Configuration
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+OUTPUT_PATH = os.environ.get("SCRIPTURES_VERSE_STORE", os.path.join(DATA_DIR, STORE_FILENAME))
+
+# Versions to export (datasets that are not installed are skipped: served by Text-Fabric)
+VERSIONS = ["N1904", "N1904_EN", "LXX", "BHSA", "TOB", "BJ", "NAV"]
+
+if __name__ == '__main__':
+    versions = sys.argv[1].split(",") if len(sys.argv) > 1 else VERSIONS
+    print(f"Exporting {', '.join(versions)} to {OUTPUT_PATH}...")
+
+    adapter = build_text_fabric_adapter(DATA_DIR)
+    book_codes = sorted(adapter.normalizer.book_order, key=adapter.normalizer.book_order.get)
+
+    counts = write_verse_store(
+        OUTPUT_PATH,
+        book_codes,
+        {v.upper(): adapter.iter_verse_texts(v) for v in versions},
+    )
+    for version, count in counts.items():
+        print(f"  {version}: {count} verses" if count else f"  {version}: not installed, skipped")
+    print("Export complete.")
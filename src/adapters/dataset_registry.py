@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import threading
+import contextlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from domain.models import DatasetState, DatasetStatus
+
+DATASETS = ("n1904", "lxx", "bhsa", "tob", "bj", "nav")
+
+# Version code -> dataset it is read from
+VERSION_DATASETS = {
+    "N1904": "n1904",
+    "N1904_EN": "n1904",
+    "LXX": "lxx",
+    "BHSA": "bhsa",
+    "TOB": "tob",
+    "BJ": "bj",
+    "NAV": "nav",
+}
+
+
+def parse_dataset_list(value: Optional[str]) -> List[str]:
+    """
+    Parses a comma-separated list of versions or datasets ("N1904,BHSA,TOB", "all")
+    into dataset names, in order and without duplicates. Unknown names are ignored.
+    """
+    datasets = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item.lower() == "all":
+            names = DATASETS
+        else:
+            name = VERSION_DATASETS.get(item.upper(), item.lower())
+            names = (name,) if name in DATASETS else ()
+        for name in names:
+            if name not in datasets:
+                datasets.append(name)
+    return datasets
+
+
+_silence_lock = threading.Lock()
+_silence_depth = 0
+_saved_stdout = None
+
+
+@contextlib.contextmanager
+def silenced_stdout():
+    """
+    Sends stdout to devnull while Text-Fabric loads.
+    Unlike nested contextlib.redirect_stdout calls, this is safe when several
+    datasets load in parallel threads: stdout is swapped once and restored
+    when the last loader leaves.
+    """
+    global _silence_depth, _saved_stdout
+    with _silence_lock:
+        if _silence_depth == 0:
+            _saved_stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w')
+        _silence_depth += 1
+    try:
+        yield
+    finally:
+        with _silence_lock:
+            _silence_depth -= 1
+            if _silence_depth == 0:
+                devnull, sys.stdout = sys.stdout, _saved_stdout
+                _saved_stdout = None
+                devnull.close()
+
+
+class DatasetRegistry:
+    """
+    Single-flight loading and load-state tracking for the Text-Fabric datasets.
+
+    Concurrent callers of `load()` for the same dataset wait on the one load in
+    progress instead of each starting their own (multi-GB) load. A failed load
+    (exception or None) is recorded as FAILED and retried by the next caller.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._values: Dict[str, Any] = {}
+        self._states: Dict[str, DatasetState] = {}
+        for name in names:
+            self._states[name] = DatasetState(name=name)
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+                self._states.setdefault(name, DatasetState(name=name))
+            return lock
+
+    def _set_state(self, name: str, **fields):
+        with self._guard:
+            self._states[name] = DatasetState(name=name, **fields)
+
+    def load(self, name: str, loader: Callable[[], Any]) -> Optional[Any]:
+        value = self._values.get(name)
+        if value is not None:
+            return value
+
+        with self._lock_for(name):
+            # Another caller may have finished the load while we waited
+            value = self._values.get(name)
+            if value is not None:
+                return value
+
+            self._set_state(name, status=DatasetStatus.LOADING)
+            start = time.perf_counter()
+            error = None
+            try:
+                value = loader()
+            except Exception as e:
+                value = None
+                error = str(e) or type(e).__name__
+            elapsed = round(time.perf_counter() - start, 3)
+
+            if value is None:
+                self._set_state(name, status=DatasetStatus.FAILED, load_seconds=elapsed,
+                                error=error or "dataset not available")
+                return None
+
+            self._values[name] = value
+            self._set_state(name, status=DatasetStatus.READY, load_seconds=elapsed)
+            return value
+
+    def get(self, name: str) -> Optional[Any]:
+        """Returns the loaded value without triggering a load."""
+        return self._values.get(name)
+
+    def state(self, name: str) -> DatasetState:
+        with self._guard:
+            return self._states.get(name) or DatasetState(name=name)
+
+    def states(self) -> Dict[str, DatasetState]:
+        with self._guard:
+            return dict(self._states)
+
+    def is_ready(self, name: str) -> bool:
+        return self.state(name).status == DatasetStatus.READY
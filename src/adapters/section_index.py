@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional, Tuple, Iterable
+
+
+class SectionIndex:
+    """
+    Precomputed (book_code, chapter, verse) -> node lookup for one Text-Fabric dataset.
+
+    Built once per loaded dataset by walking its verse nodes, so that verse and
+    chapter lookups are a single dict probe instead of a chain of
+    `T.nodeFromSection` attempts over candidate book names.
+    """
+
+    def __init__(self):
+        self.verses: Dict[Tuple[str, int, int], int] = {}
+        # (book_code, chapter) -> [(verse, node), ...] in canonical order
+        self.chapters: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
+
+    def __len__(self):
+        return len(self.verses)
+
+    def add(self, book_code: str, chapter: int, verse: int, node: int):
+        key = (book_code, chapter, verse)
+        if key in self.verses:
+            return
+        self.verses[key] = node
+        self.chapters.setdefault((book_code, chapter), []).append((verse, node))
+
+    def verse_node(self, book_code: str, chapter: int, verse: int) -> Optional[int]:
+        return self.verses.get((book_code, int(chapter), int(verse)))
+
+    def chapter_nodes(self, book_code: str, chapter: int) -> List[Tuple[int, int]]:
+        return self.chapters.get((book_code, int(chapter)), [])
+
+    @classmethod
+    def build(cls, api, name_to_code: Dict[str, str]) -> "SectionIndex":
+        """
+        Walk every verse node of `api` and key it by our book code.
+        `name_to_code` maps the dataset's own book names to book codes.
+        Verses whose book name is unknown or whose numbers are not integers are skipped.
+        """
+        index = cls()
+        try:
+            verse_nodes = api.F.otype.s('verse')
+            section_from_node = api.T.sectionFromNode
+        except Exception:
+            return index
+
+        for node in _safe_iter(verse_nodes):
+            try:
+                section = section_from_node(node)
+                book_name, chapter, verse = section[0], section[1], section[2]
+                book_code = name_to_code.get(book_name)
+                if not book_code:
+                    continue
+                index.add(book_code, int(chapter), int(verse), node)
+            except (TypeError, ValueError, IndexError):
+                continue
+        return index
+
+
+def _safe_iter(nodes) -> Iterable:
+    try:
+        return iter(nodes)
+    except TypeError:
+        return iter(())
@@ -1,12 +1,31 @@
 import os
-import contextlib
-from typing import List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Any, Dict
 from tf.app import use
 from tf.fabric import Fabric
 
 from ports.bible_provider import BibleProvider, MetadataProvider
-from domain.models import Verse, Book, VerseCrossReferences, Language, CrossReferenceType
+from domain.models import Verse, Book, VerseCrossReferences, Language, CrossReferenceType, DatasetState
 from book_normalizer import BookNormalizer
+from adapters.section_index import SectionIndex
+from adapters.dataset_registry import DatasetRegistry, DATASETS, VERSION_DATASETS, silenced_stdout
+from search_index import FullTextIndex, search_index_dir
+
+# Datasets loaded as TF apps (api under `.api`); the others are plain TF apis
+APP_DATASETS = ("n1904", "lxx", "bhsa")
+
+# Word features read into the morphology index: index field -> dataset feature(s), first found wins
+WORD_FEATURES = {
+    "N1904": {
+        "form": ("text", "unicode"), "lemma": ("lemma",), "sp": ("sp",), "tense": ("tense",),
+        "voice": ("voice",), "mood": ("mood",), "case": ("case",), "person": ("person",),
+        "number": ("number",), "gender": ("gender",),
+    },
+    "BHSA": {
+        "form": ("g_word_utf8",), "lemma": ("lex_utf8",), "sp": ("sp",), "tense": ("vt",),
+        "stem": ("vs",), "person": ("ps",), "number": ("nu",), "gender": ("gn",),
+    },
+}
 
 class TextFabricAdapter(BibleProvider, MetadataProvider):
     def __init__(self, data_dir: str, n1904_provider=None, lxx_provider=None, bhsa_provider=None, tob_provider=None, bj_provider=None, nav_provider=None):
@@ -28,6 +47,15 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         self._tob_api = None
         self._bj_api = None
         self._nav_api = None 
+
+        # Section indexes, one per loaded dataset (see _section_index)
+        self._section_indexes = {}
+
+        # Full-text search indexes, opened or built on first search
+        self._fulltext = None
+
+        # Load state and single-flight locks for the datasets above
+        self.datasets = DatasetRegistry(DATASETS)
         
         # Paths (should be injected via config, but hardcoded for now matching main.py)
         self.tob_dir = os.path.expanduser("~/text-fabric-data/TOB/1.0/")
@@ -36,106 +64,254 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         self.lxx_dir = os.path.expanduser("~/text-fabric-data/github/CenterBLC/LXX/tf/1935")
 
     # --- Lazy Loaders ---
+    # Each property loads its dataset once, through the registry (single-flight:
+    # concurrent first requests wait on the same load). The section index is
+    # built as part of the load.
     @property
     def n1904(self):
         if not self._n1904_app:
-            if self._n1904_provider:
-                 self._n1904_app = self._n1904_provider()
-            
-            if not self._n1904_app:
-                with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                    try:
-                        self._n1904_app = use("CenterBLC/N1904", version="1.0.0", silent=True)
-                    except Exception:
-                        pass
+            self._n1904_app = self._load_dataset("n1904", self._load_n1904)
         return self._n1904_app
 
     @property
     def lxx(self):
         if not self._lxx_app:
-            if self._lxx_provider:
-                self._lxx_app = self._lxx_provider()
-
-            if not self._lxx_app:
-                 # Try offline first
-                if os.path.exists(self.lxx_dir):
-                    with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                        try:
-                            TF = Fabric(locations=[self.lxx_dir], silent=True)
-                            api = TF.load("", silent=True)
-                            self._lxx_app = type('LXXStub', (), {'api': api})() # Mock app wrapper
-                        except Exception:
-                             pass
-                if not self._lxx_app:
-                     with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                        try:
-                            self._lxx_app = use("CenterBLC/LXX", version="1935", check=False, silent=True)
-                        except Exception:
-                            pass
+            self._lxx_app = self._load_dataset("lxx", self._load_lxx)
         return self._lxx_app
 
     @property
     def bhsa(self):
         if not self._bhsa_app:
-            if self._bhsa_provider:
-                self._bhsa_app = self._bhsa_provider()
-                
-            if not self._bhsa_app:
-                with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                     try:
-                         self._bhsa_app = use("ETCBC/bhsa", version="2021", silent=True)
-                     except Exception:
-                         pass
+            self._bhsa_app = self._load_dataset("bhsa", self._load_bhsa)
         return self._bhsa_app
     
     @property
     def tob(self):
         if not self._tob_api:
-             if self._tob_provider:
-                 self._tob_api = self._tob_provider()
-                 
-             if not self._tob_api:
-                 if os.path.exists(self.tob_dir):
-                     with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                         try:
-                             TF = Fabric(locations=[self.tob_dir], silent=True)
-                             self._tob_api = TF.load('text book chapter verse', silent=True)
-                         except Exception:
-                             pass
+            self._tob_api = self._load_dataset("tob", self._load_tob)
         return self._tob_api
 
     @property
     def bj_api(self):
         if not self._bj_api:
-            if self._bj_provider:
-                self._bj_api = self._bj_provider()
-            
-            if not self._bj_api:
-                 if os.path.exists(self.bj_dir):
-                     with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                         try:
-                             TF = Fabric(locations=[self.bj_dir], silent=True)
-                             self._bj_api = TF.load('text book chapter verse', silent=True)
-                         except Exception:
-                             pass
+            self._bj_api = self._load_dataset("bj", self._load_bj)
         return self._bj_api
 
     @property
     def nav_api(self):
         if not self._nav_api:
-            if self._nav_provider:
-                self._nav_api = self._nav_provider()
-                
-            if not self._nav_api:
-                 if os.path.exists(self.nav_dir):
-                     with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                         try:
-                             TF = Fabric(locations=[self.nav_dir], silent=True)
-                             self._nav_api = TF.load('text', silent=True)
-                         except Exception:
-                             pass
+            self._nav_api = self._load_dataset("nav", self._load_nav)
         return self._nav_api
 
+    def dataset_states(self) -> Dict[str, DatasetState]:
+        """Load state of every dataset (not_loaded/loading/ready/failed, load seconds)."""
+        return self.datasets.states()
+
+    def warm_up(self, datasets: List[str], max_workers: Optional[int] = None) -> Dict[str, DatasetState]:
+        """
+        Loads the given datasets in parallel threads and returns their final states.
+        Requests arriving meanwhile wait on the same loads (see DatasetRegistry).
+        """
+        names = [d for d in dict.fromkeys(datasets) if d in DATASETS]
+        if names:
+            with ThreadPoolExecutor(max_workers=max_workers or len(names), thread_name_prefix="warmup") as pool:
+                list(pool.map(self._dataset_api, names))
+        return {d: self.datasets.state(d) for d in names}
+
+    def _load_dataset(self, dataset: str, loader):
+        def load_and_index():
+            loaded = loader()
+            if not loaded: return None
+            api = loaded.api if dataset in APP_DATASETS else loaded
+            self._section_index(dataset, api)
+            return loaded
+        return self.datasets.load(dataset, load_and_index)
+
+    def _load_n1904(self):
+        app = self._n1904_provider() if self._n1904_provider else None
+        if not app:
+            with silenced_stdout():
+                try:
+                    app = use("CenterBLC/N1904", version="1.0.0", silent=True)
+                except Exception:
+                    pass
+        return app
+
+    def _load_lxx(self):
+        app = self._lxx_provider() if self._lxx_provider else None
+        if not app:
+             # Try offline first
+            if os.path.exists(self.lxx_dir):
+                with silenced_stdout():
+                    try:
+                        TF = Fabric(locations=[self.lxx_dir], silent=True)
+                        api = TF.load("", silent=True)
+                        app = type('LXXStub', (), {'api': api})() # Mock app wrapper
+                    except Exception:
+                         pass
+            if not app:
+                 with silenced_stdout():
+                    try:
+                        app = use("CenterBLC/LXX", version="1935", check=False, silent=True)
+                    except Exception:
+                        pass
+        return app
+
+    def _load_bhsa(self):
+        app = self._bhsa_provider() if self._bhsa_provider else None
+        if not app:
+            with silenced_stdout():
+                 try:
+                     app = use("ETCBC/bhsa", version="2021", silent=True)
+                 except Exception:
+                     pass
+        return app
+
+    def _load_tob(self):
+        api = self._tob_provider() if self._tob_provider else None
+        if not api:
+            api = self._load_fabric(self.tob_dir, 'text book chapter verse')
+        return api
+
+    def _load_bj(self):
+        api = self._bj_provider() if self._bj_provider else None
+        if not api:
+            api = self._load_fabric(self.bj_dir, 'text book chapter verse')
+        return api
+
+    def _load_nav(self):
+        api = self._nav_provider() if self._nav_provider else None
+        if not api:
+            api = self._load_fabric(self.nav_dir, 'text')
+        return api
+
+    def _load_fabric(self, location: str, features: str):
+        if not os.path.exists(location): return None
+        with silenced_stdout():
+            try:
+                TF = Fabric(locations=[location], silent=True)
+                return TF.load(features, silent=True)
+            except Exception:
+                return None
+
+    # --- Section Index ---
+    def _dataset_book_names(self, dataset: str) -> dict:
+        """
+        Map each book name a dataset may use to our book code.
+        Candidates are registered in the order the legacy lookups tried them,
+        so the first (preferred) spelling wins on collisions.
+        """
+        norm = self.normalizer
+        names = {}
+        for code in norm.code_to_n1904:
+            name_en = norm.code_to_n1904.get(code)
+            if dataset == "n1904":
+                candidates = [name_en]
+            elif dataset == "lxx":
+                abbreviations = norm.code_to_abbreviations.get(code, [])
+                candidates = list(abbreviations)
+                candidates.extend(abbr.replace(" ", "") for abbr in abbreviations if " " in abbr)
+                candidates.extend([code, name_en])
+            elif dataset == "bhsa":
+                candidates = [norm.code_to_bhsa.get(code, code)]
+            elif dataset == "tob":
+                candidates = [norm.n1904_to_tob.get(name_en)]
+            elif dataset == "bj":
+                candidates = [code]
+            elif dataset == "nav":
+                name_bhsa = norm.code_to_bhsa.get(code) or name_en
+                candidates = [name_bhsa, name_bhsa.replace("_", " ") if name_bhsa else None,
+                              name_en, name_en.replace("_", " ") if name_en else None]
+            else:
+                candidates = []
+            for name in candidates:
+                if name and name not in names:
+                    names[name] = code
+        return names
+
+    def _section_index(self, dataset: str, api) -> Optional[SectionIndex]:
+        """
+        Returns the (book, chapter, verse) -> node index for a loaded dataset, built on first use.
+        Returns None when the dataset could not be enumerated (the lookups then
+        fall back to resolving sections by name).
+        """
+        if dataset not in self._section_indexes:
+            self._section_indexes[dataset] = SectionIndex.build(api, self._dataset_book_names(dataset))
+        index = self._section_indexes[dataset]
+        return index if len(index) else None
+
+    def _dataset_api(self, dataset: str):
+        """Loads a dataset and returns its TF api (apps expose it as `.api`)."""
+        loaded = {
+            "n1904": lambda: self.n1904,
+            "lxx": lambda: self.lxx,
+            "bhsa": lambda: self.bhsa,
+            "tob": lambda: self.tob,
+            "bj": lambda: self.bj_api,
+            "nav": lambda: self.nav_api,
+        }[dataset]()
+        if not loaded: return None
+        return loaded.api if dataset in APP_DATASETS else loaded
+
+    def iter_verse_texts(self, version: str):
+        """
+        Yields (book_code, chapter, verse, text) for every verse of a version, in canonical order.
+        Used to export the verse store (see adapters.verse_store).
+        """
+        version = version.upper()
+        dataset = VERSION_DATASETS.get(version)
+        if not dataset: return
+        api = self._dataset_api(dataset)
+        if api is None: return
+        index = self._section_index(dataset, api)
+        if not index: return
+        for book_code, chapter in list(index.chapters):
+            for v in self.get_chapter(book_code, chapter, version):
+                yield (book_code, chapter, v.verse, v.text)
+
+    def iter_words(self, version: str):
+        """
+        Yields (book_code, chapter, verse, features) for every word of N1904 or BHSA, in text order.
+        Used to build the morphology index (see morphology_index.py).
+        """
+        version = version.upper()
+        feature_names = WORD_FEATURES.get(version)
+        dataset = VERSION_DATASETS.get(version)
+        if not feature_names or not dataset: return
+        api = self._dataset_api(dataset)
+        if api is None: return
+        index = self._section_index(dataset, api)
+        if not index: return
+
+        # Resolve feature objects once; missing ones are left out
+        features = {}
+        for field, names in feature_names.items():
+            for name in names:
+                try:
+                    feature = api.Fs(name)
+                except Exception:
+                    feature = None
+                if feature is not None:
+                    features[field] = feature
+                    break
+        if "lemma" not in features: return
+
+        for book_code, chapter in list(index.chapters):
+            for verse, node in index.chapter_nodes(book_code, chapter):
+                for w in api.L.d(node, otype='word'):
+                    yield (book_code, chapter, verse, {field: f.v(w) for field, f in features.items()})
+
+    def list_verses(self, version: str) -> Optional[List[tuple]]:
+        """(book_code, chapter, verse) of every verse of a version, from its section index."""
+        version = version.upper()
+        dataset = VERSION_DATASETS.get(version)
+        if not dataset: return None
+        api = self._dataset_api(dataset)
+        if api is None: return None
+        index = self._section_index(dataset, api)
+        if not index: return None
+        return list(index.verses)
+
     def normalize_reference(self, ref_string: str) -> Optional[tuple[str, int, int]]:
         res = self.normalizer.normalize_reference(ref_string)
         if res:
@@ -185,7 +361,11 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         book_name = self.normalizer.code_to_n1904.get(book_code)
         if not book_name: return None
         
-        node = app.api.T.nodeFromSection((book_name, chapter, verse))
+        index = self._section_index("n1904", app.api)
+        if index:
+            node = index.verse_node(book_code, chapter, verse)
+        else:
+            node = app.api.T.nodeFromSection((book_name, chapter, verse))
         if not node or not isinstance(node, int): return None
         
         # Text extraction
@@ -212,7 +392,11 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         book_name = self.normalizer.code_to_n1904.get(book_code)
         if not book_name: return None
         
-        node = app.api.T.nodeFromSection((book_name, chapter, verse))
+        index = self._section_index("n1904", app.api)
+        if index:
+            node = index.verse_node(book_code, chapter, verse)
+        else:
+            node = app.api.T.nodeFromSection((book_name, chapter, verse))
         if not node or not isinstance(node, int): return None
         
         # English Gloss extraction
@@ -236,159 +420,6 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
             node=node
         )
         
-    # ... (skipping _get_lxx_verse etc) ...
-
-    def _get_nav_verse(self, book_code: str, chapter: int, verse: int) -> Optional[Verse]:
-        api = self.nav_api # Need property
-        if not self._nav_api and self._nav_provider:
-             self._nav_api = self._nav_provider()
-        if not self._nav_api: return None
-        api = self._nav_api
-        
-        # NAV uses English Names "Genesis" etc, but prefers "1 Samuel" over "I Samuel"
-        # Try code_to_bhsa (e.g. 1_Samuel)
-        name_en = self.normalizer.code_to_bhsa.get(book_code)
-        if not name_en: 
-             name_en = self.normalizer.code_to_n1904.get(book_code)
-             
-        if not name_en: return None
-        
-        node = api.T.nodeFromSection((name_en, str(chapter), str(verse)))
-        if not node:
-             # Try replacing underscore with space (e.g. "1_Samuel" -> "1 Samuel")
-             node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter), str(verse)))
-             
-        if not node:
-             # Fallback to N1904 name if BHSA failed (e.g. maybe some books differ)
-             name_alt = self.normalizer.code_to_n1904.get(book_code)
-             if name_alt and name_alt != name_en:
-                  node = api.T.nodeFromSection((name_alt, str(chapter), str(verse)))
-                  if not node:
-                       node = api.T.nodeFromSection((name_alt.replace("_", " "), str(chapter), str(verse)))
-        
-        if not node or not isinstance(node, int): return None
-        
-        text = api.T.text(node)
-        
-        # Determine strict display name
-        display_name = name_en.replace("_", " ") if name_en else book_code
-        
-        return Verse(
-             book_code=display_name,
-             chapter=chapter,
-             verse=verse,
-             text=text,
-             language=Language.ARABIC,
-             version="NAV",
-             node=node
-        )
-
-    # ... (get_chapter dispatch) ...
-
-    def _get_n1904_english_chapter(self, book_code: str, chapter: int) -> List[Verse]:
-        app = self.n1904
-        if not app: return []
-        
-        if not self.normalizer.is_nt(book_code): return []
-        book_name = self.normalizer.code_to_n1904.get(book_code)
-        if not book_name: return []
-        
-        api = app.api
-        node = api.T.nodeFromSection((book_name, chapter))
-        
-        if node and api.F.otype.v(node) == 'chapter':
-             pass 
-        else:
-             book_node = api.T.nodeFromSection((book_name,))
-             if not book_node: return []
-             
-             node = None
-             for ch_node in api.L.d(book_node, otype='chapter'):
-                 if api.F.chapter.v(ch_node) == int(chapter):
-                     node = ch_node
-                     break
-        
-        if not node: return []
-        
-        verses = []
-        for v_node in api.L.d(node, otype='verse'):
-            v_num = api.F.verse.v(v_node)
-            
-            # English Gloss extraction
-            text_list = []
-            words = api.L.d(v_node, otype='word')
-            for w in words:
-                trans = ""
-                if hasattr(api.F, 'trans'):
-                    trans = api.F.trans.v(w)
-                if not trans and hasattr(api.F, 'gloss'):
-                    trans = api.F.gloss.v(w)
-                text_list.append(trans or "")
-            
-            verses.append(Verse(
-                book_code=book_name, # Use full Name
-                chapter=chapter,
-                verse=v_num,
-                text=" ".join(text_list),
-                language=Language.ENGLISH,
-                version="N1904_EN",
-                node=v_node
-            ))
-        return verses
-
-    # ... (skip other methods) ...
-    
-    def _get_nav_chapter(self, book_code: str, chapter: int) -> List[Verse]:
-        api = self.nav_api
-        if not api: return []
-        
-        # Try code_to_bhsa (e.g. 1_Samuel)
-        name_en = self.normalizer.code_to_bhsa.get(book_code)
-        if not name_en: 
-             name_en = self.normalizer.code_to_n1904.get(book_code)
-        
-        if not name_en: return []
-        
-        node = api.T.nodeFromSection((name_en, str(chapter)))
-        if not node:
-               node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter)))
-        
-        if not node:
-             # Fallback to N1904
-             name_alt = self.normalizer.code_to_n1904.get(book_code)
-             if name_alt and name_alt != name_en:
-                  node = api.T.nodeFromSection((name_alt, str(chapter)))
-                  if not node:
-                       node = api.T.nodeFromSection((name_alt.replace("_", " "), str(chapter)))
-        
-        if not node or api.F.otype.v(node) != 'chapter':
-             return []
-             
-        verses = []
-        display_name = name_en.replace("_", " ") if name_en else book_code
-        
-        for v_node in api.L.d(node, otype='verse'):
-             if hasattr(api.F, 'verse'):
-                 v_val = api.F.verse.v(v_node)
-             else:
-                 v_val = api.T.sectionFromNode(v_node)[2]
-             try:
-                 v_num = int(v_val)
-             except:
-                 continue
-                 
-             text = api.T.text(v_node)
-             verses.append(Verse(
-                book_code=display_name,
-                chapter=chapter,
-                verse=v_num,
-                text=text,
-                language=Language.ARABIC,
-                version="NAV",
-                node=v_node
-             ))
-        return verses
-
     def _get_lxx_verse(self, book_code: str, chapter: int, verse: int) -> Optional[Verse]:
         app = self.lxx
         if not app: return None
@@ -403,9 +434,14 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         ref_str = f"{book_code} {chapter}:{verse}"
         node = None
         
+        # Section index: one probe, no candidate loop
+        index = self._section_index("lxx", app.api)
+        if index:
+             node = index.verse_node(book_code, chapter, verse)
+        
         # The app might be a mock wrapper (see self.lxx property) which has only 'api'.
         # If it's a real TF app, it has nodeFromSectionStr.
-        if hasattr(app, 'nodeFromSectionStr'):
+        elif hasattr(app, 'nodeFromSectionStr'):
              node = app.nodeFromSectionStr(ref_str)
         
         # Try TF API directly: T.nodeFromSection
@@ -462,7 +498,11 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         # BHSA expects specific book names (e.g. "1_Kings" not "I_Kings")
         name_en = self.normalizer.code_to_bhsa.get(book_code, book_code)
         
-        node = app.nodeFromSectionStr(f"{name_en} {chapter}:{verse}")
+        index = self._section_index("bhsa", app.api)
+        if index:
+            node = index.verse_node(book_code, chapter, verse)
+        else:
+            node = app.nodeFromSectionStr(f"{name_en} {chapter}:{verse}")
         if not node or not isinstance(node, int): return None
         
         # Text extraction: g_word_utf8
@@ -492,11 +532,15 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         
         if not book_fr: return None 
         
-        # Optimize: Use nodeFromSection
-        node = api.T.nodeFromSection((book_fr, int(chapter), int(verse)))
+        index = self._section_index("tob", api)
+        if index:
+            node = index.verse_node(book_code, chapter, verse)
+        else:
+            # Optimize: Use nodeFromSection
+            node = api.T.nodeFromSection((book_fr, int(chapter), int(verse)))
         
         # Fallback if nodeFromSection failed (e.g. feature mismatch)
-        if not node:
+        if not node and not index:
              F = api.F
              L = api.L
              for n in F.otype.s('book'):
@@ -534,7 +578,11 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         F, L = api.F, api.L
         
         # BJ uses CODES as book feature (e.g. "GEN") (Verified by debug script)
-        node = api.T.nodeFromSection((book_code, int(chapter), int(verse)))
+        index = self._section_index("bj", api)
+        if index:
+            node = index.verse_node(book_code, chapter, verse)
+        else:
+            node = api.T.nodeFromSection((book_code, int(chapter), int(verse)))
         
         if not node or not isinstance(node, int): return None
 
@@ -555,11 +603,8 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         )
 
     def _get_nav_verse(self, book_code: str, chapter: int, verse: int) -> Optional[Verse]:
-        api = self.nav_api # Need property
-        if not self._nav_api and self._nav_provider:
-             self._nav_api = self._nav_provider()
-        if not self._nav_api: return None
-        api = self._nav_api
+        api = self.nav_api
+        if not api: return None
         
         # NAV uses English Names "Genesis" etc, but prefers "1 Samuel" over "I Samuel"
         # Try code_to_bhsa (e.g. 1_Samuel)
@@ -569,12 +614,16 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
              
         if not name_en: return None
         
-        node = api.T.nodeFromSection((name_en, str(chapter), str(verse)))
-        if not node:
-             # Try replacing underscore with space (e.g. "1_Samuel" -> "1 Samuel")
-             node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter), str(verse)))
+        index = self._section_index("nav", api)
+        if index:
+             node = index.verse_node(book_code, chapter, verse)
+        else:
+             node = api.T.nodeFromSection((name_en, str(chapter), str(verse)))
+             if not node:
+                  # Try replacing underscore with space (e.g. "1_Samuel" -> "1 Samuel")
+                  node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter), str(verse)))
              
-        if not node:
+        if not node and not index:
              # Fallback to N1904 name if BHSA failed (e.g. maybe some books differ)
              name_alt = self.normalizer.code_to_n1904.get(book_code)
              if name_alt and name_alt != name_en:
@@ -625,25 +674,10 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         if not book_name: return []
         
         api = app.api
-        node = api.T.nodeFromSection((book_name, chapter))
-        
-        if node and api.F.otype.v(node) == 'chapter':
-             pass 
-        else:
-             book_node = api.T.nodeFromSection((book_name,))
-             if not book_node: return []
-             
-             node = None
-             for ch_node in api.L.d(book_node, otype='chapter'):
-                 if api.F.chapter.v(ch_node) == int(chapter):
-                     node = ch_node
-                     break
-        
-        if not node: return []
+        verse_nodes = self._n1904_chapter_verse_nodes(api, book_code, book_name, chapter)
         
         verses = []
-        for v_node in api.L.d(node, otype='verse'):
-            v_num = api.F.verse.v(v_node)
+        for v_num, v_node in verse_nodes:
             text = api.T.text(v_node)
             verses.append(Verse(
                 book_code=book_code,
@@ -665,26 +699,10 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         if not book_name: return []
         
         api = app.api
-        node = api.T.nodeFromSection((book_name, chapter))
-        
-        if node and api.F.otype.v(node) == 'chapter':
-             pass 
-        else:
-             book_node = api.T.nodeFromSection((book_name,))
-             if not book_node: return []
-             
-             node = None
-             for ch_node in api.L.d(book_node, otype='chapter'):
-                 if api.F.chapter.v(ch_node) == int(chapter):
-                     node = ch_node
-                     break
-        
-        if not node: return []
+        verse_nodes = self._n1904_chapter_verse_nodes(api, book_code, book_name, chapter)
         
         verses = []
-        for v_node in api.L.d(node, otype='verse'):
-            v_num = api.F.verse.v(v_node)
-            
+        for v_num, v_node in verse_nodes:
             # English Gloss extraction
             text_list = []
             words = api.L.d(v_node, otype='word')
@@ -707,53 +725,80 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
             ))
         return verses
 
+    def _n1904_chapter_verse_nodes(self, api, book_code: str, book_name: str, chapter: int) -> List[tuple]:
+        """Returns [(verse, node), ...] for an N1904 chapter (shared by Greek and English)."""
+        index = self._section_index("n1904", api)
+        if index:
+            return index.chapter_nodes(book_code, chapter)
+
+        node = api.T.nodeFromSection((book_name, chapter))
+        
+        if node and api.F.otype.v(node) == 'chapter':
+             pass 
+        else:
+             book_node = api.T.nodeFromSection((book_name,))
+             if not book_node: return []
+             
+             node = None
+             for ch_node in api.L.d(book_node, otype='chapter'):
+                 if api.F.chapter.v(ch_node) == int(chapter):
+                     node = ch_node
+                     break
+        
+        if not node: return []
+        return [(api.F.verse.v(v_node), v_node) for v_node in api.L.d(node, otype='verse')]
+
     def _get_lxx_chapter(self, book_code: str, chapter: int) -> List[Verse]:
         app = self.lxx
         if not app: return []
         
-        node = None
-        ref_str = f"{book_code} {chapter}"
-        
-        if hasattr(app, 'nodeFromSectionStr'):
-             try:
-                 node = app.nodeFromSectionStr(ref_str)
-             except: pass
-             
-             if not node or not isinstance(node, int) or app.api.F.otype.v(node) != 'chapter':
-                  # Invalid previous attempt, reset node
-                  node = None
-                  
-                  name_en = self.normalizer.code_to_n1904.get(book_code)
-                  if name_en:
-                       try:
-                           n = app.nodeFromSectionStr(f"{name_en} {chapter}")
-                           if n and isinstance(n, int):
-                               # Only assign if int, and check otype
-                               if app.api.F.otype.v(n) == 'chapter':
-                                   node = n
-                       except: pass
-
-        if not node:
-             candidates = []
-             abbreviations = self.normalizer.code_to_abbreviations.get(book_code, [])
-             candidates.extend(abbreviations)
-             candidates.append(book_code)
-             name_en = self.normalizer.code_to_n1904.get(book_code)
-             if name_en: candidates.append(name_en)
-             
-             for cand in candidates:
+        index = self._section_index("lxx", app.api)
+        if index:
+            verse_nodes = index.chapter_nodes(book_code, chapter)
+        else:
+            node = None
+            ref_str = f"{book_code} {chapter}"
+            
+            if hasattr(app, 'nodeFromSectionStr'):
                  try:
-                     n = app.api.T.nodeFromSection((cand, chapter))
-                     if n and app.api.F.otype.v(n) == 'chapter':
-                         node = n
-                         break
-                 except: continue
-        
-        if not node: return []
+                     node = app.nodeFromSectionStr(ref_str)
+                 except: pass
+                 
+                 if not node or not isinstance(node, int) or app.api.F.otype.v(node) != 'chapter':
+                      # Invalid previous attempt, reset node
+                      node = None
+                      
+                      name_en = self.normalizer.code_to_n1904.get(book_code)
+                      if name_en:
+                           try:
+                               n = app.nodeFromSectionStr(f"{name_en} {chapter}")
+                               if n and isinstance(n, int):
+                                   # Only assign if int, and check otype
+                                   if app.api.F.otype.v(n) == 'chapter':
+                                       node = n
+                           except: pass
+
+            if not node:
+                 candidates = []
+                 abbreviations = self.normalizer.code_to_abbreviations.get(book_code, [])
+                 candidates.extend(abbreviations)
+                 candidates.append(book_code)
+                 name_en = self.normalizer.code_to_n1904.get(book_code)
+                 if name_en: candidates.append(name_en)
+                 
+                 for cand in candidates:
+                     try:
+                         n = app.api.T.nodeFromSection((cand, chapter))
+                         if n and app.api.F.otype.v(n) == 'chapter':
+                             node = n
+                             break
+                     except: continue
+            
+            if not node: return []
+            verse_nodes = [(app.api.F.verse.v(v_node), v_node) for v_node in app.api.L.d(node, otype='verse')]
         
         verses = []
-        for v_node in app.api.L.d(node, otype='verse'):
-            v_num = app.api.F.verse.v(v_node)
+        for v_num, v_node in verse_nodes:
             text = app.api.T.text(v_node)
             verses.append(Verse(
                 book_code=book_code,
@@ -770,15 +815,19 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         app = self.bhsa
         if not app: return []
         
-        name_en = self.normalizer.code_to_bhsa.get(book_code, book_code)
-        node = app.nodeFromSectionStr(f"{name_en} {chapter}")
-        
-        if not node or app.api.F.otype.v(node) != 'chapter':
-             return []
+        index = self._section_index("bhsa", app.api)
+        if index:
+            verse_nodes = index.chapter_nodes(book_code, chapter)
+        else:
+            name_en = self.normalizer.code_to_bhsa.get(book_code, book_code)
+            node = app.nodeFromSectionStr(f"{name_en} {chapter}")
+            
+            if not node or app.api.F.otype.v(node) != 'chapter':
+                 return []
+            verse_nodes = [(app.api.F.verse.v(v_node), v_node) for v_node in app.api.L.d(node, otype='verse')]
              
         verses = []
-        for v_node in app.api.L.d(node, otype='verse'):
-            v_num = app.api.F.verse.v(v_node)
+        for v_num, v_node in verse_nodes:
             words = app.api.L.d(v_node, otype='word')
             text_list = []
             for w in words:
@@ -806,35 +855,40 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
              name_en = self.normalizer.code_to_n1904.get(book_code)
         
         if not name_en: return []
-        
-        node = api.T.nodeFromSection((name_en, str(chapter)))
-        if not node:
-               node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter)))
-        
-        if not node:
-             # Fallback to N1904
-             name_alt = self.normalizer.code_to_n1904.get(book_code)
-             if name_alt and name_alt != name_en:
-                  node = api.T.nodeFromSection((name_alt, str(chapter)))
-                  if not node:
-                       node = api.T.nodeFromSection((name_alt.replace("_", " "), str(chapter)))
-        
-        if not node or api.F.otype.v(node) != 'chapter':
-             return []
-             
-        verses = []
         display_name = name_en.replace("_", " ") if name_en else book_code
         
-        for v_node in api.L.d(node, otype='verse'):
-             if hasattr(api.F, 'verse'):
-                 v_val = api.F.verse.v(v_node)
-             else:
-                 v_val = api.T.sectionFromNode(v_node)[2]
-             try:
-                 v_num = int(v_val)
-             except:
-                 continue
+        index = self._section_index("nav", api)
+        if index:
+            verse_nodes = index.chapter_nodes(book_code, chapter)
+        else:
+            node = api.T.nodeFromSection((name_en, str(chapter)))
+            if not node:
+                   node = api.T.nodeFromSection((name_en.replace("_", " "), str(chapter)))
+            
+            if not node:
+                 # Fallback to N1904
+                 name_alt = self.normalizer.code_to_n1904.get(book_code)
+                 if name_alt and name_alt != name_en:
+                      node = api.T.nodeFromSection((name_alt, str(chapter)))
+                      if not node:
+                           node = api.T.nodeFromSection((name_alt.replace("_", " "), str(chapter)))
+            
+            if not node or api.F.otype.v(node) != 'chapter':
+                 return []
                  
+            verse_nodes = []
+            for v_node in api.L.d(node, otype='verse'):
+                 if hasattr(api.F, 'verse'):
+                     v_val = api.F.verse.v(v_node)
+                 else:
+                     v_val = api.T.sectionFromNode(v_node)[2]
+                 try:
+                     verse_nodes.append((int(v_val), v_node))
+                 except:
+                     continue
+             
+        verses = []
+        for v_num, v_node in verse_nodes:
              text = api.T.text(v_node)
              verses.append(Verse(
                 book_code=display_name,
@@ -856,38 +910,34 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         book_fr = self.normalizer.n1904_to_tob.get(name_en) if name_en else None
         if not book_fr: return []
 
-        # Find Chapter Node
-        # T.nodeFromSection usually returns Verse if fully specified, 
-        # or Chapter if (Book, Chapter) specified?
-        # It depends on sectionFeatures config. 
-        # If TOB sectionFeatures=book,chapter,verse, then (Book, Chapter) usually returns Chapter node.
-        node = api.T.nodeFromSection((book_fr, int(chapter)))
-        
-        # Verify it is a chapter
-        if not node or api.F.otype.v(node) != 'chapter':
-             # Fallback to finding book then chapter?
-             # Optimization: Assuming nodeFromSection works. 
-             # If it returns None, maybe try finding book node first?
-             # But let's assume standard behavior for now.
-             
-             # Fallback: Loop books (Linear scan 1 time is OK if nodeFromSection fails)
-             book_node = None
-             for n in api.F.otype.s('book'):
-                 if api.F.book.v(n) == book_fr:
-                     book_node = n
-                     break
-             if not book_node: return []
-             
-             for n in api.L.d(book_node, otype='chapter'):
-                 if api.F.chapter.v(n) == int(chapter):
-                     node = n
-                     break
-        
-        if not node: return []
+        index = self._section_index("tob", api)
+        if index:
+            verse_nodes = index.chapter_nodes(book_code, chapter)
+        else:
+            # Find Chapter Node
+            # If TOB sectionFeatures=book,chapter,verse, then (Book, Chapter) usually returns Chapter node.
+            node = api.T.nodeFromSection((book_fr, int(chapter)))
+            
+            # Verify it is a chapter
+            if not node or api.F.otype.v(node) != 'chapter':
+                 # Fallback: Loop books (Linear scan 1 time is OK if nodeFromSection fails)
+                 book_node = None
+                 for n in api.F.otype.s('book'):
+                     if api.F.book.v(n) == book_fr:
+                         book_node = n
+                         break
+                 if not book_node: return []
+                 
+                 for n in api.L.d(book_node, otype='chapter'):
+                     if api.F.chapter.v(n) == int(chapter):
+                         node = n
+                         break
+            
+            if not node: return []
+            verse_nodes = [(api.F.verse.v(v_node), v_node) for v_node in api.L.d(node, otype='verse')]
 
         verses = []
-        for v_node in api.L.d(node, otype='verse'):
-             v_num = api.F.verse.v(v_node)
+        for v_num, v_node in verse_nodes:
              text = api.T.text(v_node)
              
              verses.append(Verse(
@@ -905,14 +955,18 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
         api = self.bj_api
         if not api: return []
         
-        node = api.T.nodeFromSection((book_code, int(chapter)))
-        
-        if not node or api.F.otype.v(node) != 'chapter':
-             return []
+        index = self._section_index("bj", api)
+        if index:
+            verse_nodes = index.chapter_nodes(book_code, chapter)
+        else:
+            node = api.T.nodeFromSection((book_code, int(chapter)))
+            
+            if not node or api.F.otype.v(node) != 'chapter':
+                 return []
+            verse_nodes = [(api.F.verse.v(v_node), v_node) for v_node in api.L.d(node, otype='verse')]
 
         verses = []
-        for v_node in api.L.d(node, otype='verse'):
-             v_num = api.F.verse.v(v_node)
+        for v_num, v_node in verse_nodes:
              text = api.T.text(v_node)
              
              verses.append(Verse(
@@ -926,8 +980,14 @@ class TextFabricAdapter(BibleProvider, MetadataProvider):
             ))
         return verses
 
+    @property
+    def fulltext(self) -> FullTextIndex:
+        if self._fulltext is None:
+            self._fulltext = FullTextIndex(search_index_dir(self.data_dir), self.normalizer.book_codes, self)
+        return self._fulltext
+
     def search(self, query: str, version: str) -> List[Verse]:
-        return []
+        return self.fulltext.search_verses(query, version)
 
     def get_cross_references(self, book_code: str, chapter: int, verse: int) -> VerseCrossReferences:
         # This requires access to the ReferenceDatabase logic.
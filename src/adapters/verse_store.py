@@ -0,0 +1,350 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Dict, Iterable, Callable, Tuple
+
+from ports.bible_provider import BibleProvider, MetadataProvider
+from domain.models import Verse, Book, VerseCrossReferences, Language, DatasetState, DatasetStatus
+from book_normalizer import BookNormalizer
+from adapters.dataset_registry import DATASETS, VERSION_DATASETS
+from verse_id import encode_verse_id, decode_verse_id, FIELD_MASK
+from search_index import FullTextIndex, search_index_dir
+
+# Verse texts exported from the Text-Fabric datasets into one memory-mapped file.
+#
+# Layout:
+#   MAGIC (8 bytes) | header length (uint64, little endian) | header JSON | padding
+#   then, for each version, three 8-byte aligned sections:
+#     ids      int32[count]      sorted verse ids
+#     offsets  uint64[count + 1] byte offsets of each verse in the text section
+#     text     UTF-8 bytes       concatenated verse texts
+#
+# Serving a verse is a binary search over `ids` plus one slice of `text`,
+# without importing Text-Fabric at all.
+
+MAGIC = b"SAVS0001"
+STORE_FILENAME = "verses.bin"
+
+VERSION_LANGUAGES = {
+    "N1904": Language.GREEK,
+    "N1904_EN": Language.ENGLISH,
+    "LXX": Language.GREEK,
+    "BHSA": Language.HEBREW,
+    "TOB": Language.FRENCH,
+    "BJ": Language.FRENCH,
+    "NAV": Language.ARABIC,
+}
+
+def _pad(f):
+    remainder = f.tell() % 8
+    if remainder:
+        f.write(b"\0" * (8 - remainder))
+
+
+def write_verse_store(path: str, book_codes: List[str], versions: Dict[str, Iterable[Tuple[str, int, int, str]]]) -> Dict[str, int]:
+    """
+    Writes the (book_code, chapter, verse, text) rows of each version to `path`.
+    `book_codes` fixes the book ordinals used in verse ids; verses of unknown books are skipped.
+    Versions without any verse (dataset not installed) are left out, so readers fall back
+    to Text-Fabric for them. Returns the number of verses written per version.
+    """
+    ordinals = {code: i for i, code in enumerate(book_codes)}
+
+    # Encode everything first: the header needs the section offsets
+    encoded = {}
+    skipped = []
+    for version, verses in versions.items():
+        rows = {}
+        for book_code, chapter, verse, text in verses:
+            ordinal = ordinals.get(book_code)
+            if ordinal is None:
+                continue
+            rows.setdefault(encode_verse_id(ordinal, chapter, verse), (text or "").encode("utf-8"))
+        if not rows:
+            skipped.append(version.upper())
+            continue
+        ids = sorted(rows)
+        offsets = array("Q", [0])
+        blob = bytearray()
+        for verse_id in ids:
+            blob += rows[verse_id]
+            offsets.append(len(blob))
+        encoded[version.upper()] = (array("i", ids), offsets, bytes(blob))
+
+    def aligned(n):
+        return (n + 7) & ~7
+
+    # Header length depends on offsets that depend on header length: iterate until stable
+    header = {"byteorder": "little", "books": list(book_codes), "versions": {}}
+    header_bytes = b""
+    for _ in range(4):
+        pos = aligned(len(MAGIC) + 8 + len(header_bytes))
+        for version, (ids, offsets, blob) in encoded.items():
+            entry = {"count": len(ids), "ids": pos}
+            pos = aligned(pos + len(ids) * ids.itemsize)
+            entry["offsets"] = pos
+            pos = aligned(pos + len(offsets) * offsets.itemsize)
+            entry["text"] = pos
+            entry["text_length"] = len(blob)
+            pos = aligned(pos + len(blob))
+            header["versions"][version] = entry
+        new_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(new_bytes) == len(header_bytes):
+            break
+        header_bytes = new_bytes
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        _pad(f)
+        for ids, offsets, blob in encoded.values():
+            if sys.byteorder != "little":
+                ids.byteswap()
+                offsets.byteswap()
+            f.write(ids.tobytes())
+            _pad(f)
+            f.write(offsets.tobytes())
+            _pad(f)
+            f.write(blob)
+            _pad(f)
+    os.replace(tmp_path, path)
+
+    counts = {version: len(ids) for version, (ids, _, _) in encoded.items()}
+    counts.update((version, 0) for version in skipped)
+    return counts
+
+
+class VerseStore:
+    """Read-only, memory-mapped view over a file written by `write_verse_store`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a verse store: {path}")
+        (header_length,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._mm[start:start + header_length]).decode("utf-8"))
+        if header.get("byteorder") != sys.byteorder:
+            self.close()
+            raise ValueError(f"Verse store {path} was written for a {header.get('byteorder')}-endian platform")
+
+        self.books = header["books"]
+        self._ordinals = {code: i for i, code in enumerate(self.books)}
+
+        view = self._view = memoryview(self._mm)
+        self._versions = {}
+        for version, entry in header["versions"].items():
+            count = entry["count"]
+            if not count:
+                # Exported empty by older writers: absent, not "no verses"
+                continue
+            ids = view[entry["ids"]:entry["ids"] + count * 4].cast("i")
+            offsets = view[entry["offsets"]:entry["offsets"] + (count + 1) * 8].cast("Q")
+            text = view[entry["text"]:entry["text"] + entry["text_length"]]
+            self._versions[version] = (ids, offsets, text)
+
+    @property
+    def versions(self) -> List[str]:
+        return list(self._versions)
+
+    def has_version(self, version: str) -> bool:
+        return version.upper() in self._versions
+
+    def _text_at(self, version_data, i: int) -> str:
+        _, offsets, text = version_data
+        return bytes(text[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def get_text(self, version: str, book_code: str, chapter: int, verse: int) -> Optional[str]:
+        data = self._versions.get(version.upper())
+        ordinal = self._ordinals.get(book_code)
+        if data is None or ordinal is None:
+            return None
+        ids = data[0]
+        verse_id = encode_verse_id(ordinal, int(chapter), int(verse))
+        i = bisect_left(ids, verse_id)
+        if i < len(ids) and ids[i] == verse_id:
+            return self._text_at(data, i)
+        return None
+
+    def get_chapter(self, version: str, book_code: str, chapter: int) -> List[Tuple[int, str]]:
+        """Returns [(verse, text), ...] for a chapter, in verse order."""
+        data = self._versions.get(version.upper())
+        ordinal = self._ordinals.get(book_code)
+        if data is None or ordinal is None:
+            return []
+        ids = data[0]
+        lo = bisect_left(ids, encode_verse_id(ordinal, int(chapter), 0))
+        hi = bisect_left(ids, encode_verse_id(ordinal, int(chapter) + 1, 0), lo)
+        return [(ids[i] & FIELD_MASK, self._text_at(data, i)) for i in range(lo, hi)]
+
+    def list_verses(self, version: str) -> List[Tuple[str, int, int]]:
+        """(book_code, chapter, verse) of every verse of a version, in canonical order."""
+        data = self._versions.get(version.upper())
+        if data is None:
+            return []
+        books = self.books
+        return [(books[o], c, v) for o, c, v in map(decode_verse_id, data[0])]
+
+    def close(self):
+        for ids, offsets, text in getattr(self, "_versions", {}).values():
+            ids.release()
+            offsets.release()
+            text.release()
+        self._versions = {}
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+        if getattr(self, "_mm", None) is not None and not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+
+class VerseStoreAdapter(BibleProvider, MetadataProvider):
+    """
+    BibleProvider serving verse text from a `VerseStore`.
+    Versions missing from the store are delegated to `fallback_factory()`
+    (typically a TextFabricAdapter), which is only built when first needed.
+    """
+
+    def __init__(self, store_path: str, data_dir: str, fallback_factory: Optional[Callable[[], BibleProvider]] = None):
+        self.data_dir = data_dir
+        self.normalizer = BookNormalizer(data_dir)
+        self.store = VerseStore(store_path)
+        self._fallback_factory = fallback_factory
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+        self._fulltext = None
+
+    @property
+    def fallback(self) -> Optional[BibleProvider]:
+        if self._fallback is None and self._fallback_factory:
+            # Two fallbacks would mean two sets of loaded datasets
+            with self._fallback_lock:
+                if self._fallback is None:
+                    self._fallback = self._fallback_factory()
+        return self._fallback
+
+    def _served_datasets(self) -> List[str]:
+        """Datasets whose versions are all in the store (Text-Fabric is never needed for them)."""
+        return [
+            d for d in DATASETS
+            if all(self.store.has_version(v) for v, ds in VERSION_DATASETS.items() if ds == d)
+        ]
+
+    def dataset_states(self) -> Dict[str, DatasetState]:
+        served = self._served_datasets()
+        fallback_states = self._fallback.dataset_states() if self._fallback is not None else {}
+        states = {}
+        for d in DATASETS:
+            if d in served:
+                states[d] = DatasetState(name=d, status=DatasetStatus.READY, load_seconds=0.0)
+            else:
+                states[d] = fallback_states.get(d) or DatasetState(name=d)
+        return states
+
+    def warm_up(self, datasets: List[str], max_workers: Optional[int] = None) -> Dict[str, DatasetState]:
+        served = self._served_datasets()
+        rest = [d for d in datasets if d not in served]
+        if rest and self.fallback is not None:
+            self.fallback.warm_up(rest, max_workers=max_workers)
+        states = self.dataset_states()
+        return {d: states[d] for d in datasets if d in states}
+
+    def _display_book(self, book_code: str, version: str) -> str:
+        # Same book labels as TextFabricAdapter
+        if version == "N1904_EN":
+            return self.normalizer.code_to_n1904.get(book_code, book_code)
+        if version == "NAV":
+            name_en = self.normalizer.code_to_bhsa.get(book_code) or self.normalizer.code_to_n1904.get(book_code)
+            return name_en.replace("_", " ") if name_en else book_code
+        return book_code
+
+    def _make_verse(self, book_code: str, chapter: int, verse: int, text: str, version: str) -> Verse:
+        return Verse(
+            book_code=self._display_book(book_code, version),
+            chapter=chapter,
+            verse=verse,
+            text=text,
+            language=VERSION_LANGUAGES.get(version, Language.ENGLISH),
+            version=version,
+        )
+
+    def get_verse(self, book_code: str, chapter: int, verse: int, version: str) -> Optional[Verse]:
+        version = version.upper()
+        if not self.store.has_version(version):
+            return self.fallback.get_verse(book_code, chapter, verse, version) if self.fallback else None
+        text = self.store.get_text(version, book_code, chapter, verse)
+        if text is None:
+            return None
+        return self._make_verse(book_code, chapter, verse, text, version)
+
+    def get_chapter(self, book_code: str, chapter: int, version: str) -> List[Verse]:
+        version = version.upper()
+        if not self.store.has_version(version):
+            return self.fallback.get_chapter(book_code, chapter, version) if self.fallback else []
+        return [
+            self._make_verse(book_code, chapter, v_num, text, version)
+            for v_num, text in self.store.get_chapter(version, book_code, chapter)
+        ]
+
+    def list_verses(self, version: str) -> Optional[List[Tuple[str, int, int]]]:
+        version = version.upper()
+        if not self.store.has_version(version):
+            return self.fallback.list_verses(version) if self.fallback else None
+        return self.store.list_verses(version)
+
+    def iter_verse_texts(self, version: str):
+        version = version.upper()
+        if not self.store.has_version(version):
+            return self.fallback.iter_verse_texts(version) if self.fallback else iter(())
+        return (
+            (book_code, chapter, verse, self.store.get_text(version, book_code, chapter, verse))
+            for book_code, chapter, verse in self.store.list_verses(version)
+        )
+
+    def iter_words(self, version: str):
+        # The store only holds verse texts: word features come from Text-Fabric
+        return self.fallback.iter_words(version) if self.fallback else iter(())
+
+    @property
+    def fulltext(self) -> FullTextIndex:
+        if self._fulltext is None:
+            self._fulltext = FullTextIndex(search_index_dir(self.data_dir), self.normalizer.book_codes, self)
+        return self._fulltext
+
+    def search(self, query: str, version: str) -> List[Verse]:
+        # Indexes are built from the store's texts; other versions come from the fallback
+        return self.fulltext.search_verses(query, version)
+
+    def get_cross_references(self, book_code: str, chapter: int, verse: int) -> VerseCrossReferences:
+        return VerseCrossReferences(notes=[], relations=[])
+
+    def get_book_info(self, book_code: str) -> Optional[Book]:
+        name_en = self.normalizer.code_to_n1904.get(book_code)
+        if not name_en: return None
+        return Book(
+            code=book_code,
+            name_en=name_en,
+            name_fr=self.normalizer.n1904_to_tob.get(name_en),
+            chapters=0
+        )
+
+    def normalize_reference(self, ref_string: str) -> Optional[tuple[str, int, int]]:
+        res = self.normalizer.normalize_reference(ref_string)
+        if res:
+            return (res[0], res[1], res[2])
+        return None
@@ -1,7 +1,10 @@
-from fastapi import FastAPI, Depends, Query
+from fastapi import FastAPI, Depends, Query, Response, HTTPException
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 from typing import List, Optional
 import sys
 import os
+import threading
 
 # Ensure src is in path for imports to work as expected by existing code structure
 # This allows 'import application...' to work if running from root as 'uvicorn src.api.main:app'
@@ -11,22 +14,66 @@ src_dir = os.path.dirname(current_dir)
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from application.services import BibleService
-from domain.models import VerseResponse
+from application.services import BibleService, AdapterFactory, ServiceFactory
+from adapters.dataset_registry import parse_dataset_list
+from domain.models import VerseResponse, DatasetStatus, CrossReferenceDirection, CrossReferenceType, CrossReferenceGraphResponse, SearchResponse, SearchOrder
+
+# Datasets to load at startup, e.g. SCRIPTURES_WARMUP="N1904,BHSA,TOB" (or "all")
+WARMUP_ENV = "SCRIPTURES_WARMUP"
+
+def warmup_datasets() -> List[str]:
+    return parse_dataset_list(os.environ.get(WARMUP_ENV))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    datasets = warmup_datasets()
+    if datasets:
+        # Load in the background so the server answers /health while warming up
+        threading.Thread(
+            target=lambda: AdapterFactory.get().warm_up(datasets),
+            name="warmup",
+            daemon=True
+        ).start()
+    yield
 
 app = FastAPI(
     title="ScripturesApp API",
     description="Backend for ScripturesApp Native App",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Dependency Injection for Service
+# Dependency Injection for Service (one instance for the app lifetime)
 def get_service():
-    return BibleService()
+    return ServiceFactory.get()
+
+def get_adapter():
+    return AdapterFactory.get()
 
 @app.get("/health")
-def health_check():
-    return {"status": "ok"}
+def health_check(response: Response, adapter=Depends(get_adapter)):
+    """
+    Reports per-dataset readiness. Returns 503 until every warm-up dataset
+    is ready, so a load balancer only routes traffic once they are loaded.
+    """
+    states = adapter.dataset_states()
+    warmup = [states[d] for d in warmup_datasets() if d in states]
+    
+    status = "ok"
+    if any(s.status == DatasetStatus.FAILED for s in warmup):
+        status = "degraded"
+    elif any(s.status != DatasetStatus.READY for s in warmup):
+        status = "loading"
+    if status != "ok":
+        response.status_code = 503
+    
+    return {
+        "status": status,
+        "datasets": {
+            name: {"status": s.status.value, "load_seconds": s.load_seconds, "error": s.error}
+            for name, s in states.items()
+        }
+    }
 
 @app.get("/api/v1/search", response_model=VerseResponse)
 def search_verses(
@@ -37,14 +84,137 @@ def search_verses(
     crossref: bool = Query(False, description="Show cross references"),
     crossref_full: bool = Query(False, description="Display cross-references with text"),
     crossref_source: Optional[str] = Query(None, description="Filter cross-references by source"),
+    direction: CrossReferenceDirection = Query(CrossReferenceDirection.OUTGOING, description="Cross-references from the verse (outgoing), pointing to it (incoming) or both"),
+    service: BibleService = Depends(get_service)
+):
+    """
+    The verses of `q` in one response. Long ranges ("Gn 1-Ex 40") are better read
+    from /api/v1/search/stream, which sends them as they are read.
+    """
+    try:
+        return service.search(
+            reference=q,
+            translations=tr,
+            version=v,
+            french_version=bible,
+            show_crossrefs=crossref,
+            crossref_full=crossref_full,
+            crossref_source=crossref_source,
+            direction=direction
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/search/stream", response_class=StreamingResponse)
+def stream_verses(
+    q: str = Query(..., description="Bible reference or range (e.g. 'Mt 5:1-7:29')"),
+    tr: Optional[List[str]] = Query(None, description="Translations to show (en, fr, gr, hb, ar)"),
+    v: str = Query("N1904", description="Primary version (N1904, LXX, BHSA)"),
+    bible: Optional[str] = Query(None, description="French version (tob, bj)"),
+    crossref: bool = Query(False, description="Attach each verse's cross references"),
+    crossref_full: bool = Query(False, description="Display cross-references with text"),
+    crossref_source: Optional[str] = Query(None, description="Filter cross-references by source"),
+    direction: CrossReferenceDirection = Query(CrossReferenceDirection.OUTGOING, description="Cross-references from the verse (outgoing), pointing to it (incoming) or both"),
+    service: BibleService = Depends(get_service)
+):
+    """
+    The verses of `q` as NDJSON, one verse item per line in canonical order, read one
+    chapter at a time: the first verses of a long range arrive before the last are read.
+    Cross-references, when asked for, are carried by each item (`cross_references`).
+    """
+    try:
+        if crossref or crossref_full:
+            items = service.iter_verses_with_crossrefs(
+                q, translations=tr, version=v, french_version=bible,
+                crossref_full=crossref_full, crossref_source=crossref_source, direction=direction
+            )
+        else:
+            items = ((item, None) for item in service.iter_verses(q, translations=tr, version=v, french_version=bible))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        for item, verse_refs in items:
+            if verse_refs is not None:
+                item = item.model_copy(update={"cross_references": verse_refs})
+            yield item.model_dump_json() + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/api/v1/crossref/graph", response_model=CrossReferenceGraphResponse)
+def crossref_graph(
+    q: str = Query(..., description="Start verse (e.g. 'Mc 1:1')"),
+    depth: int = Query(2, ge=1, le=6, description="Maximum number of hops"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of verses returned"),
+    type: Optional[List[CrossReferenceType]] = Query(None, description="Relation types to follow (default: all)"),
+    crossref_source: Optional[str] = Query(None, description="Filter cross-references by source"),
+    service: BibleService = Depends(get_service)
+):
+    """Verses reachable from `q` through the cross-reference graph, in breadth-first order."""
+    try:
+        return service.traverse(
+            reference=q,
+            depth=depth,
+            limit=limit,
+            rel_types=[t.value for t in type] if type else None,
+            crossref_source=crossref_source
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/fulltext", response_model=SearchResponse)
+def fulltext_search(
+    q: str = Query(..., description='Words to find (AND), "OR" between alternatives, "quoted phrase", "a NEAR/k b" (at most k words apart)'),
+    version: Optional[List[str]] = Query(None, description="Versions to search (default: every indexed or loaded version)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of verses returned"),
+    exact: bool = Query(False, description="Match diacritics exactly (case is always ignored)"),
+    scope: Optional[str] = Query(None, description="Verses searched: NT, OT, Apocrypha, Pentateuch, Gospels, a book or chapters ('Rm 1-8'), comma-separated"),
+    order: SearchOrder = Query(SearchOrder.RELEVANCE, description="relevance (BM25 score, best first) or canonical (book order)"),
+    parallel: Optional[List[str]] = Query(None, description="Translations attached to each hit: gr (N1904 or LXX), hb (BHSA), en, fr, ar, or version codes"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page (same query and options)"),
+    service: BibleService = Depends(get_service)
+):
+    """
+    Verses matching `q`; `total` counts every match. Each hit carries the character
+    offsets (`highlights`) of its matching words in `verse.text`, and its `parallels`.
+    Pass `next_cursor` back as `cursor` for the next page; it is null on the last one.
+    """
+    try:
+        return service.fulltext(q, versions=version, limit=limit, exact=exact, scope=scope, order=order.value, parallels=parallel, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/morphology", response_model=SearchResponse)
+def morphology_search(
+    q: str = Query(..., description="Lemma and feature=value filters, e.g. 'λύω tense=aorist voice=passive mood=participle book=Lk'"),
+    version: Optional[str] = Query(None, description="N1904 or BHSA (default: from the book or the lemma's script)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of verses returned"),
     service: BibleService = Depends(get_service)
 ):
-    return service.search(
-        reference=q,
-        translations=tr,
-        version=v,
-        french_version=bible,
-        show_crossrefs=crossref,
-        crossref_full=crossref_full,
-        crossref_source=crossref_source
-    )
+    """Verses with a word matching `q`; each hit lists the matching words."""
+    try:
+        return service.morphology(q, version=version, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/cache")
+def cache_stats(service: BibleService = Depends(get_service)):
+    """
+    Hit/miss counters of the /api/v1/search response cache (size, limit, TTL, evictions,
+    expirations, invalidations) and of the cross-reference index cache.
+    """
+    return service.cache_stats()
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="ScripturesApp API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--warmup", default=None, help='Datasets to load at startup, e.g. "N1904,BHSA,TOB" or "all"')
+    args = parser.parse_args()
+
+    if args.warmup is not None:
+        os.environ[WARMUP_ENV] = args.warmup
+    uvicorn.run(app, host=args.host, port=args.port)
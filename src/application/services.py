@@ -1,64 +1,243 @@
 import os
-import contextlib
-from typing import List, Optional, Tuple, Any, Dict
-from adapters.text_fabric_adapter import TextFabricAdapter
-from domain.models import VerseResponse, VerseCrossReferences, CrossReferenceRelation, VerseItem
+import re
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import List, Optional, Tuple, Any, Dict, Iterator, NamedTuple, Callable
+from ports.bible_provider import BibleProvider
+from domain.models import VerseResponse, VerseCrossReferences, CrossReferenceRelation, CrossReferenceDirection, VerseItem, CrossReferenceNode, CrossReferenceGraphResponse, SearchHit, SearchResponse, SearchOrder, TextSpan, Verse, DatasetStatus
+from adapters.dataset_registry import VERSION_DATASETS
 from book_normalizer import BookNormalizer
 from references_db import ReferenceDatabase
-from tf.app import use
+from references_sqlite import SqliteReferenceDatabase, REFERENCES_DB_FILENAME
+from verse_id import encode_verse_id, decode_verse_id, parse_target_range, FIELD_MASK, VerseRange, book_span, chapter_span
+from verse_atlas import VerseAtlas, VerseKey
+from search_index import FullTextIndex, search_index_dir, query_terms, highlight_spans
+from morphology_index import MorphologyIndexes, parse_morph_query
+from search_scope import VerseScope, named_scope
+from response_cache import LRUCache
+
+# Full-text search versions when no index is built and no dataset is loaded yet
+DEFAULT_SEARCH_VERSIONS = ["TOB"]
+# Hits read at a time when streaming search results
+SEARCH_PAGE_SIZE = 200
+# search() responses kept (SCRIPTURES_SEARCH_CACHE_SIZE; 0 disables the cache)
+SEARCH_CACHE_SIZE = 1024
+# Relevance rankings kept for the next pages of a full-text query
+RANKING_CACHE_SIZE = 32
+
+
+def _tail(items: list, start: int, wrap: Optional[Callable] = None) -> Iterator:
+    """items[start:] without copying the list."""
+    for i in range(start, len(items)):
+        yield wrap(items[i]) if wrap else items[i]
+
 
 # Helper/Factory for Adapter (moved from CLI, but we might want a better place)
 class AdapterFactory:
     _adapter = None
+    _lock = threading.Lock()
     
     @classmethod
-    def get(cls) -> TextFabricAdapter:
+    def get(cls) -> BibleProvider:
         if cls._adapter:
             return cls._adapter
-            
-        # Data dir logic (assuming structure)
-        # We are in src/application/services.py -> src/application -> src -> root
-        # Ideally we pass this config in, but for now we follow CLI pattern
-        # src/application/services.py is 2 levels deep from src? No, 1 level deep from src.
-        # src/application -> src
-        
+        # Two adapters would mean two sets of loaded datasets
+        with cls._lock:
+            if not cls._adapter:
+                cls._adapter = cls._create()
+            return cls._adapter
+
+    @classmethod
+    def _create(cls) -> BibleProvider:
         # Let's use a robust way to find data relative to this file
+        # src/application/services.py -> src/application -> src -> root
         current_dir = os.path.dirname(os.path.abspath(__file__))
         src_dir = os.path.dirname(current_dir) # src
         project_root = os.path.dirname(src_dir) # root
         data_dir = os.path.join(project_root, "data")
         
-        # Define providers
-        def n1904_p():
-             with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                 try: return use("CenterBLC/N1904", version="1.0.0", silent=True)
-                 except: return None
-        
-        def lxx_p():
-             with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                 try: return use("CenterBLC/LXX", version="1935", check=False, silent=True)
-                 except: return None
-
-        adapter = TextFabricAdapter(
-            data_dir=data_dir,
-            n1904_provider=n1904_p,
-            lxx_provider=lxx_p,
-        )
-        cls._adapter = adapter
-        return adapter
+        # Prefer the exported verse store: serves text without importing Text-Fabric.
+        # Text-Fabric is only loaded for versions the store does not contain.
+        from adapters.verse_store import VerseStoreAdapter, STORE_FILENAME
+        store_path = os.environ.get("SCRIPTURES_VERSE_STORE", os.path.join(data_dir, STORE_FILENAME))
+        if os.path.exists(store_path):
+            try:
+                return VerseStoreAdapter(
+                    store_path, data_dir,
+                    fallback_factory=lambda: build_text_fabric_adapter(data_dir)
+                )
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not open verse store {store_path}: {e}")
+        
+        return build_text_fabric_adapter(data_dir)
+
+def build_text_fabric_adapter(data_dir: str):
+    # Imported here so that processes served by the verse store never import Text-Fabric
+    from tf.app import use
+    from adapters.text_fabric_adapter import TextFabricAdapter
+    from adapters.dataset_registry import silenced_stdout
+    
+    # Define providers
+    def n1904_p():
+         with silenced_stdout():
+             try: return use("CenterBLC/N1904", version="1.0.0", silent=True)
+             except: return None
+    
+    def lxx_p():
+         with silenced_stdout():
+             try: return use("CenterBLC/LXX", version="1935", check=False, silent=True)
+             except: return None
+
+    return TextFabricAdapter(
+        data_dir=data_dir,
+        n1904_provider=n1904_p,
+        lxx_provider=lxx_p,
+    )
+
+def open_reference_database(data_dir: str, normalizer: BookNormalizer) -> ReferenceDatabase:
+    """
+    The SQLite cross-reference store when data/references.sqlite (or SCRIPTURES_REFERENCES_DB)
+    exists, otherwise the JSON-backed ReferenceDatabase.
+    """
+    db_path = os.environ.get("SCRIPTURES_REFERENCES_DB", os.path.join(data_dir, REFERENCES_DB_FILENAME))
+    if os.path.exists(db_path):
+        return SqliteReferenceDatabase(data_dir, normalizer, db_path=db_path)
+    return ReferenceDatabase(data_dir, normalizer)
+
+class ServiceFactory:
+    """
+    App-lifetime BibleService. The adapter, normalizer and reference index it holds
+    are read-mostly and shared by every request instead of being rebuilt per request.
+    """
+    _service = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "BibleService":
+        if cls._service:
+            return cls._service
+        with cls._lock:
+            if not cls._service:
+                cls._service = BibleService(AdapterFactory.get())
+            return cls._service
+
+def translation_version(translation: str, is_nt: bool, french_version: Optional[str] = None) -> Optional[str]:
+    """'gr' / 'hb' / 'fr' / 'en' / 'ar' or a version code -> the version read for a verse of that testament."""
+    t = translation.lower()
+    if t == 'en': return 'N1904_EN'
+    if t == 'fr': return (french_version or "tob").upper()
+    if t == 'gr': return 'N1904' if is_nt else 'LXX'
+    if t == 'hb': return 'BHSA'
+    if t == 'ar': return 'NAV'
+    if t in ['tob', 'bj', 'nav', 'lxx', 'bhsa', 'n1904']: return t.upper()
+    return None
+
+class TranslationPlan(NamedTuple):
+    """The versions a request reads for the verses of one testament."""
+    primary_version: str
+    # Read alongside the primary version, in the requested order
+    parallel_versions: Tuple[str, ...]
+    # Full text of cross-reference targets of this testament, in order of preference
+    crossref_versions: Tuple[str, ...]
+
+@lru_cache(maxsize=256)
+def compile_translation_plan(
+    translations: Tuple[str, ...],
+    version: str,
+    french_version: Optional[str],
+    is_nt: bool
+) -> TranslationPlan:
+    """
+    Requested `translations` (lower case) -> TranslationPlan for verses of the New (`is_nt`)
+    or Old Testament. `version` is the primary version when no translation picks one.
+    """
+    candidates = [c for c in (translation_version(t, is_nt, french_version) for t in translations) if c]
+    
+    # Determine best primary version based on requested translations
+    best = None
+    if not is_nt and 'BHSA' in candidates: best = 'BHSA'
+    elif (is_nt and 'N1904' in candidates) or (not is_nt and 'LXX' in candidates):
+        best = 'N1904' if is_nt else 'LXX'
+    elif is_nt and 'N1904_EN' in candidates:
+        best = 'N1904_EN'
+    elif 'N1904' in candidates: best = 'N1904'
+    
+    if not best:
+        best = next((c for c in candidates if c in ['TOB', 'BJ']), None)
+    if not best and 'NAV' in candidates: best = 'NAV'
+    
+    primary_v = best or ("LXX" if version == "N1904" and not is_nt else version)
+    
+    # Parallels (same for every verse); defaults if no translations requested
+    greek = 'N1904' if is_nt else 'LXX'
+    fr = (french_version or "tob").upper()
+    if translations:
+        parallels = [c for c in candidates if c != primary_v]
+    else:
+        parallels = [v for v in (greek, None if is_nt else 'BHSA', fr) if v and v != primary_v]
+    
+    # Cross-reference targets: requested versions that exist for the testament, else originals then French
+    if translations:
+        crossref = []
+        for v_c in candidates:
+            if v_c == 'BHSA' and is_nt: continue
+            if v_c in ('N1904', 'LXX'): v_c = greek
+            crossref.append(v_c)
+    else:
+        crossref = [greek] + ([] if is_nt else ['BHSA']) + [fr]
+    
+    # Deduplicated, order kept
+    return TranslationPlan(primary_v, tuple(dict.fromkeys(parallels)), tuple(dict.fromkeys(crossref)))
+
+class SearchPlan(NamedTuple):
+    """What a search reads: the parsed reference and the versions to read it in."""
+    reference: str
+    book_code: str
+    chapter: int
+    verse: int
+    # First and last (book, chapter, verse) of the reference; verse 0 = whole chapter
+    start: VerseKey
+    end: VerseKey
+    # Explicit verses when known up front, None to list them from the primary version's atlas
+    targets: Optional[List[VerseKey]]
+    is_nt: bool
+    primary_version: str
+    parallel_versions: Tuple[str, ...]
+    translations: List[str]
+    french_version: Optional[str]
 
 class BibleService:
-    def __init__(self, adapter: Optional[TextFabricAdapter] = None):
+    def __init__(self, adapter: Optional[BibleProvider] = None):
         self.adapter = adapter or AdapterFactory.get()
         self.normalizer = self.adapter.normalizer
         # Initialize DB on demand or here? 
         # RefDB needs data_dir.
         self.data_dir = self.adapter.data_dir
-        self.ref_db = ReferenceDatabase(self.data_dir, self.normalizer)
+        self.ref_db = open_reference_database(self.data_dir, self.normalizer)
+        # version -> VerseAtlas (which chapters and verses it has)
+        self._atlases: Dict[str, VerseAtlas] = {}
+        self._fulltext_index = None
+        self._morphology_index = None
+        # search() responses by parsed request; SCRIPTURES_SEARCH_CACHE_TTL (seconds) expires them
+        ttl = os.environ.get("SCRIPTURES_SEARCH_CACHE_TTL")
+        self.search_cache = LRUCache(
+            maxsize=int(os.environ.get("SCRIPTURES_SEARCH_CACHE_SIZE", SEARCH_CACHE_SIZE)),
+            ttl=float(ttl) if ttl else None
+        )
+        # (query, versions, exact, scope) -> (total, ranked matches, scores): later pages bisect it
+        self.ranking_cache = LRUCache(maxsize=RANKING_CACHE_SIZE)
 
     def _localize_ref(self, target_str: str) -> str:
         if not target_str: return ""
         
+        # Fast path: "BOOK.C.V" keys and ranges decode straight from their verse ids
+        target_range = parse_target_range(target_str, self.normalizer.book_order)
+        if target_range:
+            return self.normalizer.range_label(target_range)
+        
         def parse_one(ref):
             parts = ref.split(".")
             if len(parts) >= 3:
@@ -97,6 +276,618 @@ class BibleService:
              
         return target_str
 
+    def _fetch_verses(self, targets: List[Tuple[str, int, int]], version: str) -> Dict[Tuple[str, int, int], Any]:
+        """
+        (book, chapter, verse) -> Verse of `version` for `targets`.
+        Reads each chapter once with get_chapter; a lone verse of a chapter uses get_verse.
+        """
+        by_chapter = {}
+        for b, c, v in targets:
+            by_chapter.setdefault((b, c), []).append(v)
+        
+        found = {}
+        for (b, c), verses in by_chapter.items():
+            try:
+                if len(verses) == 1:
+                    v_obj = self.adapter.get_verse(b, c, verses[0], version=version)
+                    if v_obj:
+                        found[(b, c, verses[0])] = v_obj
+                    continue
+                wanted = set(verses)
+                for v_obj in self.adapter.get_chapter(b, c, version):
+                    if v_obj.verse in wanted:
+                        found[(b, c, v_obj.verse)] = v_obj
+            except Exception:
+                pass
+        return found
+
+    @property
+    def fulltext_index(self) -> FullTextIndex:
+        """Per-version inverted indexes under data/search, opened (or built) on first search."""
+        if self._fulltext_index is None:
+            self._fulltext_index = FullTextIndex(search_index_dir(self.data_dir), self.normalizer.book_codes, self.adapter)
+        return self._fulltext_index
+
+    def search_versions(self) -> List[str]:
+        """Versions searched by default: those with an index on disk or a loaded dataset."""
+        versions = self.fulltext_index.indexed_versions()
+        dataset_states = getattr(self.adapter, "dataset_states", None)
+        states = dataset_states() if callable(dataset_states) else None
+        if isinstance(states, dict):
+            for v_code, dataset in VERSION_DATASETS.items():
+                state = states.get(dataset)
+                if state and state.status == DatasetStatus.READY and v_code not in versions:
+                    versions.append(v_code)
+        return versions or list(DEFAULT_SEARCH_VERSIONS)
+
+    def parse_scope(self, spec: Optional[str]) -> Optional[VerseScope]:
+        """
+        'NT', 'OT', 'Apocrypha', 'Pentateuch', 'Gospels', a book ('Rm'), a chapter ('Rm 8'),
+        a range ('Rm 1-8', 'Gn 1:1-11:9'), or several of them joined by commas -> VerseScope.
+        None for an empty spec; raises ValueError for an unknown one.
+        """
+        if not spec or not spec.strip():
+            return None
+        ranges = []
+        for part in (p.strip() for p in spec.split(",")):
+            if not part:
+                continue
+            scope = named_scope(self.normalizer, part)
+            if scope:
+                ranges.extend(scope.ranges)
+                continue
+            span = self._scope_span(part)
+            if span is None:
+                raise ValueError(f"Unknown scope '{part}'")
+            ranges.append(span)
+        return VerseScope(ranges, spec.strip()) if ranges else None
+
+    def _scope_span(self, part: str) -> Optional[VerseRange]:
+        order = self.normalizer.book_order
+        def span(key: VerseKey) -> Optional[VerseRange]:
+            ordinal = order.get(key[0])
+            if ordinal is None:
+                return None
+            if key[2]:
+                verse_id = encode_verse_id(ordinal, key[1], key[2])
+                return VerseRange(verse_id, verse_id)
+            return chapter_span(ordinal, key[1])
+        
+        verse_range = self._parse_range(part)
+        if verse_range:
+            start, end = span(verse_range[0]), span(verse_range[1])
+            return VerseRange(start.start, end.end) if start and end else None
+        norm_ref = self.adapter.normalize_reference(part)
+        if norm_ref:
+            return span(tuple(norm_ref))
+        # A whole book: "Rm", "1 Co"
+        norm_ref = self.adapter.normalize_reference(f"{part} 1")
+        if norm_ref and order.get(norm_ref[0]) is not None:
+            return book_span(order[norm_ref[0]])
+        return None
+
+    def fulltext(
+        self,
+        query: str,
+        versions: Optional[List[str]] = None,
+        limit: int = 100,
+        exact: bool = False,
+        scope: Optional[str] = None,
+        order: str = "relevance",
+        parallels: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> SearchResponse:
+        """
+        Verses matching `query` in each of `versions` (default: search_versions()):
+        words are ANDed, `OR` joins alternatives, "quoted words" must be consecutive,
+        `a NEAR/k b` finds a and b at most k words apart.
+        Case and diacritics are ignored ("λογος" finds "λόγος"), unless `exact`.
+        `scope` restricts the verses searched (see parse_scope).
+        Hits are ranked by BM25 score ("relevance") or in canonical verse order ("canonical");
+        only the first `limit` are read. Each hit has the offsets of its matching words.
+        `parallels` ('gr', 'hb', 'en', 'fr', 'ar' or version codes) attaches the same verse in
+        other versions to each hit: 'gr' is N1904 for New Testament hits and LXX otherwise.
+        `next_cursor` resumes after the last hit, when there are more (same query and options).
+        Ranking by relevance scores every match once per query: the ranking is kept (see
+        ranking_cache), so following pages cost a bisect, as in canonical order, until it is evicted.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        versions, total, matches, scores = self._fulltext_matches(query, versions, exact, scope, order, cursor)
+        page = list(islice(matches, limit + 1))
+        next_cursor = self._search_cursor(page[limit - 1], scores) if len(page) > limit else None
+        return SearchResponse(
+            query=query, versions=versions, total=total,
+            hits=self._fulltext_hits(page[:limit], query, exact, scores, parallels),
+            next_cursor=next_cursor
+        )
+
+    def iter_fulltext(
+        self,
+        query: str,
+        versions: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        exact: bool = False,
+        scope: Optional[str] = None,
+        order: str = "relevance",
+        parallels: Optional[List[str]] = None,
+        page_size: int = SEARCH_PAGE_SIZE
+    ) -> Iterator[SearchHit]:
+        """
+        The hits of fulltext() one by one (every hit when `limit` is None or 0): verses are
+        read `page_size` at a time, so only one page of hits is held in memory.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be at least 0")
+        _, _, matches, scores = self._fulltext_matches(query, versions, exact, scope, order)
+        if limit:
+            matches = islice(matches, limit)
+        while True:
+            page = list(islice(matches, page_size))
+            if not page:
+                return
+            yield from self._fulltext_hits(page, query, exact, scores, parallels)
+
+    def _fulltext_matches(
+        self,
+        query: str,
+        versions: Optional[List[str]],
+        exact: bool,
+        scope: Optional[str],
+        order: str,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[str], int, Iterator[tuple], Dict[Tuple[int, str], float]]:
+        """
+        (versions searched, total, (verse_id, version order, version) matches after `cursor`
+        in result order, BM25 scores by (verse_id, version) when ranked by relevance).
+        """
+        order = SearchOrder(order)
+        versions = list(dict.fromkeys(v.upper() for v in versions)) if versions else self.search_versions()
+        verse_scope = self.parse_scope(scope)
+        after = self._parse_search_cursor(cursor, order) if cursor else None
+        
+        if order == SearchOrder.RELEVANCE:
+            total, ranked, scores = self._ranking(query, versions, exact, scope, verse_scope)
+            start = bisect_right(ranked, (-after[2], after[0], after[1])) if after else 0
+            return versions, total, _tail(ranked, start, lambda r: (r[1], r[2], versions[r[2]])), scores
+        
+        results = [(v_order, v_code, self.fulltext_index.search(query, v_code, exact, verse_scope))
+                   for v_order, v_code in enumerate(versions)]
+        total = sum(len(ids) for _, _, ids in results)
+        # Each version's ids are sorted: resume by bisecting them, then merge lazily
+        streams = []
+        for v_order, v_code, ids in results:
+            start = 0
+            if after:
+                # The cursor's verse in a later version, or any later verse
+                start = bisect_left(ids, after[0]) if v_order > after[1] else bisect_right(ids, after[0])
+            streams.append(_tail(ids, start, lambda verse_id, o=v_order, c=v_code: (verse_id, o, c)))
+        return versions, total, heapq.merge(*streams), {}
+
+    def _ranking(
+        self,
+        query: str,
+        versions: List[str],
+        exact: bool,
+        scope: Optional[str],
+        verse_scope: Optional[VerseScope]
+    ) -> Tuple[int, List[Tuple[float, int, int]], Dict[Tuple[int, str], float]]:
+        """
+        (total, (-score, verse_id, version order) sorted best first, scores by (verse_id, version))
+        of a relevance query, computed once and kept in ranking_cache for its next pages.
+        """
+        key = (query, tuple(versions), exact, scope)
+        revision = self._data_revision(False)
+        cached = self.ranking_cache.get(key, revision)
+        if cached is not None:
+            return cached
+        total = 0
+        ranked = []
+        scores: Dict[Tuple[int, str], float] = {}
+        for v_order, v_code in enumerate(versions):
+            ids = self.fulltext_index.search(query, v_code, exact, verse_scope)
+            total += len(ids)
+            version_scores = self.fulltext_index.scores(query, v_code, ids, exact)
+            scores.update(zip(((verse_id, v_code) for verse_id in ids), version_scores))
+            ranked.extend((-score, verse_id, v_order) for verse_id, score in zip(ids, version_scores))
+        # Best first; ties stay in canonical order
+        ranked.sort()
+        self.ranking_cache.put(key, (total, ranked, scores), revision)
+        return total, ranked, scores
+
+    @staticmethod
+    def _search_cursor(match: tuple, scores: Dict[Tuple[int, str], float]) -> str:
+        """Cursor after a (verse_id, version order, version) match: 'verse_id:order', prefixed by the score when ranked."""
+        verse_id, v_order, v_code = match
+        cursor = f"{verse_id}:{v_order}"
+        return f"{scores[(verse_id, v_code)]!r}:{cursor}" if scores else cursor
+
+    @staticmethod
+    def _parse_search_cursor(cursor: str, order: SearchOrder) -> Tuple[int, int, float]:
+        """(verse_id, version order, score) of a _search_cursor (score 0 in canonical order)."""
+        parts = cursor.split(":")
+        try:
+            if order == SearchOrder.RELEVANCE and len(parts) == 3:
+                return int(parts[1]), int(parts[2]), float(parts[0])
+            if order == SearchOrder.CANONICAL and len(parts) == 2:
+                return int(parts[0]), int(parts[1]), 0.0
+        except ValueError:
+            pass
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+    def _fulltext_hits(
+        self,
+        page: List[tuple],
+        query: str,
+        exact: bool,
+        scores: Dict[Tuple[int, str], float],
+        parallels: Optional[List[str]]
+    ) -> List[SearchHit]:
+        joined = self._join_parallels(page, parallels) if parallels else {}
+        terms = query_terms(query, exact)
+        def extras(verse_id: int, v_code: str, v_obj: Verse) -> dict:
+            return {
+                "score": round(scores[(verse_id, v_code)], 4) if scores else None,
+                "highlights": [TextSpan(start=s, end=e) for s, e in highlight_spans(v_obj.text, terms, exact)],
+                "parallels": joined.get((verse_id, v_code), []),
+            }
+        return self._search_hits(page, extras)
+
+    def _join_parallels(self, page: List[tuple], parallels: List[str]) -> Dict[Tuple[int, str], List[Verse]]:
+        """
+        (verse_id, version) of each (verse_id, order, version) match -> its verses in the `parallels`
+        versions. Every parallel version is read once for the whole page (one chapter read per
+        chapter, see _fetch_verses), then joined back on verse id.
+        """
+        book_codes = self.normalizer.book_codes
+        # Parallel versions of each hit, in the requested order
+        wanted: Dict[Tuple[int, str], List[str]] = {}
+        keys_by_version: Dict[str, Dict[int, Tuple[str, int, int]]] = {}
+        for verse_id, _, v_code in page:
+            ordinal, ch, vs = decode_verse_id(verse_id)
+            book_code = book_codes[ordinal]
+            is_nt = self.normalizer.is_nt(book_code)
+            hit_versions = []
+            for t in parallels:
+                p_code = translation_version(t, is_nt)
+                # No Hebrew text for the New Testament
+                if not p_code or p_code == v_code or p_code in hit_versions or (p_code == 'BHSA' and is_nt):
+                    continue
+                hit_versions.append(p_code)
+                keys_by_version.setdefault(p_code, {})[verse_id] = (book_code, ch, vs)
+            wanted[(verse_id, v_code)] = hit_versions
+        
+        by_version = {}
+        for p_code, keys in keys_by_version.items():
+            found = self._fetch_verses(list(keys.values()), p_code)
+            by_version[p_code] = {verse_id: found[key] for verse_id, key in keys.items() if key in found}
+        
+        return {
+            (verse_id, v_code): [by_version[p][verse_id] for p in hit_versions if verse_id in by_version[p]]
+            for (verse_id, v_code), hit_versions in wanted.items()
+        }
+
+    def _search_hits(self, page: List[tuple], extras: Optional[Callable[[int, str, Verse], dict]] = None) -> List[SearchHit]:
+        """
+        (verse_id, order, version) matches -> SearchHits, reading one chapter per (version, book, chapter).
+        `extras(verse_id, version, verse)` returns additional SearchHit fields.
+        """
+        book_codes = self.normalizer.book_codes
+        targets = {}
+        for verse_id, _, v_code in page:
+            ordinal, ch, vs = decode_verse_id(verse_id)
+            targets.setdefault(v_code, []).append((book_codes[ordinal], ch, vs))
+        found = {v_code: self._fetch_verses(keys, v_code) for v_code, keys in targets.items()}
+        
+        hits = []
+        for verse_id, _, v_code in page:
+            ordinal, ch, vs = decode_verse_id(verse_id)
+            key = (book_codes[ordinal], ch, vs)
+            v_obj = found[v_code].get(key)
+            if v_obj:
+                hits.append(SearchHit(
+                    ref=f"{key[0]} {ch}:{vs}",
+                    ref_localized=self._localize_ref(f"{key[0]}.{ch}.{vs}"),
+                    verse=v_obj,
+                    **(extras(verse_id, v_code, v_obj) if extras else {})
+                ))
+        return hits
+
+    @property
+    def morphology_index(self) -> MorphologyIndexes:
+        """Per-version lemma and morphology indexes under data/search, built on first query."""
+        if self._morphology_index is None:
+            self._morphology_index = MorphologyIndexes(search_index_dir(self.data_dir), self.normalizer.book_codes, self.adapter)
+        return self._morphology_index
+
+    def morphology(self, query: str, version: Optional[str] = None, limit: int = 100) -> SearchResponse:
+        """
+        Verses with a word matching `query` (see morphology_index.parse_morph_query), e.g.
+        "λύω tense=aorist voice=passive mood=participle book=Lk" (`book=` takes any scope, see parse_scope).
+        `version` defaults to BHSA for Old Testament scopes or Hebrew lemmas, N1904 otherwise.
+        """
+        features, scope = parse_morph_query(query)
+        if not features:
+            raise ValueError("Morphology query needs a lemma or a feature (e.g. 'λύω tense=aorist')")
+        verse_scope = self.parse_scope(scope)
+        
+        if not version:
+            hebrew = any("\u0590" <= c <= "\u05ff" for lemma in features.get("lemma", []) for c in lemma)
+            first_book = self.normalizer.book_codes[decode_verse_id(verse_scope.ranges[0].start)[0]] if verse_scope else None
+            version = "BHSA" if (first_book and self.normalizer.is_ot(first_book)) or hebrew else "N1904"
+        version = version.upper()
+        
+        found = self.morphology_index.search(features, version, verse_scope)
+        page = [(verse_id, 0, version) for verse_id, _ in found[:limit]]
+        words = dict(found[:limit])
+        return SearchResponse(
+            query=query, versions=[version], total=len(found),
+            hits=self._search_hits(page, lambda verse_id, v_code, v_obj: {"matches": words.get(verse_id, [])})
+        )
+
+    def traverse(
+        self,
+        reference: str,
+        depth: int = 2,
+        limit: int = 500,
+        rel_types: Optional[List[str]] = None,
+        crossref_source: Optional[str] = None
+    ) -> CrossReferenceGraphResponse:
+        """
+        Every verse reachable from `reference` within `depth` cross-reference hops
+        (at most `limit` verses), optionally following only `rel_types` relations.
+        """
+        norm_ref = self.adapter.normalize_reference(reference)
+        if not norm_ref:
+            raise ValueError(f"Invalid reference '{reference}'")
+        book_code, chapter, verse = norm_ref
+        if verse == 0:
+            raise ValueError(f"'{reference}' is not a single verse")
+        
+        to_key = self.normalizer.verse_key
+        
+        graph = self.ref_db.get_graph(source_filter=crossref_source, scope='all')
+        reached, truncated = [], False
+        start_id = self.normalizer.verse_id(book_code, chapter, verse)
+        if start_id is not None:
+            reached, truncated = graph.traverse(start_id, max_depth=depth, max_results=limit, rel_types=rel_types)
+        
+        nodes = []
+        for verse_id, hops, parent_id, rel_type in reached:
+            ref = to_key(verse_id)
+            nodes.append(CrossReferenceNode(
+                ref=ref,
+                ref_localized=self._localize_ref(ref),
+                depth=hops,
+                via=to_key(parent_id),
+                rel_type=rel_type
+            ))
+        
+        return CrossReferenceGraphResponse(
+            reference=f"{book_code}.{chapter}.{verse}",
+            depth=depth,
+            nodes=nodes,
+            truncated=truncated
+        )
+
+    def _atlas(self, version: str) -> VerseAtlas:
+        """Verse atlas of `version`, built once per version and shared by every request."""
+        atlas = self._atlases.get(version)
+        if atlas is None:
+            atlas = self._atlases[version] = VerseAtlas(self.adapter, version, self.normalizer)
+        return atlas
+
+    def _parse_range(self, reference: str) -> Optional[Tuple[VerseKey, VerseKey]]:
+        """
+        'Mt 5:1-12', 'Gn 1-2', 'Mt 5:1-7:29', 'Mt 27:1-Mc 1:5' (or 'MRK.7.3-8.1')
+        -> ((book, chapter, verse), (book, chapter, verse)). A verse of 0 means a whole chapter.
+        Returns None when `reference` is not a valid range.
+        """
+        if "-" not in reference:
+            return None
+        start_s, end_s = [p.strip() for p in reference.split("-", 1)]
+        norm_start = self.adapter.normalize_reference(start_s)
+        if not norm_start:
+            return None
+        b_s, c_s, v_s = norm_start
+        
+        if end_s.isdigit():
+            # "Mt 5:1-12" ends on a verse, "Gn 1-2" on a chapter
+            end = (b_s, c_s, int(end_s)) if v_s else (b_s, int(end_s), 0)
+        else:
+            # "7:29" / "7.29" stay in the start book, anything else names its own book
+            if re.fullmatch(r"\d+[:.]\d+", end_s):
+                end_s = f"{b_s} {end_s.replace('.', ':')}"
+            norm_end = self.adapter.normalize_reference(end_s)
+            if not norm_end:
+                return None
+            end = tuple(norm_end)
+        
+        b_e, c_e, v_e = end
+        if b_e == b_s:
+            if (c_e, v_e or FIELD_MASK) < (c_s, v_s):
+                return None
+        elif self.normalizer.book_order.get(b_e, -1) < self.normalizer.book_order.get(b_s, -1):
+            return None
+        return (b_s, c_s, v_s), end
+
+    def plan_search(
+        self,
+        reference: str,
+        translations: Optional[List[str]] = None,
+        version: str = "N1904",
+        french_version: Optional[str] = None
+    ) -> SearchPlan:
+        """Parses `reference` and picks the primary and parallel versions. Raises ValueError for an invalid reference."""
+        # 0. Parse Reference (Handle Range vs Single)
+        target_verses = None
+        verse_range = self._parse_range(reference)
+        if verse_range:
+            start, end = verse_range
+            book_code, chapter, verse = start # Context is the start
+            if start[0] == end[0] and start[1] == end[1] and start[2]:
+                # Verses of one chapter: no need to know which verses exist
+                target_verses = [(book_code, chapter, v) for v in range(start[2], end[2] + 1)]
+        else:
+            if "-" in reference and self.adapter.normalize_reference(reference.split("-", 1)[0].strip()):
+                # Valid start, but the end is unknown or comes before it ("Mt 28:2-27:1")
+                raise ValueError(f"Invalid range '{reference}'")
+            norm_ref = self.adapter.normalize_reference(reference)
+            if not norm_ref:
+                raise ValueError(f"Invalid reference '{reference}'")
+            book_code, chapter, verse = norm_ref
+            start = end = (book_code, chapter, verse)
+            if verse != 0:
+                target_verses = [start]
+            # else: whole chapter, listed from the primary version's atlas
+        
+        # 1. Versions read (compiled once per translations / testament)
+        is_nt = self.normalizer.is_nt(book_code)
+        current_translations = translations or []
+        versions = compile_translation_plan(
+            tuple(t.lower() for t in current_translations), version, french_version, is_nt
+        )
+        return SearchPlan(
+            reference=reference,
+            book_code=book_code,
+            chapter=chapter,
+            verse=verse,
+            start=start,
+            end=end,
+            targets=target_verses,
+            is_nt=is_nt,
+            primary_version=versions.primary_version,
+            parallel_versions=versions.parallel_versions,
+            translations=current_translations,
+            french_version=french_version
+        )
+
+    def iter_verses(
+        self,
+        reference: str,
+        translations: Optional[List[str]] = None,
+        version: str = "N1904",
+        french_version: Optional[str] = None
+    ) -> Iterator[VerseItem]:
+        """
+        Yields the VerseItems of `reference` in canonical order, reading one chapter at a time,
+        so long ranges ("Mt 5:1-7:29", "Gn 1-Ex 40") can be printed as they are read.
+        The reference is checked before this returns (ValueError if invalid).
+        """
+        return self._iter_items(self.plan_search(reference, translations, version, french_version))
+
+    def _iter_items(self, plan: SearchPlan) -> Iterator[VerseItem]:
+        return (item for _, item in self._iter_keyed_items(plan))
+
+    def _iter_keyed_items(self, plan: SearchPlan) -> Iterator[Tuple[VerseKey, VerseItem]]:
+        """
+        ((book_code, chapter, verse) target, VerseItem) pairs: the item's primary.book_code is a
+        display name for some versions ("Mark" in N1904_EN), the target is always a book code.
+        """
+        targets = plan.targets
+        if targets is None:
+            targets = self._atlas(plan.primary_version).iter_range(plan.start, plan.end)
+        
+        # Determine localized book name (Logic ported from CLI)
+        current_translations = [t.lower() for t in plan.translations]
+        is_french = 'fr' in current_translations if current_translations else True # Default
+        
+        # Bulk reads: one get_chapter per (book, chapter, version)
+        for _, chapter_targets in groupby(targets, key=lambda t: (t[0], t[1])):
+            chapter_targets = list(chapter_targets)
+            primary_found = self._fetch_verses(chapter_targets, plan.primary_version)
+            if not primary_found:
+                continue
+            found_targets = [t for t in chapter_targets if t in primary_found]
+            parallels_found = {v_code: self._fetch_verses(found_targets, v_code) for v_code in plan.parallel_versions}
+            
+            # Assembly Loop
+            for b, c, v in found_targets:
+                try:
+                     item_primary = primary_found[(b, c, v)]
+                     item_parallels = []
+                     
+                     for v_code in plan.parallel_versions:
+                         p_v = parallels_found[v_code].get((b, c, v))
+                         if p_v:
+                             item_parallels.append(p_v)
+                     
+                     header_name = None
+                     code = item_primary.book_code
+                     if is_french:
+                         n1904_name = self.normalizer.code_to_n1904.get(code, code)
+                         tob_name = self.normalizer.n1904_to_tob.get(n1904_name)
+                         if tob_name: header_name = tob_name
+                     
+                     if not header_name:
+                         # English fallback if requested or default
+                         is_english = 'en' in current_translations or item_primary.version == "N1904_EN"
+                         
+                         if is_english:
+                             en_name = self.normalizer.code_to_n1904.get(code, code)
+                             if en_name: header_name = en_name.replace("_", " ")
+    
+                     # Attach name to primary
+                     # We need to recreate the Verse object since it's frozen
+                     item_primary = item_primary.model_copy(update={"book_name": header_name})
+                     
+                     yield (b, c, v), VerseItem(
+                         ref=f"{b} {c}:{v}",
+                         primary=item_primary,
+                         parallels=item_parallels
+                     )
+                except Exception:
+                    pass
+
+    def get_cross_references(
+        self,
+        reference: str,
+        translations: Optional[List[str]] = None,
+        version: str = "N1904",
+        french_version: Optional[str] = None,
+        crossref_full: bool = False,
+        crossref_source: Optional[str] = None,
+        direction: str = "outgoing"
+    ) -> Optional[VerseCrossReferences]:
+        """Cross-references of a single-verse `reference` (None for chapters and ranges, see get_cross_references_by_verse)."""
+        plan = self.plan_search(reference, translations, version, french_version)
+        return self._cross_references(plan, crossref_full, crossref_source, CrossReferenceDirection(direction))
+
+    def iter_verses_with_crossrefs(
+        self,
+        reference: str,
+        translations: Optional[List[str]] = None,
+        version: str = "N1904",
+        french_version: Optional[str] = None,
+        crossref_full: bool = False,
+        crossref_source: Optional[str] = None,
+        direction: str = "outgoing"
+    ) -> Iterator[Tuple[VerseItem, Optional[VerseCrossReferences]]]:
+        """
+        Yields (VerseItem, its cross-references or None) like iter_verses, one chapter at a time:
+        the cross-references of a chapter are looked up (one range scan) when it is read.
+        The reference is checked before this returns (ValueError if invalid).
+        """
+        plan = self.plan_search(reference, translations, version, french_version)
+        return self._iter_items_with_crossrefs(plan, crossref_full, crossref_source, CrossReferenceDirection(direction))
+
+    def _iter_items_with_crossrefs(self, plan, crossref_full, crossref_source, direction):
+        if self._is_single_verse(plan):
+            for item in self._iter_items(plan):
+                yield item, self._cross_references(plan, crossref_full, crossref_source, direction)
+            return
+        targets = plan.targets
+        if targets is None:
+            targets = self._atlas(plan.primary_version).iter_range(plan.start, plan.end)
+        # Grouped by target, not by item: a chapter is complete without reading the next one
+        for _, chapter_targets in groupby(targets, key=lambda t: (t[0], t[1])):
+            keyed = list(self._iter_keyed_items(plan._replace(targets=list(chapter_targets))))
+            by_verse = self._cross_references_by_verse(
+                plan, crossref_full, crossref_source, direction, keys=[key for key, _ in keyed]
+            )
+            for key, item in keyed:
+                yield item, by_verse.get(key)
+
     def search(
         self, 
         reference: str, 
@@ -105,404 +896,288 @@ class BibleService:
         french_version: Optional[str] = None,
         show_crossrefs: bool = False,
         crossref_full: bool = False,
-        crossref_source: Optional[str] = None
+        crossref_source: Optional[str] = None,
+        direction: str = "outgoing"
     ) -> VerseResponse:
+        """
+        `direction` selects cross-references from the verse ("outgoing"), pointing
+        to it ("incoming") or both. A single verse's are in `cross_references`; for chapters
+        and ranges, each verse item carries its own.
+        Responses are cached by parsed reference and versions read ("Jean 3:16" and
+        "Jn 3,16" share an entry) until a dataset loads or the cross-references change.
+        """
+        direction = CrossReferenceDirection(direction)
+        plan = self.plan_search(reference, translations, version, french_version)
+        with_crossrefs = show_crossrefs or crossref_full
         
+        key = (
+            plan.start, plan.end, plan.primary_version, tuple(plan.parallel_versions),
+            tuple(t.lower() for t in plan.translations), plan.french_version,
+            with_crossrefs, crossref_full, crossref_source, direction
+        )
+        # Taken before reading: a change while reading makes the entry stale at once
+        revision = self._data_revision(with_crossrefs)
+        cached = self.search_cache.get(key, revision)
+        if cached is not None:
+            return cached if cached.reference == reference else cached.model_copy(update={"reference": reference})
         
-        # 0. Parse Reference (Handle Range vs Single)
-        target_verses = []
-        book_code = None
-        chapter = None
-        verse = None
-        
-        parsed_range = False
-        if "-" in reference:
-            parts = reference.split("-")
-            if len(parts) == 2:
-                start_s = parts[0].strip()
-                end_s = parts[1].strip()
-                
-                # Normalize start
-                norm_start = self.adapter.normalize_reference(start_s)
-                if norm_start:
-                    b_s, c_s, v_s = norm_start
-                    # Ensure start is a specific verse, not chapter
-                    if v_s != 0:
-                        # Normalize end
-                        # Case A: digit only "8-9"
-                        if end_s.isdigit():
-                             v_e = int(end_s)
-                             # Assuming same chapter
-                             if v_e >= v_s:
-                                 for v in range(v_s, v_e + 1):
-                                     target_verses.append((b_s, c_s, v))
-                                 parsed_range = True
-                                 book_code, chapter, verse = b_s, c_s, v_s # Set context to start
-                        else:
-                             # Case B: detailed end? "7:9"?
-                             pass
-                    else:
-                        # Whole chapter start "Gn 1" -> End must be "2" or "1:5" (but usually "Gn 1-2" means Ch 1 to Ch 2)
-                        if end_s.isdigit():
-                             c_e = int(end_s)
-                             # Iterate Chapters
-                             if c_e >= c_s:
-                                 for c in range(c_s, c_e + 1):
-                                     # Fetch verses for this chapter (Need Primary Version! But we don't know it yet)
-                                     # We need to defer fetching, OR fetching just list of verses 
-                                     # We can't fetch text here easily because we haven't selected version.
-                                     # But we can assume standard versification or use normalizer/adapter helper to get verse count?
-                                     # Adapter has `get_chapter` which returns objects.
-                                     # Using 'N1904' or 'LXX' or 'BHSA' as temp to find available verses.
-                                     # We'll use a safe default to discover verses.
-                                     
-                                     temp_v = 'N1904' if self.normalizer.is_nt(b_s) else 'BHSA'
-                                     # Fallback if BHSA not avail? Use adapter defaults? 
-                                     # Actually `get_chapter` takes version.
-                                     
-                                     objs = self.adapter.get_chapter(b_s, c, temp_v)
-                                     if not objs and not self.normalizer.is_nt(b_s):
-                                         objs = self.adapter.get_chapter(b_s, c, 'LXX') # Fallback
-                                         
-                                     if objs:
-                                         for v_obj in objs:
-                                             target_verses.append((b_s, c, v_obj.verse))
-                                             
-                                 parsed_range = True
-                                 book_code, chapter, verse = b_s, c_s, 0
-
-        if not parsed_range:
-             norm_ref = self.adapter.normalize_reference(reference)
-             if not norm_ref:
-                 raise ValueError(f"Invalid reference '{reference}'")
-     
-             book_code, chapter, verse = norm_ref
-             
-             if verse == 0:
-                  # Whole chapter
-                  objs = self.adapter.get_chapter(book_code, chapter, version) # Use temp version to get list?
-                  # Actually primary_v is determined later.
-                  # We need to defer fetching until primary_v is known.
-                  # But we need book_code for primary_v logic.
-                  # So we just store intent.
-                  pass
-             else:
-                  target_verses.append((book_code, chapter, verse))
-                  
-        
-        # 1. Determine Primary Version
-        is_nt = self.normalizer.is_nt(book_code)
-        primary_v = version
-        
-        current_translations = translations or []
-        
-        # Determine best primary version based on requested translations
-        candidates = []
-        for t in current_translations:
-            t = t.lower()
-            if t == 'hb': candidates.append('BHSA')
-            elif t == 'gr': candidates.append('N1904' if is_nt else 'LXX')
-            elif t == 'en': candidates.append('N1904_EN')
-            elif t == 'fr': candidates.append((french_version or 'tob').upper())
-            elif t == 'ar': candidates.append('NAV')
-            elif t in ['tob', 'bj', 'nav', 'lxx', 'bhsa', 'n1904']: candidates.append(t.upper())
-            
-        best = None
-        if not is_nt and 'BHSA' in candidates: best = 'BHSA'
-        elif (is_nt and 'N1904' in candidates) or (not is_nt and 'LXX' in candidates): 
-             best = 'N1904' if is_nt else 'LXX'
-        elif is_nt and 'N1904_EN' in candidates: 
-             best = 'N1904_EN'
-        elif 'N1904' in candidates: best = 'N1904'
-        
-        if not best:
-             for c in candidates:
-                 if c in ['TOB', 'BJ']: 
-                     best = c
-                     break
-        if not best and 'NAV' in candidates: best = 'NAV'
-             
-        if best:
-             primary_v = best
-        else:
-             if version == "N1904" and not is_nt:
-                 primary_v = "LXX"
-
         # 2. Fetch Verses
-        verses_data = []
-        
-        # If whole chapter (verse=0 and not parsed_range), populate target_verses now
-        if not target_verses and verse == 0:
-             objs = self.adapter.get_chapter(book_code, chapter, primary_v)
-             for v_obj in objs:
-                 target_verses.append((book_code, chapter, v_obj.verse))
-             
-        # Fetch Loop
-        for b, c, v in target_verses:
-            try:
-                 main_v = self.adapter.get_verse(b, c, v, version=primary_v)
-                 if not main_v: continue
-                 
-                 item_primary = main_v
-                 item_parallels = []
-                 
-                 # Fetch Parallels
-                 # Logic for defaults if no translations requested
-                 vers_to_fetch = []
-                 if current_translations:
-                     for t in current_translations:
-                         t = t.lower()
-                         v_code = None
-                         if t == 'en': v_code = 'N1904_EN'
-                         elif t == 'fr': v_code = (french_version or "tob").upper()
-                         elif t == 'gr': v_code = 'N1904' if is_nt else 'LXX'
-                         elif t == 'hb': v_code = 'BHSA'
-                         elif t == 'ar': v_code = 'NAV'
-                         elif t in ['tob', 'bj', 'nav', 'lxx', 'bhsa', 'n1904']: v_code = t.upper()
-                         
-                         if v_code and v_code != primary_v:
-                             vers_to_fetch.append(v_code)
-                 else:
-                     # Defaults
-                     greek = 'N1904' if is_nt else 'LXX'
-                     if primary_v != greek: vers_to_fetch.append(greek)
-                     if not is_nt and primary_v != 'BHSA': vers_to_fetch.append('BHSA')
-                     fr = (french_version or "tob").upper()
-                     if primary_v != fr: vers_to_fetch.append(fr)
-                 
-                 # Deduplicate
-                 vers_to_fetch = list(set(vers_to_fetch))
-                 
-                 for v_code in vers_to_fetch:
-                     try:
-                         p_v = self.adapter.get_verse(b, c, v, version=v_code)
-                         if p_v:
-                             item_parallels.append(p_v)
-                     except:
-                         pass
-                 
-                 # Determine localized book name (Logic ported from CLI)
-                 header_name = None
-                 is_french = False
-                 if current_translations:
-                     if 'fr' in [t.lower() for t in current_translations]: is_french = True
-                 else:
-                     is_french = True # Default
-                 
-                 code = item_primary.book_code
-                 if is_french:
-                     n1904_name = self.normalizer.code_to_n1904.get(code, code)
-                     tob_name = self.normalizer.n1904_to_tob.get(n1904_name)
-                     if tob_name: header_name = tob_name
-                 
-                 if not header_name:
-                     # English fallback if requested or default
-                     is_english = False
-                     if current_translations and 'en' in [t.lower() for t in current_translations]: is_english = True
-                     if item_primary.version == "N1904_EN": is_english = True
-                     
-                     if is_english:
-                         en_name = self.normalizer.code_to_n1904.get(code, code)
-                         if en_name: header_name = en_name.replace("_", " ")
-
-                 # Attach name to primary
-                 # We need to recreate the Verse object since it's frozen
-                 item_primary = item_primary.model_copy(update={"book_name": header_name})
-                 
-                 verses_data.append(VerseItem(
-                     ref=f"{b} {c}:{v}",
-                     primary=item_primary,
-                     parallels=item_parallels
-                 ))
-            except Exception:
-                pass
-        # 3. Cross Refs (Only for single verse usually, or aggregate?)
-        # CLI logic seemed to imply cross refs for the requested reference.
-        # If chapter, loading cross refs for whole chapter might be heavy/noisy?
-        # CLI: if verse==0, it didn't seem to verify cross refs explicitly in the main loop?
-        # CLI lines 467: "Retrieve refs for this specific verse" implies single verse context usually.
-        # But if range or chapter, key logic might fail.
-        # Let's support it for the FIRST verse or the specific verse if single, 
-        # OR just leave it empty if chapter.
+        keyed = list(self._iter_keyed_items(plan))
+        verses_data = [item for _, item in keyed]
         
+        # 3. Cross Refs: the verse's own, or each verse's for chapters and ranges
         c_refs_model = None
-        if (show_crossrefs or crossref_full) and verse != 0:
-             s_filter = crossref_source
-             
-             # Logic removed: We should NOT auto-filter to 'tob' just because french_version is 'tob'
-             # unless explicitly requested. This restores visibility of generic cross-refs.
-                 
-             scope = 'nt' if is_nt else 'ot'
-             
-             # Load DB
-             self.ref_db.load_all(source_filter=s_filter, scope=scope)
-             
-             key = f"{book_code}.{chapter}.{verse}"
-             refs_dict = self.ref_db.in_memory_refs.get(key)
-             
-             if refs_dict:
-                 relations = []
-                 for r in refs_dict.get("relations", []):
-                     t_ref = r["target"]
-                     t_ref_loc = self._localize_ref(t_ref)
-
-                     relations.append(CrossReferenceRelation(
-                       target_ref=t_ref,
-                       target_ref_localized=t_ref_loc,
-                       rel_type=r["type"],
-                       note=r.get("note")
-                     ))
-                 
-                 c_refs_model = VerseCrossReferences(
-                     notes=refs_dict.get("notes", []),
-                     relations=relations
-                 )
-                 
-                 # Sorting (ported)
-                 def sort_key(rel):
-                     parsed = self.adapter.normalize_reference(rel.target_ref)
-                     if parsed:
-                         bk, ch, vs = parsed
-                         order = self.normalizer.book_order.get(bk, 999)
-                         return (0, order, ch, vs)
-                     return (1, rel.target_ref)
-                 
-                 c_refs_model.relations.sort(key=sort_key)
-                 
-                 
-                 c_refs_model.relations.sort(key=sort_key)
-                 
-                 # Full text fetch if requested
-                 if crossref_full:
-                     new_relations = []
-                     for rel in c_refs_model.relations:
-                         text_content = None
-                         target = rel.target_ref
-                         
-                         # Determine versions to try
-                         # Use current translations to pick preferred language for cross-ref?
-                         # Or default to N1904/LXX/BHSA/TOB order (similar to legacy)
-                         
-                         
-                         parsed = None
-                         verses_to_fetch_list = []
-                         # print(f"DEBUG: Initial normalize '{target}' -> {parsed}") # Disabled log
-                         
-                         if "-" in target:
-                             # Range Handling
-                             parts = target.split("-")
-                             if len(parts) == 2:
-                                 start_ref = parts[0].strip()
-                                 end_part = parts[1].strip()
-                                 
-                                 parsed_start = self.adapter.normalize_reference(start_ref)
-                                 if parsed_start:
-                                     b_s, c_s, v_s = parsed_start 
-                                     
-                                     # Determine end verse
-                                     # Try normalizing end part as full ref
-                                     # But end part usually just "4" or "8:1"
-                                     # We need to construct a candidate string using start's book
-                                     
-                                     # Case 1: "4" (Verse only)
-                                     if end_part.isdigit():
-                                         v_e = int(end_part)
-                                         c_e = c_s
-                                         b_e = b_s
-                                     elif ":" in end_part:
-                                         # Case 2: "8:1" (Chapter:Verse)
-                                         # Construct "Book 8:1"
-                                         # Need book key to reconstruct?
-                                         # We have book code b_s.
-                                         # Try normalizing "CODE 8:1"
-                                         candidate_end = f"{b_s} {end_part}"
-                                         parsed_end = self.adapter.normalize_reference(candidate_end)
-                                         if parsed_end:
-                                             b_e, c_e, v_e = parsed_end
-                                         else:
-                                             b_e, c_e, v_e = None, None, None
-                                     else:
-                                         # Case 3: Full Ref "Mc 8:1"? Usually not after hyphen if shared book.
-                                         parsed_end = self.adapter.normalize_reference(end_part)
-                                         if parsed_end:
-                                             b_e, c_e, v_e = parsed_end
-                                         else:
-                                             b_e, c_e, v_e = None, None, None
-                                     
-                                     if b_e and b_s == b_e:
-                                         # Iterate
-                                         # Simple iteration if same chapter
-                                         if c_s == c_e:
-                                             for v in range(v_s, v_e + 1):
-                                                 verses_to_fetch_list.append((b_s, c_s, v))
-                                         else:
-                                             # Multi-chapter range? Too complex for now?
-                                             # Legacy CLI logic for fetch in 'get_text_for_range'?
-                                             # Let's support simple same-chapter ranges first which is most common "7:3-4"
-                                             pass
-
-                         else:
-                             # Single verse fallback
-                             parsed = self.adapter.normalize_reference(target)
-                             if parsed:
-                                 verses_to_fetch_list.append(parsed)
-
-                         if verses_to_fetch_list:
-                             tb_first = verses_to_fetch_list[0][0]
-                             is_target_nt = self.normalizer.is_nt(tb_first)
-                             
-                             # Determine versions (Priority: Requested > Original > French)
-                             versions_to_try = []
-                             if current_translations:
-                                 for t in current_translations:
-                                     t = t.lower()
-                                     v_c = None
-                                     if t == 'en': v_c = 'N1904_EN'
-                                     elif t == 'fr': v_c = (french_version or "tob").upper()
-                                     elif t == 'gr': v_c = 'N1904' if is_target_nt else 'LXX'
-                                     elif t == 'hb': v_c = 'BHSA'
-                                     elif t == 'ar': v_c = 'NAV'
-                                     elif t in ['tob', 'bj', 'nav', 'lxx', 'bhsa', 'n1904']: v_c = t.upper()
-                                     
-                                     if v_c:
-                                          if v_c == 'BHSA' and is_target_nt: continue
-                                          if v_c == 'N1904' and not is_target_nt: v_c = 'LXX'
-                                          if v_c == 'LXX' and is_target_nt: v_c = 'N1904'
-                                          if v_c not in versions_to_try: versions_to_try.append(v_c)
-                             else:
-                                 versions_to_try.append('N1904' if is_target_nt else 'LXX')
-                                 if not is_target_nt: versions_to_try.append('BHSA')
-                                 versions_to_try.append((french_version or "tob").upper())
-
-                             texts_acc = []
-                             
-                             for v_code in versions_to_try:
-                                 v_texts = []
-                                 for (b, c, v) in verses_to_fetch_list:
-                                     try:
-                                         v_obj = self.adapter.get_verse(b, c, v, version=v_code)
-                                         if v_obj and v_obj.text:
-                                             v_texts.append(v_obj.text)
-                                     except: pass
-                                 if v_texts:
-                                     texts_acc.append(" ".join(v_texts))
-                             
-                             if texts_acc:
-                                  text_content = "\n".join(texts_acc)
-
-                         # Update relation with text
-                         new_relations.append(CrossReferenceRelation(
-                             target_ref=rel.target_ref,
-                             target_ref_localized=rel.target_ref_localized, # Must preserve this!
-                             rel_type=rel.rel_type,
-                             note=rel.note,
-                             text=text_content
-                         ))
-                     
-                     c_refs_model.relations = new_relations
+        if with_crossrefs and self._is_single_verse(plan):
+            c_refs_model = self._cross_references(plan, crossref_full, crossref_source, direction)
+        elif with_crossrefs:
+            by_verse = self._cross_references_by_verse(plan, crossref_full, crossref_source, direction)
+            verses_data = [
+                item.model_copy(update={"cross_references": by_verse.get(key)})
+                for key, item in keyed
+            ]
 
-        return VerseResponse(
+        response = VerseResponse(
             reference=reference,
             verses=verses_data,
             cross_references=c_refs_model
         )
+        self.search_cache.put(key, response, revision)
+        return response
+
+    def _data_revision(self, with_crossrefs: bool) -> tuple:
+        """
+        What cached search() responses depend on: the READY datasets (a successful reload changes
+        its load_seconds) and, with cross-references, ref_db's revision. Failed datasets are left
+        out: each retry records a new load_seconds, which would make every lookup a miss.
+        """
+        dataset_states = getattr(self.adapter, "dataset_states", None)
+        states = dataset_states() if callable(dataset_states) else None
+        datasets = None
+        if isinstance(states, dict):
+            datasets = tuple(sorted(
+                (name, s.load_seconds) for name, s in states.items() if s.status == DatasetStatus.READY
+            ))
+        return (datasets, self.ref_db.revision() if with_crossrefs else None)
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Counters of the search() response cache and of the cross-reference index cache."""
+        return {
+            "search": self.search_cache.cache_stats(),
+            "ranking": self.ranking_cache.cache_stats(),
+            "references": self.ref_db.cache_stats(),
+        }
+
+    @staticmethod
+    def _is_single_verse(plan: SearchPlan) -> bool:
+        return plan.verse != 0 and plan.start == plan.end
+
+    def _cross_references(
+        self,
+        plan: SearchPlan,
+        crossref_full: bool,
+        crossref_source: Optional[str],
+        direction: CrossReferenceDirection
+    ) -> Optional[VerseCrossReferences]:
+        # Cross refs of a single verse: point lookups in the shared indexes.
+        # Chapters and ranges get theirs per verse (_cross_references_by_verse).
+        if not self._is_single_verse(plan):
+            return None
+        
+        # Logic removed: We should NOT auto-filter to 'tob' just because french_version is 'tob'
+        # unless explicitly requested. This restores visibility of generic cross-refs.
+        s_filter = crossref_source
+        scope = 'nt' if plan.is_nt else 'ot'
+        key = f"{plan.book_code}.{plan.chapter}.{plan.verse}"
+        
+        # Shared indexes, built once per (scope, source)
+        refs_dict = None
+        if direction != CrossReferenceDirection.INCOMING:
+            refs_index = self.ref_db.get_index(source_filter=s_filter, scope=scope)
+            refs_dict = refs_index.get(key)
+        
+        incoming = []
+        if direction != CrossReferenceDirection.OUTGOING:
+            # Relations pointing here: the "target" shown is their source verse.
+            # Any scope: NT files point to OT verses (quotations) and vice versa.
+            incoming = self.ref_db.get_reverse_index(source_filter=s_filter, scope='all').get(key) or []
+        
+        if not refs_dict and not incoming:
+            return None
+        relations = self._crossref_relations([self._relation_entries(refs_dict, incoming)], crossref_full, plan)[0]
+        return VerseCrossReferences(notes=(refs_dict or {}).get("notes", []), relations=relations)
+
+    def _cross_references_by_verse(
+        self,
+        plan: SearchPlan,
+        crossref_full: bool,
+        crossref_source: Optional[str],
+        direction: CrossReferenceDirection,
+        keys: Optional[List[VerseKey]] = None
+    ) -> Dict[VerseKey, VerseCrossReferences]:
+        """
+        (book, chapter, verse) -> cross-references, for every verse of the plan (or of `keys`,
+        in canonical order) that has some.
+        Two range scans over ref_db's sorted verse-id indexes (sources inside the span, targets
+        overlapping it) instead of a lookup per verse; full texts are read once for all verses.
+        """
+        if keys is None:
+            keys = list(plan.targets if plan.targets is not None else self._atlas(plan.primary_version).iter_range(plan.start, plan.end))
+        if not keys:
+            return {}
+        ids = [self.normalizer.verse_id(*k) for k in keys]
+        key_of = dict(zip(ids, keys))
+        span = VerseRange(ids[0], ids[-1])
+        first_nt, last_nt = self.normalizer.is_nt(keys[0][0]), self.normalizer.is_nt(keys[-1][0])
+        scope = ('nt' if first_nt else 'ot') if first_nt == last_nt else 'all'
+        
+        outgoing: Dict[int, dict] = {}
+        if direction != CrossReferenceDirection.INCOMING:
+            for verse_id, _, refs in self.ref_db.get_range(span, source_filter=crossref_source, scope=scope):
+                if verse_id in key_of:
+                    outgoing[verse_id] = refs
+        
+        incoming: Dict[int, List[dict]] = {}
+        if direction != CrossReferenceDirection.OUTGOING:
+            reverse = self.ref_db.get_reverse_index(source_filter=crossref_source, scope='all')
+            for target_range, rel in reverse.overlapping(span):
+                # Every verse of the span the target covers
+                lo = bisect_left(ids, target_range.start)
+                for verse_id in ids[lo:bisect_right(ids, target_range.end, lo)]:
+                    incoming.setdefault(verse_id, []).append(rel)
+        
+        verse_ids = sorted(set(outgoing) | set(incoming))
+        groups = [self._relation_entries(outgoing.get(i), incoming.get(i, [])) for i in verse_ids]
+        relations = self._crossref_relations(groups, crossref_full, plan)
+        return {
+            key_of[i]: VerseCrossReferences(notes=(outgoing.get(i) or {}).get("notes", []), relations=rels)
+            for i, rels in zip(verse_ids, relations)
+        }
+
+    def _relation_entries(self, refs_dict: Optional[dict], incoming: List[dict]) -> List[tuple]:
+        """
+        (CrossReferenceRelation, ParsedTarget from ref_db or None) of a verse's outgoing and
+        incoming relation dicts, outgoing first, each in canonical target order.
+        """
+        entries = []
+        for r in (refs_dict or {}).get("relations", []):
+            parsed = r.get("parsed")
+            entries.append((CrossReferenceRelation(
+              target_ref=r["target"],
+              target_ref_localized=parsed.label if parsed else self._localize_ref(r["target"]),
+              rel_type=r["type"],
+              note=r.get("note")
+            ), parsed))
+        
+        for r in incoming:
+            parsed = r.get("parsed_source")
+            entries.append((CrossReferenceRelation(
+              target_ref=r["source"],
+              target_ref_localized=parsed.label if parsed else self._localize_ref(r["source"]),
+              rel_type=r["type"],
+              note=r.get("note"),
+              direction=CrossReferenceDirection.INCOMING
+            ), parsed))
+        
+        # Sorting (ported); outgoing relations first
+        # Verse ids sort in canonical (book, chapter, verse) order
+        def sort_key(entry):
+            rel, parsed = entry
+            is_incoming = rel.direction == CrossReferenceDirection.INCOMING
+            if parsed:
+                return (is_incoming, 0, parsed.sort_key)
+            # Not pre-parsed by ref_db
+            target_range = parse_target_range(rel.target_ref, self.normalizer.book_order)
+            if target_range:
+                return (is_incoming, 0, target_range.start)
+            parsed = self.adapter.normalize_reference(rel.target_ref)
+            if parsed:
+                bk, ch, vs = parsed
+                order = self.normalizer.book_order.get(bk, 999)
+                return (is_incoming, 0, encode_verse_id(order, ch, vs))
+            return (is_incoming, 1, rel.target_ref)
+        
+        entries.sort(key=sort_key)
+        return entries
+
+    def _crossref_relations(self, groups: List[List[tuple]], crossref_full: bool, plan: SearchPlan) -> List[List[CrossReferenceRelation]]:
+        """The relations of each group of _relation_entries, with their full text if `crossref_full` (one batch for all groups)."""
+        if not crossref_full:
+            return [[rel for rel, _ in entries] for entries in groups]
+        flat = [entry for entries in groups for entry in entries]
+        texts = iter(self._crossref_texts(
+            [(rel.target_ref, parsed.range if parsed else None) for rel, parsed in flat],
+            plan.translations, plan.french_version
+        ))
+        return [[rel.model_copy(update={"text": next(texts)}) for rel, _ in entries] for entries in groups]
+
+    def _crossref_texts(
+        self,
+        targets: List[Tuple[str, Optional[VerseRange]]],
+        translations: List[str],
+        french_version: Optional[str]
+    ) -> List[Optional[str]]:
+        """
+        Full text of each (target, its id range when pre-parsed) cross-reference target, a verse
+        or a range which may span chapters ("MRK.7.3-8.1") or books ("MRK.16.8-LUK.1.2"),
+        one paragraph per version read.
+        Every target is resolved first; each (version, book, chapter) they touch is then read
+        once for all of them, so overlapping targets cost no extra reads.
+        """
+        translations_key = tuple(t.lower() for t in translations)
+        # Versions tried per target testament (Priority: Requested > Original > French);
+        # the primary version plays no part in them
+        crossref_versions = {
+            target_nt: compile_translation_plan(translations_key, "N1904", french_version, target_nt).crossref_versions
+            for target_nt in (True, False)
+        }
+        
+        # 1. Verses and versions of every target
+        resolved: List[Tuple[List[VerseKey], Tuple[str, ...]]] = []
+        wanted: Dict[str, Dict[VerseKey, None]] = {}
+        book_codes = self.normalizer.book_codes
+        for target, target_range in targets:
+            verses, target_span = [], None
+            if target_range:
+                (o_s, c_s, v_s), (o_e, c_e, v_e) = decode_verse_id(target_range.start), decode_verse_id(target_range.end)
+                if (o_s, c_s) == (o_e, c_e):
+                    verses = [(book_codes[o_s], c_s, v) for v in range(v_s, v_e + 1)]
+                else:
+                    target_span = ((book_codes[o_s], c_s, v_s), (book_codes[o_e], c_e, v_e))
+            elif "-" in target:
+                target_span = self._parse_range(target)
+                if target_span:
+                    (b_s, c_s, v_s), (b_e, c_e, v_e) = target_span
+                    if b_s == b_e and c_s == c_e and v_s:
+                        verses = [(b_s, c_s, v) for v in range(v_s, v_e + 1)]
+                        target_span = None
+            else:
+                # Single verse fallback
+                parsed = self.adapter.normalize_reference(target)
+                if parsed:
+                    verses = [tuple(parsed)]
+            if not verses and not target_span:
+                resolved.append(([], ()))
+                continue
+            
+            first_book = verses[0][0] if verses else target_span[0][0]
+            versions = crossref_versions[self.normalizer.is_nt(first_book)]
+            if target_span and versions:
+                # Verses listed by the atlas of the first version tried
+                verses = list(self._atlas(versions[0]).iter_range(*target_span))
+            resolved.append((verses, versions))
+            for v_code in versions:
+                wanted.setdefault(v_code, {}).update(dict.fromkeys(verses))
+        
+        # 2. One read per (version, book, chapter), for all targets at once
+        found = {v_code: self._fetch_verses(list(keys), v_code) for v_code, keys in wanted.items()}
+        
+        # 3. Assembly
+        texts = []
+        for verses, versions in resolved:
+            texts_acc = []
+            for v_code in versions:
+                v_texts = [found[v_code][t].text for t in verses if t in found[v_code] and found[v_code][t].text]
+                if v_texts:
+                    texts_acc.append(" ".join(v_texts))
+            texts.append("\n".join(texts_acc) if texts_acc else None)
+        return texts
@@ -1,6 +1,8 @@
 import json
 import os
 
+from verse_id import encode_verse_id, decode_verse_id, format_verse_key, parse_target_range
+
 class BookNormalizer:
     def __init__(self, data_dir):
         self.data_dir = data_dir
@@ -13,11 +15,13 @@ class BookNormalizer:
         self.code_to_abbreviations = {}
         self.code_to_n1904 = {}
         self.book_order = {}
+        self.book_codes = [] # book codes by ordinal (inverse of book_order)
         
         self.OT_BOOKS = {
             'GEN', 'EXO', 'LEV', 'NUM', 'DEU', 'JOS', 'JDG', 'RUT', '1SA', '2SA', '1KI', '2KI', '1CH', '2CH', 'EZR', 'NEH', 'EST',
             'JOB', 'PSA', 'PRO', 'ECC', 'SNG', 'ISA', 'JER', 'LAM', 'EZK', 'DAN', 'HOS', 'JOL', 'AMO', 'OBA', 'JON', 'MIC', 'NAM',
-            'HAB', 'ZEP', 'HAG', 'ZEC', 'MAL'
+            'HAB', 'ZEP', 'HAG', 'ZEC', 'MAL',
+            'EZE', 'JOE', 'NAH' # codes of bible_books.json for Ezekiel, Joel, Nahum
         }
         self.NT_BOOKS = {
             'MAT', 'MRK', 'LUK', 'JHN', 'ACT', 'ROM', '1CO', '2CO', 'GAL', 'EPH', 'PHP', 'COL', '1TH', '2TH', '1TI', '2TI', 'TIT',
@@ -38,6 +42,37 @@ class BookNormalizer:
     def is_apocrypha(self, book_code):
         return book_code in self.APOCRYPHA_BOOKS
 
+    def verse_id(self, book_code, chapter, verse):
+        """Packed integer id of a verse (see verse_id.py), or None for an unknown book."""
+        ordinal = self.book_order.get(book_code)
+        if ordinal is None:
+            return None
+        return encode_verse_id(ordinal, int(chapter), int(verse))
+
+    def verse_key(self, verse_id):
+        """Verse id -> 'MRK.1.14'."""
+        return format_verse_key(verse_id, self.book_codes)
+
+    def parse_range(self, ref):
+        """'MRK.7.3-4' style key or cross-reference target -> VerseRange, or None."""
+        return parse_target_range(ref, self.book_order)
+
+    def range_label(self, verse_range):
+        """VerseRange -> localized (TOB) label: 'Marc 7:3', 'Marc 7:3-4', 'Marc 7:3-8:1', 'Marc 16:8-Luc 1:2'."""
+        def parts(verse_id):
+            ordinal, ch, vs = decode_verse_id(verse_id)
+            bk = self.book_codes[ordinal] if ordinal < len(self.book_codes) else "?"
+            n1904 = self.code_to_n1904.get(bk, bk)
+            return self.n1904_to_tob.get(n1904, bk), ch, vs
+        sb, sc, sv = parts(verse_range.start)
+        if verse_range.start == verse_range.end:
+            return f"{sb} {sc}:{sv}"
+        eb, ec, ev = parts(verse_range.end)
+        if sb == eb:
+            if sc == ec: return f"{sb} {sc}:{sv}-{ev}"
+            return f"{sb} {sc}:{sv}-{ec}:{ev}"
+        return f"{sb} {sc}:{sv}-{eb} {ec}:{ev}"
+
     def _load_mappings(self):
         path = os.path.join(self.data_dir, "bible_books.json")
         if not os.path.exists(path):
@@ -51,6 +86,7 @@ class BookNormalizer:
             books = data.get("books", {})
             for i, (code, info) in enumerate(books.items()):
                 self.book_order[code] = i
+                self.book_codes.append(code)
                 en_info = info.get("en", {})
                 en_label = en_info.get("label")
                 bhsa_label = en_info.get("bhsa_label") # Load BHSA label
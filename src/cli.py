@@ -5,7 +5,6 @@ from typing_extensions import Annotated
 
 from presenter import VersePresenter
 from book_normalizer import BookNormalizer
-from references_db import ReferenceDatabase
 
 app = typer.Typer(help="ScripturesApp - Modern Python Bible Reader", context_settings={"help_option_names": ["-h", "--help"]})
 
@@ -56,6 +55,7 @@ def main(
     show_crossrefs: Annotated[bool, typer.Option("--crossref", "-c", help="Show cross references")] = False,
     crossref_full: Annotated[bool, typer.Option("--crossref-full", "-f", help="Display cross-references with text")] = False,
     crossref_source: Annotated[Optional[str], typer.Option("--crossref-source", "-s", help="Filter cross-references by source (default: aggregate all)")] = None,
+    crossref_direction: Annotated[str, typer.Option("--crossref-direction", "-d", help="Cross-references from the verse (outgoing), pointing to it (incoming) or both")] = "outgoing",
     compact: Annotated[bool, typer.Option("--compact", "-k", help="Compact display (vX. Text)")] = False,
     very_compact: Annotated[bool, typer.Option("--very-compact", "-K", help="Very compact display (Text only)")] = False,
     extra_args: Annotated[Optional[List[str]], typer.Argument(help="Extra translation arguments for compatibility")] = None,
@@ -84,8 +84,17 @@ def main(
         add -c [COLLECTION] -s [SOURCE] -t [TARGET] --type [TYPE] -n [NOTE]
                Add a new cross-reference/note to a personal collection.
 
-        search [QUERY] (Coming soon)
-               Search for specific terms in the texts.
+        search [QUERY] -v [VERSION] -n [LIMIT] -s [SCOPE] -o [ORDER]
+               Search for specific terms in the texts: words are ANDed,
+               OR joins alternatives, "quoted words" must be consecutive,
+               a NEAR/k b finds a and b at most k words apart.
+               -s restricts the search (NT, OT, Pentateuch, "Rm 1-8"...).
+               Best matches first (BM25); -o canonical for book order.
+               -t gr -t hb adds the Greek and Hebrew of each hit.
+
+        morph [QUERY] -v [VERSION] -n [LIMIT]
+               Search N1904 or BHSA words by lemma and morphology,
+               e.g. morph "λύω tense=aorist voice=passive mood=participle book=Lk".
 
     SHORTCUTS
         tob [REFERENCE]
@@ -161,15 +170,25 @@ def main(
          typer.secho(f"\n{reference}", fg=typer.colors.GREEN, bold=True)
          
     try:
-        response = service.search(
-            reference=reference,
-            translations=translations,
-            version=version,
-            french_version=french_version,
-            show_crossrefs=show_crossrefs,
-            crossref_full=crossref_full,
-            crossref_source=crossref_source
-        )
+        # Verses are read chapter by chapter and printed as they come, each with its
+        # cross-references (looked up a chapter at a time) when requested
+        if show_crossrefs or crossref_full:
+            verse_items = service.iter_verses_with_crossrefs(
+                reference=reference,
+                translations=translations,
+                version=version,
+                french_version=french_version,
+                crossref_full=crossref_full,
+                crossref_source=crossref_source,
+                direction=crossref_direction
+            )
+        else:
+            verse_items = ((item, None) for item in service.iter_verses(
+                reference=reference,
+                translations=translations,
+                version=version,
+                french_version=french_version
+            ))
     except Exception as e:
         presenter.present_error(str(e))
         raise typer.Exit(code=1)
@@ -180,101 +199,60 @@ def main(
     elif compact: compact_mode = 1
 
     # 5. Present
-    for item in response.verses:
-        main_v = item.primary
-        pars = item.parallels
+    # Verses (and cross-references) are read while printing: errors surface here too
+    try:
+        for item, verse_refs in verse_items:
+            main_v = item.primary
+            pars = item.parallels
         
-        # Calculate Header Override
-        # Legacy logic: If displaying French, use French book name in Header.
-        header_name = None
+            # Calculate Header Override
+            # Legacy logic: If displaying French, use French book name in Header.
+            header_name = None
         
-        # Check if French is being displayed
-        is_french_active = False
-        if translations:
-             if 'fr' in [t.lower() for t in translations]: is_french_active = True
-        else:
-             is_french_active = True
+            # Check if French is being displayed
+            is_french_active = False
+            if translations:
+                 if 'fr' in [t.lower() for t in translations]: is_french_active = True
+            else:
+                 is_french_active = True
              
-        if is_french_active:
-             # Try to localize main_v.book_code
-             code = main_v.book_code
+            if is_french_active:
+                 # Try to localize main_v.book_code
+                 code = main_v.book_code
              
-             # N1904 name
-             n1904_name = service.normalizer.code_to_n1904.get(code, code)
+                 # N1904 name
+                 n1904_name = service.normalizer.code_to_n1904.get(code, code)
              
-             # TOB name
-             tob_name = service.normalizer.n1904_to_tob.get(n1904_name)
-             if tob_name:
-                 header_name = tob_name
+                 # TOB name
+                 tob_name = service.normalizer.n1904_to_tob.get(n1904_name)
+                 if tob_name:
+                     header_name = tob_name
         
-        # English Header Logic
-        is_english_active = False
-        if translations and 'en' in [t.lower() for t in translations]: is_english_active = True
-        if item.primary.version == "N1904_EN": is_english_active = True
+            # English Header Logic
+            is_english_active = False
+            if translations and 'en' in [t.lower() for t in translations]: is_english_active = True
+            if item.primary.version == "N1904_EN": is_english_active = True
         
-        if is_english_active and not is_french_active: 
-             code = main_v.book_code
-             en_name = service.normalizer.code_to_n1904.get(code, code)
-             if en_name:
-                 header_name = en_name.replace("_", " ")
+            if is_english_active and not is_french_active: 
+                 code = main_v.book_code
+                 en_name = service.normalizer.code_to_n1904.get(code, code)
+                 if en_name:
+                     header_name = en_name.replace("_", " ")
 
-        presenter.present_verse(main_v, pars, compact_mode=compact_mode, book_name_override=header_name)
+            presenter.present_verse(main_v, pars, compact_mode=compact_mode, book_name_override=header_name)
 
-    
-    # 6. Cross Refs
-    if response.cross_references:
-        # Formatter Helper (Ported Logic)
-        def format_ref(target_str):
-             if not target_str: return ""
-             def parse_one(ref):
-                 parts = ref.split(".")
-                 if len(parts) >= 3:
-                     bk, ch, vs = parts[0], parts[1], parts[2]
-                     n1904 = service.normalizer.code_to_n1904.get(bk, bk)
-                     tob_name = service.normalizer.n1904_to_tob.get(n1904, bk)
-                     return tob_name, ch, vs
-                 return None, None, None
-
-             if "-" in target_str:
-                 parts_range = target_str.split("-")
-                 if len(parts_range) == 2:
-                     start_parsed = parse_one(parts_range[0])
-                     end_parsed = parse_one(parts_range[1])
-                     
-                     if start_parsed[0] and end_parsed[0]:
-                         sb, sc, sv = start_parsed
-                         eb, ec, ev = end_parsed
-                         if sb == eb:
-                             if sc == ec: return f"{sb} {sc}:{sv}-{ev}"
-                             else: return f"{sb} {sc}:{sv}-{ec}:{ev}"
-                         else: return f"{sb} {sc}:{sv}-{eb} {ec}:{ev}"
-              
-             abbr, ch, vs = parse_one(target_str)
-             if abbr:
-                  return f"{abbr} {ch}:{vs}"
-             return target_str
-
-        # Note: formatting and ref_texts logic is currently not fully populated in BibleService for cross refs
-        # The service returns VerseCrossReferences model.
-        # But 'ref_texts' dict required for full text display is NOT in the response yet?
-        # WAIT. services.py: "// Full text fetch if requested ... pass"
-        # I did not implement populating 'ref_texts' in the service!
-        
-        # CRITICAL: Re-implement full text fetch for cross refs in CLI or Service?
-        # Ideally Service. But I skipped it.
-        # For now, to match legacy behavior, I should probably re-implement it here using service.adapter?
-        # Or quickly add it to service?
-        # Adding to service is cleaner. 
-        # But I'm in the middle of replacing CLI.
-        # I will fetch it here using service.adapter (exposed via service).
-        
-        ref_texts = {}
-        if crossref_full and response.cross_references:
-             for rel in response.cross_references.relations:
-                 if rel.text:
-                     ref_texts[rel.target_ref] = rel.text
+            if verse_refs:
+                ref_texts = {}
+                if crossref_full:
+                     for rel in verse_refs.relations:
+                         if rel.text:
+                             ref_texts[rel.target_ref] = rel.text
 
-        presenter.present_cross_references(response.cross_references, ref_texts=ref_texts, formatter=format_ref)
+                # Labels come localized ("Marc 7:3-4"), as in the API
+                presenter.present_cross_references(verse_refs, ref_texts=ref_texts)
+    except Exception as e:
+        presenter.present_error(str(e))
+        raise typer.Exit(code=1)
 
 
 def add_cli(
@@ -288,13 +266,14 @@ def add_cli(
     Add a new cross-reference/note to a personal collection.
     """
     try:
-        from application.services import AdapterFactory
+        from application.services import AdapterFactory, open_reference_database
         adapter = AdapterFactory.get()
         # AdapterFactory calculates data_dir internally, but we can access it via adapter instance
         data_dir = adapter.data_dir
         normalizer = adapter.normalizer
         
-        db = ReferenceDatabase(data_dir, normalizer)
+        # SQLite store if one was built (make references-db), else the JSON files
+        db = open_reference_database(data_dir, normalizer)
         success = db.add_relation(collection, source, target, rel_type, note)
         
         if success:
@@ -307,10 +286,81 @@ def add_cli(
         typer.secho(f"Error: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+def search_cli(
+    query: Annotated[str, typer.Argument(help='Words to find (AND), "OR" between alternatives, "quoted phrase", "a NEAR/k b"')],
+    versions: Annotated[Optional[List[str]], typer.Option("--version", "-v", help="Versions to search (TOB, BJ, N1904, LXX, BHSA, NAV, N1904_EN). Default: every indexed or loaded version")] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Maximum number of verses shown")] = 100,
+    exact: Annotated[bool, typer.Option("--exact", "-e", help="Match accents, niqqud and tashkeel exactly")] = False,
+    scope: Annotated[Optional[str], typer.Option("--scope", "-s", help="Verses searched: NT, OT, Apocrypha, Pentateuch, Gospels, a book, chapters ('Rm 1-8'), comma-separated")] = None,
+    order: Annotated[str, typer.Option("--order", "-o", help="relevance (BM25, best first) or canonical (book order)")] = "relevance",
+    parallels: Annotated[Optional[List[str]], typer.Option("--tr", "-t", help="Show each hit in other translations too: gr (N1904 or LXX), hb (BHSA), en, fr, ar")] = None,
+    compact: Annotated[bool, typer.Option("--compact", "-k", help="Compact display (one line per verse)")] = False,
+    ndjson: Annotated[bool, typer.Option("--ndjson", "-j", help="Stream hits as JSON lines (-n 0 for every hit)")] = False,
+):
+    """
+    Full-text search. The index of a version is built on its first search (data/search).
+    """
+    from application.services import BibleService
+    service = BibleService()
+    presenter = VersePresenter()
+    
+    if ndjson:
+        # One hit per line, read a page at a time: nothing waits for the whole result
+        try:
+            for hit in service.iter_fulltext(query, versions=versions, limit=limit, exact=exact, scope=scope, order=order, parallels=parallels):
+                presenter.present_search_hit_json(hit)
+        except Exception as e:
+            presenter.present_error(str(e))
+            raise typer.Exit(code=1)
+        return
+    
+    if limit < 1:
+        presenter.present_error("--limit must be at least 1 (-n 0, every hit, needs --ndjson)")
+        raise typer.Exit(code=1)
+    try:
+        response = service.fulltext(query, versions=versions, limit=limit, exact=exact, scope=scope, order=order, parallels=parallels)
+    except Exception as e:
+        presenter.present_error(str(e))
+        raise typer.Exit(code=1)
+    
+    for hit in response.hits:
+        presenter.present_search_hit(hit, compact_mode=1 if compact else 0)
+    presenter.present_search_summary(query, response.total, len(response.hits), response.versions)
+
+def morph_cli(
+    query: Annotated[str, typer.Argument(help="Lemma and feature=value filters, e.g. 'λύω tense=aorist voice=passive mood=participle book=Lk'")],
+    version: Annotated[Optional[str], typer.Option("--version", "-v", help="N1904 or BHSA. Default: BHSA for OT books or Hebrew lemmas, N1904 otherwise")] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Maximum number of verses shown")] = 100,
+    compact: Annotated[bool, typer.Option("--compact", "-k", help="Compact display (one line per verse)")] = False,
+):
+    """
+    Lemma and morphology search over N1904 and BHSA words (fields: lemma, sp, tense, voice,
+    mood, case, person, number, gender, stem). The index is built on first use (data/search).
+    """
+    from application.services import BibleService
+    service = BibleService()
+    presenter = VersePresenter()
+    
+    try:
+        response = service.morphology(query, version=version, limit=limit)
+    except Exception as e:
+        presenter.present_error(str(e))
+        raise typer.Exit(code=1)
+    
+    for hit in response.hits:
+        presenter.present_search_hit(hit, compact_mode=1 if compact else 0)
+    presenter.present_search_summary(query, response.total, len(response.hits), response.versions)
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "add":
         sys.argv.pop(1) # Remove "add" command so typer sees the rest as args/options
         typer.run(add_cli)
+    elif len(sys.argv) > 1 and sys.argv[1] == "search":
+        sys.argv.pop(1)
+        typer.run(search_cli)
+    elif len(sys.argv) > 1 and sys.argv[1] == "morph":
+        sys.argv.pop(1)
+        typer.run(morph_cli)
     else:
         app()
@@ -44,12 +44,18 @@ class CrossReferenceType(str, Enum):
     ALLUSION = "allusion"
     OTHER = "other"
 
+class CrossReferenceDirection(str, Enum):
+    OUTGOING = "outgoing" # relations from the verse
+    INCOMING = "incoming" # relations pointing to the verse
+    BOTH = "both"
+
 class CrossReferenceRelation(BaseModel):
-    target_ref: str 
+    target_ref: str # for incoming relations: the verse pointing here
     target_ref_localized: Optional[str] = None
     rel_type: CrossReferenceType
     note: Optional[str] = None
     text: Optional[str] = None
+    direction: CrossReferenceDirection = CrossReferenceDirection.OUTGOING
     
     model_config = ConfigDict(frozen=True)
 
@@ -64,6 +70,8 @@ class VerseItem(BaseModel):
     ref: str
     primary: Verse
     parallels: List[Verse] = Field(default_factory=list)
+    # Cross-references of this verse, for chapter and range queries
+    cross_references: Optional[VerseCrossReferences] = None
     
     model_config = ConfigDict(frozen=True)
 
@@ -74,3 +82,65 @@ class VerseResponse(BaseModel):
     
     model_config = ConfigDict(frozen=True)
 
+class CrossReferenceNode(BaseModel):
+    ref: str # "BOOK.C.V"
+    ref_localized: Optional[str] = None
+    depth: int # hops from the start verse
+    via: str # verse it was reached from
+    rel_type: CrossReferenceType # type of that last hop
+    
+    model_config = ConfigDict(frozen=True)
+
+class CrossReferenceGraphResponse(BaseModel):
+    reference: str
+    depth: int
+    nodes: List[CrossReferenceNode] # in breadth-first order
+    truncated: bool = False # the result limit stopped the traversal
+    
+    model_config = ConfigDict(frozen=True)
+
+class SearchOrder(str, Enum):
+    RELEVANCE = "relevance" # BM25 score, best first
+    CANONICAL = "canonical" # book, chapter, verse
+
+class TextSpan(BaseModel):
+    start: int # character offsets in the verse text, end excluded
+    end: int
+
+    model_config = ConfigDict(frozen=True)
+
+class SearchHit(BaseModel):
+    ref: str # "MRK 1:1"
+    ref_localized: Optional[str] = None
+    verse: Verse
+    score: Optional[float] = None # BM25 score when ranked by relevance
+    highlights: List[TextSpan] = [] # matching words of verse.text (full-text search)
+    parallels: List[Verse] = [] # the same verse in other versions, when requested
+    matches: List[str] = [] # words of the verse that matched (morphology search)
+    
+    model_config = ConfigDict(frozen=True)
+
+class SearchResponse(BaseModel):
+    query: str
+    versions: List[str] # versions searched
+    total: int # matches over every version (hits holds at most `limit` of them)
+    hits: List[SearchHit] # in result order (relevance or canonical)
+    next_cursor: Optional[str] = None # resumes after the last hit, None on the last page
+    
+    model_config = ConfigDict(frozen=True)
+
+
+
+class DatasetStatus(str, Enum):
+    NOT_LOADED = "not_loaded"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+class DatasetState(BaseModel):
+    name: str
+    status: DatasetStatus = DatasetStatus.NOT_LOADED
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+    
+    model_config = ConfigDict(frozen=True)
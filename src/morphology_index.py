@@ -0,0 +1,351 @@
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from verse_id import encode_verse_id
+from search_index import fold, _pad
+from search_scope import VerseScope
+
+# Lemma and morphology search: one index per version with word-level features
+# (N1904, BHSA), written once from the dataset's words and memory-mapped afterwards.
+#
+# Layout of data/search/<VERSION>.morph:
+#   MAGIC (8 bytes) | header length (uint64, little endian) | header JSON | padding
+#   then 8-byte aligned sections:
+#     words     int32[word_count]      verse id of each word, in text order (hence sorted)
+#     <field>   uint16/uint32[words]   for each field of the header: index of the word's
+#                                      value in header["values"][field] (0 = no value)
+#     offsets   uint64[lemmas + 1]     words of lemma i are lemma_words[offsets[i]:offsets[i + 1]]
+#     lemma_words int32[...]           word positions, sorted
+#
+# A query reads the postings of its lemma, then checks the feature codes of those
+# words only; no Text-Fabric node is walked.
+
+MAGIC = b"SAMI0001"
+MORPH_SUFFIX = ".morph"
+
+# Fields stored for every word, in file order. Adapters map their own feature names
+# onto these (N1904: tense/voice/mood..., BHSA: vt/vs/ps...).
+FIELDS = ("form", "lemma", "sp", "tense", "voice", "mood", "case", "person", "number", "gender", "stem")
+# Query keys accepted for fields, besides their own names
+FIELD_ALIASES = {"pos": "sp", "lex": "lemma", "word": "form"}
+
+
+def _codes_typecode(value_count: int) -> str:
+    return "H" if value_count <= 0xFFFF else "I"
+
+
+def write_morphology_index(path: str, version: str, book_codes: Sequence[str], words: Iterable[Tuple[str, int, int, Dict[str, str]]]) -> int:
+    """
+    Indexes the (book_code, chapter, verse, {field: value}) words of one version into
+    `path`, in canonical book order and in text order within each verse. Words of unknown books are skipped. Returns the number of words indexed.
+    """
+    ordinals = {code: i for i, code in enumerate(book_codes)}
+
+    verse_ids = array("i")
+    values: Dict[str, Dict[str, int]] = {field: {"": 0} for field in FIELDS}
+    codes: Dict[str, List[int]] = {field: [] for field in FIELDS}
+    for book_code, chapter, verse, features in words:
+        ordinal = ordinals.get(book_code)
+        if ordinal is None:
+            continue
+        verse_ids.append(encode_verse_id(ordinal, chapter, verse))
+        for field in FIELDS:
+            value = features.get(field)
+            value = str(value) if value not in (None, "") else ""
+            field_values = values[field]
+            code = field_values.get(value)
+            if code is None:
+                code = field_values[value] = len(field_values)
+            codes[field].append(code)
+
+    # Sorted verse ids let a book or chapter scope be a bisect over the words. Datasets
+    # may store their books in another order (BHSA follows the BHS canon), so words are
+    # put in canonical order here; the sort is stable, keeping text order within a verse.
+    if any(verse_ids[i] > verse_ids[i + 1] for i in range(len(verse_ids) - 1)):
+        order = sorted(range(len(verse_ids)), key=verse_ids.__getitem__)
+        verse_ids = array("i", (verse_ids[i] for i in order))
+        for field in FIELDS:
+            field_codes = codes[field]
+            codes[field] = [field_codes[i] for i in order]
+
+    lemma_count = len(values["lemma"])
+    lemma_words: List[List[int]] = [[] for _ in range(lemma_count)]
+    for position, code in enumerate(codes["lemma"]):
+        lemma_words[code].append(position)
+    offsets = array("Q", [0])
+    flat = array("i")
+    for positions in lemma_words:
+        flat.extend(positions)
+        offsets.append(len(flat))
+
+    header = {
+        "byteorder": sys.byteorder,
+        "version": version.upper(),
+        "books": list(book_codes),
+        "word_count": len(verse_ids),
+        "fields": list(FIELDS),
+        "values": {field: list(values[field]) for field in FIELDS},
+    }
+    sections = [verse_ids]
+    for field in FIELDS:
+        sections.append(array(_codes_typecode(len(values[field])), codes[field]))
+    sections += [offsets, flat]
+    header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        _pad(f)
+        for section in sections:
+            f.write(section.tobytes())
+            _pad(f)
+    os.replace(tmp_path, path)
+    return len(verse_ids)
+
+
+class MorphologyIndex:
+    """Read-only, memory-mapped view over a file written by `write_morphology_index`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a morphology index: {path}")
+        (header_length,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._mm[start:start + header_length]).decode("utf-8"))
+        if header.get("byteorder") != sys.byteorder:
+            self.close()
+            raise ValueError(f"Morphology index {path} was written for a {header.get('byteorder')}-endian platform")
+
+        self.version = header["version"]
+        self.books = header["books"]
+        self.word_count = header["word_count"]
+        self.fields = header["fields"]
+        self._values: Dict[str, List[str]] = header["values"]
+
+        def aligned(n):
+            return (n + 7) & ~7
+
+        view = self._view = memoryview(self._mm)
+        self._sections = []
+        pos = aligned(start + header_length)
+
+        def section(typecode, count):
+            nonlocal pos
+            size = array(typecode).itemsize
+            cast = view[pos:pos + count * size].cast(typecode)
+            pos = aligned(pos + count * size)
+            self._sections.append(cast)
+            return cast
+
+        self.verse_ids = section("i", self.word_count)
+        self._codes = {
+            field: section(_codes_typecode(len(self._values[field])), self.word_count)
+            for field in self.fields
+        }
+        lemma_count = len(self._values["lemma"])
+        self._offsets = section("Q", lemma_count + 1)
+        self._lemma_words = section("i", self._offsets[lemma_count])
+
+        # Folded value -> codes, so "λυω" or "LYW" style lookups ignore accents and case
+        self._folded: Dict[str, Dict[str, List[int]]] = {}
+        for field, field_values in self._values.items():
+            folded = self._folded[field] = {}
+            for code, value in enumerate(field_values):
+                if code:
+                    folded.setdefault(fold(value), []).append(code)
+
+    def __len__(self):
+        return self.word_count
+
+    def value_codes(self, field: str, value: str) -> List[int]:
+        """Codes of the values of `field` equal to `value`, ignoring case and diacritics."""
+        return self._folded.get(field, {}).get(fold(value), [])
+
+    def value(self, field: str, position: int) -> str:
+        return self._values[field][self._codes[field][position]]
+
+    def lemma_words(self, codes: Iterable[int]) -> List[int]:
+        """Sorted positions of the words of the given lemma codes."""
+        positions = []
+        for code in codes:
+            positions.extend(self._lemma_words[self._offsets[code]:self._offsets[code + 1]])
+        return sorted(positions)
+
+    def match(self, features: Dict[str, List[str]], scope: Optional[VerseScope] = None) -> List[int]:
+        """
+        Positions of the words in `scope` (default: every word) whose every field in
+        `features` has one of the listed values. A lemma narrows the words through its
+        postings; other fields are checked on those words only.
+        """
+        wanted = {}
+        for field, alternatives in features.items():
+            if field not in self._codes:
+                return []
+            codes = set()
+            for value in alternatives:
+                codes.update(self.value_codes(field, value))
+            if not codes:
+                return []
+            wanted[field] = codes
+
+        # Words of a scope range are contiguous: [lo, hi) position spans
+        if scope is None:
+            spans = [(0, self.word_count)]
+        else:
+            spans = [(bisect_left(self.verse_ids, r.start), bisect_right(self.verse_ids, r.end)) for r in scope.ranges]
+        if "lemma" in wanted:
+            lemma_positions = self.lemma_words(wanted.pop("lemma"))
+            candidates = []
+            for lo, hi in spans:
+                candidates.extend(lemma_positions[bisect_left(lemma_positions, lo):bisect_left(lemma_positions, hi)])
+        else:
+            candidates = chain.from_iterable(range(lo, hi) for lo, hi in spans)
+
+        checks = [(self._codes[field], codes) for field, codes in wanted.items()]
+        return [p for p in candidates if all(field_codes[p] in codes for field_codes, codes in checks)]
+
+    def close(self):
+        for section in getattr(self, "_sections", []):
+            section.release()
+        self._sections = []
+        self._codes = {}
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if getattr(self, "_mm", None) is not None and not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+
+MORPH_TERM_RE = re.compile(r"(\w+)\s*[=:]\s*(\S+)|(\S+)")
+
+
+# Query keys naming the scope rather than a field
+SCOPE_KEYS = ("book", "scope", "in")
+
+
+def parse_morph_query(query: str) -> Tuple[Dict[str, List[str]], Optional[str]]:
+    """
+    'λύω tense=aorist voice=passive mood=participle book=Lk' ->
+        ({"lemma": ["λύω"], "tense": ["aorist"], "voice": ["passive"], "mood": ["participle"]}, "Lk")
+
+    A bare word is the lemma; `field=v1,v2` accepts either value; `book=` (or `scope=`)
+    restricts the search to a scope such as 'Lk', 'NT' or 'Pentateuch' (see search_scope).
+    Raises ValueError on an unknown field.
+    """
+    features: Dict[str, List[str]] = {}
+    scope = None
+    for key, value, bare in MORPH_TERM_RE.findall(query or ""):
+        if bare:
+            key, value = "lemma", bare
+        key = FIELD_ALIASES.get(key.lower(), key.lower())
+        if key in SCOPE_KEYS:
+            scope = value
+            continue
+        if key not in FIELDS:
+            raise ValueError(f"Unknown morphology field '{key}' (expected one of: book, {', '.join(FIELDS)})")
+        features.setdefault(key, []).extend(v for v in value.split(",") if v)
+    return features, scope
+
+
+class MorphologyIndexes:
+    """
+    The morphology indexes of the versions with word features, under `index_dir`.
+
+    An index is built from `provider.iter_words(version)` the first time its version
+    is queried, written to `<index_dir>/<VERSION>.morph`, and memory-mapped from then on
+    (`make search-index` rebuilds them all).
+    """
+
+    def __init__(self, index_dir: str, book_codes: Sequence[str], provider):
+        self.index_dir = index_dir
+        self.book_codes = list(book_codes)
+        self.provider = provider
+        self._indexes: Dict[str, MorphologyIndex] = {}
+        self._lock = threading.RLock()
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.index_dir, version.upper() + MORPH_SUFFIX)
+
+    def build(self, version: str) -> int:
+        """(Re)writes the index of `version`. Nothing is written for a version without word features."""
+        version = version.upper()
+        with self._lock:
+            words = list(self.provider.iter_words(version) or [])
+            if not words:
+                return 0
+            old = self._indexes.pop(version, None)
+            if old is not None:
+                old.close()
+            return write_morphology_index(self.path(version), version, self.book_codes, words)
+
+    def _open(self, version: str) -> Optional[MorphologyIndex]:
+        path = self.path(version)
+        if not os.path.exists(path):
+            return None
+        try:
+            index = MorphologyIndex(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not open morphology index {path}: {e}")
+            return None
+        if index.books != self.book_codes or list(index.fields) != list(FIELDS):
+            index.close()
+            return None
+        return index
+
+    def get(self, version: str) -> Optional[MorphologyIndex]:
+        """The index of `version`, built on first use. None if the version has no word features."""
+        version = version.upper()
+        index = self._indexes.get(version)
+        if index is not None:
+            return index
+        with self._lock:
+            if version not in self._indexes:
+                index = self._open(version)
+                if index is None and self.build(version):
+                    index = self._open(version)
+                if index is None:
+                    return None
+                self._indexes[version] = index
+            return self._indexes[version]
+
+    def search(self, features: Dict[str, List[str]], version: str, scope: Optional[VerseScope] = None) -> List[Tuple[int, List[str]]]:
+        """(verse id, matched word forms) of the verses of `version` in `scope` with a matching word, in canonical order."""
+        index = self.get(version)
+        if index is None:
+            return []
+        hits: List[Tuple[int, List[str]]] = []
+        for position in index.match(features, scope):
+            verse_id = index.verse_ids[position]
+            if not hits or hits[-1][0] != verse_id:
+                hits.append((verse_id, []))
+            hits[-1][1].append(index.value("form", position))
+        return hits
+
+    def close(self):
+        with self._lock:
+            for index in self._indexes.values():
+                index.close()
+            self._indexes = {}
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from domain.models import Verse, Book, VerseCrossReferences
 
 class BibleProvider(ABC):
@@ -17,9 +17,28 @@ class BibleProvider(ABC):
         """Fetch all verses in a chapter."""
         pass
 
+    def list_verses(self, version: str) -> Optional[List[Tuple[str, int, int]]]:
+        """
+        Every (book_code, chapter, verse) of a version, in canonical order.
+        None when the source cannot enumerate its verses (callers then probe chapters).
+        """
+        return None
+
+    def iter_verse_texts(self, version: str) -> Iterable[Tuple[str, int, int, str]]:
+        """(book_code, chapter, verse, text) of every verse of a version (feeds the search index)."""
+        return iter(())
+
+    def iter_words(self, version: str) -> Iterable[Tuple[str, int, int, Dict[str, str]]]:
+        """
+        (book_code, chapter, verse, features) of every word of a version, in text order, where
+        features maps morphology_index.FIELDS (lemma, sp, tense...) to values (feeds the morphology index).
+        Empty for versions without word-level features.
+        """
+        return iter(())
+
     @abstractmethod
     def search(self, query: str, version: str) -> List[Verse]:
-        """Full text search."""
+        """Full text search: AND of words, OR between alternatives, "quoted phrases"."""
         pass
     
     @abstractmethod
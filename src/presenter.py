@@ -1,6 +1,6 @@
 import typer
 from typing import List, Optional
-from domain.models import Verse, VerseCrossReferences, Language
+from domain.models import Verse, VerseCrossReferences, CrossReferenceDirection, Language, SearchHit
 
 class VersePresenter:
     def present_verse(self, verse: Verse, additional_versions: List[Verse] = None, compact_mode: int = 0, book_name_override: Optional[str] = None):
@@ -61,7 +61,7 @@ class VersePresenter:
                  for r in rels:
                      note_str = f" ({r.note})" if r.note else ""
                      
-                     target_label = formatter(r.target_ref) if formatter else r.target_ref
+                     target_label = formatter(r.target_ref) if formatter else (r.target_ref_localized or r.target_ref)
                      
                      # Check indent style parity with Legacy
                      # Legacy: "        Is 1:12" (8 spaces?)
@@ -71,6 +71,10 @@ class VersePresenter:
                      # Let's match legacy: indent 4, no arrow?
                      # "    Is 1:12"
                      
+                     # Incoming relations: the verse listed points to this one
+                     if r.direction == CrossReferenceDirection.INCOMING:
+                         target_label = f"← {target_label}"
+                     
                      typer.echo(f"    {target_label}{note_str}")
                      
                      if ref_texts and r.target_ref in ref_texts:
@@ -80,5 +84,33 @@ class VersePresenter:
                          if text:
                              typer.secho(f"       {text}", dim=True, italic=True)
 
+    def present_search_hit(self, hit: SearchHit, compact_mode: int = 0):
+        """One full-text search hit: "Marc 1:1 (TOB)" then the verse text."""
+        label = hit.ref_localized or hit.ref
+        # Matching words in bold, from the offsets computed by the search
+        text, end = "", 0
+        for span in hit.highlights:
+            text += hit.verse.text[end:span.start] + typer.style(hit.verse.text[span.start:span.end], bold=True, fg=typer.colors.YELLOW)
+            end = span.end
+        text += hit.verse.text[end:]
+        if compact_mode:
+            typer.secho(f"{label}. ", nl=False, fg=typer.colors.GREEN, bold=True)
+            typer.echo(text)
+        else:
+            typer.secho(f"\n{label} ({hit.verse.version})", fg=typer.colors.GREEN, bold=True)
+            typer.echo(text)
+        for parallel in hit.parallels:
+            typer.secho(parallel.text)
+        if hit.matches:
+            typer.secho(f"    → {' '.join(hit.matches)}", dim=True)
+
+    def present_search_hit_json(self, hit: SearchHit):
+        """One full-text search hit as a JSON line (NDJSON)."""
+        typer.echo(hit.model_dump_json())
+
+    def present_search_summary(self, query: str, total: int, shown: int, versions: List[str]):
+        more = f", showing the first {shown}" if shown < total else ""
+        typer.secho(f"\n{total} result(s) for '{query}' in {', '.join(versions)}{more}", dim=True)
+
     def present_error(self, message: str):
         typer.secho(f"Error: {message}", fg=typer.colors.RED, err=True)
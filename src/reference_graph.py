@@ -0,0 +1,134 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from verse_id import parse_verse_key, parse_target_range
+
+# Relation types as small ints in the edge arrays
+REL_TYPES = ("parallel", "quotation", "allusion", "other")
+REL_TYPE_CODES = {name: i for i, name in enumerate(REL_TYPES)}
+
+
+class ReferenceGraph:
+    """
+    Cross-reference graph over verse ids, in compressed sparse row form:
+
+        nodes    sorted verse ids (one per verse that has or receives a relation)
+        offsets  edges of node i are edges[offsets[i]:offsets[i + 1]]
+        edges    target node indexes
+        types    relation type code of each edge (see REL_TYPES)
+
+    A range target ("ROM.1.1-4") is an edge to its first verse.
+    """
+
+    def __init__(self, nodes: array, offsets: array, edges: array, types: array):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.edges = edges
+        self.types = types
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edges)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[int, int, str]]) -> "ReferenceGraph":
+        """Builds the graph from (source id, target id, relation type) triples."""
+        triples = [(s, t, REL_TYPE_CODES.get(rel_type, REL_TYPE_CODES["other"])) for s, t, rel_type in edges]
+        node_ids = sorted({s for s, _, _ in triples} | {t for _, t, _ in triples})
+        index = {verse_id: i for i, verse_id in enumerate(node_ids)}
+
+        triples.sort(key=lambda e: (e[0], e[1]))
+        offsets = array("l", [0] * (len(node_ids) + 1))
+        for s, _, _ in triples:
+            offsets[index[s] + 1] += 1
+        for i in range(len(node_ids)):
+            offsets[i + 1] += offsets[i]
+
+        return cls(
+            array("l", node_ids),
+            offsets,
+            array("l", (index[t] for _, t, _ in triples)),
+            array("b", (code for _, _, code in triples)),
+        )
+
+    @classmethod
+    def from_index(cls, index: Dict[str, dict], book_order: Dict[str, int]) -> "ReferenceGraph":
+        """Builds the graph from a ReferenceDatabase index (source_key -> {"relations": [...]})."""
+        def edges():
+            for src, refs in index.items():
+                source_id = parse_verse_key(src, book_order)
+                if source_id is None:
+                    continue
+                for rel in refs.get("relations", []):
+                    parsed = rel.get("parsed") # pre-parsed by ReferenceDatabase
+                    target_range = parsed.range if parsed else parse_target_range(rel.get("target", ""), book_order)
+                    if target_range:
+                        yield source_id, target_range[0], rel.get("type", "other")
+        return cls.from_edges(edges())
+
+    def _node(self, verse_id: int) -> Optional[int]:
+        i = bisect_left(self.nodes, verse_id)
+        if i < len(self.nodes) and self.nodes[i] == verse_id:
+            return i
+        return None
+
+    def traverse(
+        self,
+        start_id: int,
+        max_depth: int = 2,
+        max_results: int = 500,
+        rel_types: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[int, int, int, str]], bool]:
+        """
+        Breadth-first search from `start_id`, following edges of `rel_types` (default: all).
+        Returns ([(verse id, depth, parent verse id, relation type), ...] in BFS order,
+        truncated), where `truncated` tells whether `max_results` left reachable verses out.
+        The start verse itself is not included.
+        """
+        start = self._node(start_id)
+        if start is None or max_depth < 1 or max_results < 1:
+            return [], False
+
+        allowed = None
+        if rel_types:
+            allowed = {REL_TYPE_CODES[t] for t in rel_types if t in REL_TYPE_CODES}
+
+        nodes, offsets, edges, types = self.nodes, self.offsets, self.edges, self.types
+        seen = {start}
+        queue = deque([(start, 0)])
+        results = []
+        while queue:
+            node, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for e in range(offsets[node], offsets[node + 1]):
+                if allowed is not None and types[e] not in allowed:
+                    continue
+                target = edges[e]
+                if target in seen:
+                    continue
+                seen.add(target)
+                results.append((nodes[target], depth + 1, nodes[node], REL_TYPES[types[e]]))
+                queue.append((target, depth + 1))
+                if len(results) >= max_results:
+                    # Cut short only if the search would have reached another verse
+                    queue.appendleft((node, depth))
+                    return results, self._reaches_unseen(queue, seen, max_depth, allowed)
+        return results, False
+
+    def _reaches_unseen(self, queue, seen, max_depth, allowed) -> bool:
+        """Whether resuming a traverse() from `queue` would reach a verse not in `seen`."""
+        # Seen verses are either expanded already or still queued: only the queue needs a look
+        offsets, edges, types = self.offsets, self.edges, self.types
+        for node, depth in queue:
+            if depth >= max_depth:
+                continue
+            for e in range(offsets[node], offsets[node + 1]):
+                if (allowed is None or types[e] in allowed) and edges[e] not in seen:
+                    return True
+        return False
@@ -1,7 +1,166 @@
 import json
 import os
 import glob
+import threading
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from typing import NamedTuple
+
+from verse_id import VerseRange, parse_verse_key, parse_target_range
+from reference_graph import ReferenceGraph
+
+def file_scope(filename):
+    """'nt', 'ot' or 'generic', from the references_{nt|ot}_ file name prefix."""
+    if "references_nt_" in filename:
+        return "nt"
+    if "references_ot_" in filename:
+        return "ot"
+    return "generic"
+
+def scope_members(scope):
+    """File scopes loaded for a requested scope ('all', 'nt', 'ot' or 'generic')."""
+    if scope == 'all':
+        return ("nt", "ot", "generic")
+    if scope in ('nt', 'ot'):
+        return (scope, "generic")
+    if scope == 'generic':
+        return ("generic",)
+    return ()
+
+class ParsedTarget(NamedTuple):
+    """
+    A relation target or source key parsed once, when its file is read (or its rows are
+    queried): serving sorts and labels cross-references without parsing strings.
+    """
+    range: VerseRange # start and end verse ids, inclusive
+    label: str # localized, e.g. "Marc 7:3-4"
+
+    @property
+    def sort_key(self):
+        """Canonical order of the first verse (a stable sort keeps file order for ties)."""
+        return self.range.start
+
+def parse_relation_target(target, normalizer):
+    """'MRK.7.3', 'MRK.7.3-4', 'MRK.7.3-8.1'... -> ParsedTarget, or None for anything else."""
+    target_range = parse_target_range(target or "", normalizer.book_order)
+    if target_range is None:
+        return None
+    return ParsedTarget(target_range, normalizer.range_label(target_range))
+
+def span_class(start, end):
+    """
+    Bucket of a target range by length: 0 for a single verse, k when the range spans
+    2**(k-1) to 2**k - 1 ids beyond its start.
+    """
+    return (end - start).bit_length()
+
+class ReverseReferenceIndex:
+    """
+    Target verse -> relations pointing to it, built from a forward index.
+
+    Targets may be ranges ("ROM.1.1-4"), so entries are kept as (start id, end id)
+    intervals, bucketed by span_class and sorted by start within a bucket. A verse is
+    found by bisecting each bucket back to its widest span only: a single cross-book
+    target never makes the short ones scanned.
+    """
+
+    def __init__(self, book_order):
+        self.book_order = book_order
+        # span class -> (widest span, starts, entries parallel to starts)
+        # entries: (end id, position in file order, source key, parsed source, relation)
+        self.buckets = {}
+
+    def __len__(self):
+        return sum(len(starts) for _, starts, _ in self.buckets.values())
+
+    @classmethod
+    def build(cls, index, book_order, normalizer=None):
+        """`normalizer` (optional) labels the sources of incoming relations once, here."""
+        reverse = cls(book_order)
+        rows = []
+        for src, refs in index.items():
+            parsed_source = parse_relation_target(src, normalizer) if normalizer else None
+            for rel in refs.get("relations", []):
+                parsed = rel.get("parsed")
+                target_range = parsed.range if parsed else parse_target_range(rel.get("target", ""), book_order)
+                if not target_range:
+                    continue
+                start, end = target_range
+                rows.append((start, end, len(rows), src, parsed_source, rel))
+        # Stable sort: relations of one target keep their source file order
+        rows.sort(key=lambda row: row[0])
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[span_class(row[0], row[1])].append(row)
+        for k, bucket in grouped.items():
+            widest = max(end - start for start, end, *_ in bucket)
+            reverse.buckets[k] = (widest, [row[0] for row in bucket], [row[1:] for row in bucket])
+        return reverse
+
+    def get(self, key, default=None):
+        """
+        Relations pointing to `key` ('BOOK.C.V'), as {"source", "target", "type", "note"} dicts
+        (plus "parsed_source", a ParsedTarget, when built with a normalizer).
+        """
+        verse_id = parse_verse_key(key, self.book_order)
+        if verse_id is None:
+            return default
+        incoming = [entry for _, entry in self.overlapping(VerseRange(verse_id, verse_id))]
+        return incoming or default
+
+    def _candidates(self, verse_range):
+        """(starts, entries, lo, hi) of each bucket: the slices that may overlap `verse_range`."""
+        for widest, starts, entries in self.buckets.values():
+            hi = bisect_right(starts, verse_range.end)
+            lo = bisect_left(starts, verse_range.start - widest, 0, hi)
+            yield starts, entries, lo, hi
+
+    def overlapping(self, verse_range):
+        """(target VerseRange, relation dict as in get) of the relations pointing into `verse_range`, by target start."""
+        found = []
+        for starts, entries, lo, hi in self._candidates(verse_range):
+            for i in range(lo, hi):
+                end, position, src, parsed_source, rel = entries[i]
+                if end >= verse_range.start:
+                    entry = {"source": src, "target": rel["target"], "type": rel.get("type", "other"), "note": rel.get("note")}
+                    if parsed_source:
+                        entry["parsed_source"] = parsed_source
+                    found.append(((starts[i], position), VerseRange(starts[i], end), entry))
+        # Buckets merged back into (target start, file order)
+        found.sort(key=lambda row: row[0])
+        return [(target_range, entry) for _, target_range, entry in found]
+
+class SourceRangeIndex:
+    """
+    Source verse ids of a forward index, sorted: the sources of a chapter or a range
+    ("MRK.1.1-3.6") are a bisect and a slice instead of a lookup per verse.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.keys = [] # source keys, parallel to ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, index, book_order):
+        sources = cls()
+        rows = []
+        for key in index:
+            verse_id = parse_verse_key(key, book_order)
+            if verse_id is not None:
+                rows.append((verse_id, key))
+        rows.sort()
+        sources.ids = [verse_id for verse_id, _ in rows]
+        sources.keys = [key for _, key in rows]
+        return sources
+
+    def keys_in(self, verse_range):
+        """(verse id, source key) of the sources inside `verse_range`, in canonical order."""
+        lo = bisect_left(self.ids, verse_range.start)
+        hi = bisect_right(self.ids, verse_range.end, lo)
+        return list(zip(self.ids[lo:hi], self.keys[lo:hi]))
 
 class ReferenceDatabase:
     def __init__(self, data_dir, normalizer):
@@ -10,6 +169,17 @@ class ReferenceDatabase:
         # Structure: source_key -> {"notes": [], "relations": []}
         self.in_memory_refs = defaultdict(lambda: {"notes": [], "relations": []})
         self.loaded_files = [] # Track which files contributed to in-memory state
+        # Read-only indexes shared across requests:
+        # (scope, source_filter) -> (file signature, (index, reverse index, sorted sources))
+        self._indexes = {}
+        self._indexes_lock = threading.Lock()
+        # (scope, source_filter) -> (index it was built from, ReferenceGraph)
+        self._graphs = {}
+        # path -> ((mtime, size), parsed cross_references entries)
+        self._file_cache = {}
+        self.stats = {"hits": 0, "misses": 0, "file_reloads": 0}
+        # Writes through this instance (a file's mtime may not tick between two of them)
+        self._writes = 0
 
     def load_all(self, source_filter=None, scope='all'):
         """
@@ -17,6 +187,115 @@ class ReferenceDatabase:
         """
         self.in_memory_refs.clear()
         
+        for filename in self._files_for(source_filter, scope):
+            self._load_file(filename)
+
+    def get_index(self, source_filter=None, scope='all'):
+        """
+        Returns the source_key -> {"notes", "relations"} mapping for a scope/source filter.
+        Shared across requests (treat it as read-only). The index is rebuilt only when
+        a matching file was added, removed or changed (mtime/size), and then only the
+        changed files are parsed again.
+        """
+        return self._indexes_for(source_filter, scope)[0]
+
+    def get_reverse_index(self, source_filter=None, scope='all'):
+        """
+        Incoming relations: target verse -> relations pointing to it (see ReverseReferenceIndex).
+        Built alongside the forward index and invalidated with it.
+        """
+        return self._indexes_for(source_filter, scope)[1]
+
+    def get_range(self, verse_range, source_filter=None, scope='all'):
+        """
+        (verse id, source key, {"notes", "relations"}) of every source verse inside `verse_range`
+        (a chapter, a range), in canonical order: a range scan over the sorted source ids.
+        """
+        index, _, sources = self._indexes_for(source_filter, scope)
+        return [(verse_id, key, index[key]) for verse_id, key in sources.keys_in(verse_range)]
+
+    def get_graph(self, source_filter=None, scope='all'):
+        """
+        ReferenceGraph (CSR adjacency over verse ids) of the relations in scope.
+        Rebuilt only when the underlying index was.
+        """
+        index = self.get_index(source_filter=source_filter, scope=scope)
+        key = (scope, source_filter)
+        cached = self._graphs.get(key)
+        if cached is not None and cached[0] is index:
+            return cached[1]
+        graph = ReferenceGraph.from_index(index, self.normalizer.book_order)
+        self._graphs[key] = (index, graph)
+        return graph
+
+    def _indexes_for(self, source_filter, scope):
+        key = (scope, source_filter)
+        signature = self._signature(self._files_for(source_filter, scope))
+        
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] == signature:
+            self.stats["hits"] += 1
+            return cached[1]
+        
+        with self._indexes_lock:
+            cached = self._indexes.get(key)
+            if cached is not None and cached[0] == signature:
+                self.stats["hits"] += 1
+                return cached[1]
+            
+            self.stats["misses"] += 1
+            index = {}
+            for path, mtime, size in signature:
+                self._merge_entries(self._parsed_file(path, mtime, size), index)
+            indexes = (
+                index,
+                ReverseReferenceIndex.build(index, self.normalizer.book_order, self.normalizer),
+                SourceRangeIndex.build(index, self.normalizer.book_order),
+            )
+            self._indexes[key] = (signature, indexes)
+            return indexes
+
+    def cache_stats(self):
+        """Hit/miss counters of get_index and number of file (re)parses."""
+        return dict(self.stats)
+
+    def revision(self):
+        """
+        Token that changes whenever a cross-reference file or relation does, for caches
+        of computed responses (compare it, don't interpret it).
+        """
+        return (self._writes, self._signature(self._files_for()))
+
+    def _signature(self, filenames):
+        signature = []
+        for filename in filenames:
+            path = self._resolve_path(filename)
+            if not path:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def _parsed_file(self, path, mtime, size):
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == (mtime, size):
+            return cached[1]
+        
+        self.stats["file_reloads"] += 1
+        entries = self._read_entries(path)
+        # Targets are parsed here, once per file read, never while serving
+        for entry in entries:
+            for rel in entry.get("relations") or []:
+                parsed = parse_relation_target(rel.get("target"), self.normalizer)
+                if parsed:
+                    rel["parsed"] = parsed
+        self._file_cache[path] = ((mtime, size), entries)
+        return entries
+
+    def _files_for(self, source_filter=None, scope='all'):
         files_to_load = []
         
         # Determine patterns to match based on scope
@@ -34,22 +313,7 @@ class ReferenceDatabase:
             filename = os.path.basename(file_path)
             
             # 1. Scope Check
-            is_nt_file = "references_nt_" in filename
-            is_ot_file = "references_ot_" in filename
-            is_generic = not (is_nt_file or is_ot_file)
-            
-            should_load_scope = False
-            
-            if scope == 'all':
-                should_load_scope = True
-            elif scope == 'nt':
-                should_load_scope = is_nt_file or is_generic
-            elif scope == 'ot':
-                should_load_scope = is_ot_file or is_generic
-            elif scope == 'generic':
-                 should_load_scope = is_generic
-            
-            if not should_load_scope:
+            if file_scope(filename) not in scope_members(scope):
                 continue
                 
             # 2. Source Filter Check
@@ -65,44 +329,53 @@ class ReferenceDatabase:
             
         # Fallback/Safety: If explicit source requested but not found via glob?
         # (e.g. file doesn't exist yet but user wants it loaded? No, we only load existing)
-            
-        for filename in files_to_load:
-            self._load_file(filename)
+        return files_to_load
+
+    def _load_file(self, filename, refs=None):
+        if refs is None:
+            refs = self.in_memory_refs
+        path = self._resolve_path(filename)
+        if not path:
+            return
+        self._merge_entries(self._read_entries(path), refs)
 
-    def _load_file(self, filename):
+    def _resolve_path(self, filename):
         path = os.path.join(self.data_dir, filename)
         if not os.path.exists(path):
             # Fallback check
             if "openbible" in filename:
                 fb = os.path.join(self.data_dir, "references_openbible.json")
                 if os.path.exists(fb):
-                    path = fb
-                else:
-                    return
-            else:
-                return
+                    return fb
+            return None
+        return path
 
+    def _read_entries(self, path):
         try:
             with open(path, "r") as f:
                 data = json.load(f)
-            
-            for entry in data.get("cross_references", []):
-                src = entry["source"]
-                # Structure merge
-                if src not in self.in_memory_refs:
-                    self.in_memory_refs[src] = {"notes": [], "relations": []}
-                
-                tgt = self.in_memory_refs[src]
-                
-                if "notes" in entry and entry["notes"]:
-                    if entry["notes"] not in tgt["notes"]:
-                        tgt["notes"].append(entry["notes"])
-                
-                if "relations" in entry:
-                    tgt["relations"].extend(entry["relations"])
-                    
+            return data.get("cross_references", [])
         except Exception as e:
-            print(f"Warning: Could not load {filename}: {e}")
+            print(f"Warning: Could not load {os.path.basename(path)}: {e}")
+            return []
+
+    def _merge_entries(self, entries, refs):
+        for entry in entries:
+            src = entry.get("source")
+            if not src:
+                continue
+            # Structure merge
+            if src not in refs:
+                refs[src] = {"notes": [], "relations": []}
+            
+            tgt = refs[src]
+            
+            if "notes" in entry and entry["notes"]:
+                if entry["notes"] not in tgt["notes"]:
+                    tgt["notes"].append(entry["notes"])
+            
+            if "relations" in entry:
+                tgt["relations"].extend(entry["relations"])
 
     def get_references(self, book_code):
         """
@@ -117,6 +390,18 @@ class ReferenceDatabase:
                 filtered[k] = v
         return filtered
 
+    def _collection_filename(self, collection_name, src_code):
+        # Determine prefix based on source book
+        prefix = "nt"
+        if self.normalizer.is_ot(src_code):
+             prefix = "ot"
+             
+        # Construct filename with prefix
+        # We assume collection_name does NOT have the prefix provided by user
+        # Clean collection name just in case
+        clean_name = collection_name.replace("references_", "").replace("nt_", "").replace("ot_", "").replace(".json", "")
+        return f"references_{prefix}_{clean_name}.json"
+
     def add_relation(self, collection_name, source_ref, target_ref, rel_type="other", note=""):
         """
         Adds a relation to a specific collection file.
@@ -136,16 +421,9 @@ class ReferenceDatabase:
         src_str = norm_source[3]
         tgt_str = norm_target[3]
         
-        # Determine prefix based on source book
-        prefix = "nt"
-        if self.normalizer.is_ot(src_code):
-             prefix = "ot"
-             
-        # Construct filename with prefix
-        # We assume collection_name does NOT have the prefix provided by user
-        # Clean collection name just in case
-        clean_name = collection_name.replace("references_", "").replace("nt_", "").replace("ot_", "").replace(".json", "")
-        filename = f"references_{prefix}_{clean_name}.json"
+        filename = self._collection_filename(collection_name, src_code)
+        prefix = file_scope(filename)
+        clean_name = filename[len(f"references_{prefix}_"):-len(".json")]
         
         path = os.path.join(self.data_dir, filename)
         
@@ -188,5 +466,11 @@ class ReferenceDatabase:
         # Write back
         with open(path, "w") as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
+        
+        # Shared indexes are stale now (mtime may not have ticked yet)
+        with self._indexes_lock:
+            self._indexes.clear()
+            self._file_cache.pop(path, None)
+            self._writes += 1
             
         return True
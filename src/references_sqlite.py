@@ -0,0 +1,472 @@
+import os
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+
+from references_db import ReferenceDatabase, ParsedTarget, file_scope, scope_members, span_class
+from verse_id import VerseRange, book_span, parse_verse_key, parse_target_range
+from reference_graph import ReferenceGraph
+
+# SQLite storage for cross-references, for corpora too large to hold as JSON in memory.
+#
+# The references_*.json files stay the exchange format: `import_json` loads them
+# (one collection per file name) and `export_json` writes a collection back.
+# Verses are stored as packed integer ids (see verse_id.py), so a lookup is one
+# indexed query and nothing is loaded up front.
+
+REFERENCES_DB_FILENAME = "references.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    scope TEXT NOT NULL,
+    description TEXT,
+    -- Bit k set when the collection has targets of span_class k (see references_db.span_class)
+    span_classes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY,
+    collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    source_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    target_start INTEGER,
+    target_end INTEGER,
+    span_class INTEGER,
+    type TEXT,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    source_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    note TEXT NOT NULL
+);
+-- 'generation': bumped by every write transaction, whichever process makes it
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_relations_source ON relations(source_id);
+CREATE INDEX IF NOT EXISTS idx_relations_target ON relations(target_start, target_end);
+CREATE INDEX IF NOT EXISTS idx_relations_collection ON relations(collection_id);
+CREATE INDEX IF NOT EXISTS idx_notes_source ON notes(source_id);
+CREATE INDEX IF NOT EXISTS idx_notes_collection ON notes(collection_id);
+"""
+
+
+class SqliteReferenceDatabase(ReferenceDatabase):
+    """
+    ReferenceDatabase backed by a SQLite file instead of the JSON files.
+    `get_index` returns a lazy mapping: each `.get(key)` is an indexed query.
+    `load_all` / `in_memory_refs` still read the JSON files (legacy callers).
+    """
+
+    def __init__(self, data_dir, normalizer, db_path=None):
+        super().__init__(data_dir, normalizer)
+        self.db_path = db_path or os.path.join(data_dir, REFERENCES_DB_FILENAME)
+        # sqlite3 connections must not be shared between threads
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(collections)")]
+            if "span_classes" not in columns:
+                # Databases built before targets were bucketed by length
+                with conn:
+                    conn.execute("ALTER TABLE collections ADD COLUMN span_classes INTEGER NOT NULL DEFAULT 0")
+                    conn.execute("ALTER TABLE relations ADD COLUMN span_class INTEGER")
+                    conn.create_function("span_class", 2, span_class, deterministic=True)
+                    conn.execute("UPDATE relations SET span_class = span_class(target_start, target_end) WHERE target_start IS NOT NULL")
+                    classes = defaultdict(int)
+                    for collection_id, k in conn.execute("SELECT DISTINCT collection_id, span_class FROM relations WHERE span_class IS NOT NULL"):
+                        classes[collection_id] |= 1 << k
+                    conn.executemany("UPDATE collections SET span_classes = ? WHERE id = ?", [(m, c) for c, m in classes.items()])
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_relations_span ON relations(span_class, target_start)")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Queries ---
+
+    def get_index(self, source_filter=None, scope='all'):
+        return SqliteReferenceIndex(self, source_filter, scope)
+
+    def get_reverse_index(self, source_filter=None, scope='all'):
+        return SqliteReverseReferenceIndex(self, source_filter, scope)
+
+    def get_graph(self, source_filter=None, scope='all'):
+        """ReferenceGraph built from an edge scan, rebuilt when relations or collections change."""
+        key = (scope, source_filter)
+        signature = self._generation()
+        cached = self._graphs.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        where, params = self._collection_filter(source_filter, scope)
+        rows = self.conn.execute(
+            "SELECT r.source_id, r.target_start, r.type FROM relations r JOIN collections c ON c.id = r.collection_id"
+            f" WHERE r.target_start IS NOT NULL{where}",
+            params,
+        )
+        graph = ReferenceGraph.from_edges(rows)
+        self._graphs[key] = (signature, graph)
+        return graph
+
+    def revision(self):
+        """Changes with every write, through this instance or by another process."""
+        return self._generation()
+
+    def _generation(self):
+        # Row ids are reused after a DELETE, so ids and counts can come back identical
+        # after a re-import: the write counter in `meta` cannot.
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def _bump_generation(self):
+        """Called inside each write transaction."""
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    def _collection_filter(self, source_filter, scope):
+        clauses, params = [], []
+        if scope != 'all':
+            scopes = scope_members(scope)
+            clauses.append(f"c.scope IN ({','.join('?' * len(scopes))})" if scopes else "0")
+            params.extend(scopes)
+        if source_filter and source_filter != 'all':
+            clauses.append("instr(lower(c.filename), ?) > 0")
+            params.append(source_filter.lower())
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def lookup(self, key, source_filter=None, scope='all'):
+        """{"notes": [...], "relations": [...]} for a 'BOOK.C.V' key, or None."""
+        source_id = parse_verse_key(key, self.normalizer.book_order)
+        if source_id is None:
+            return None
+        where, params = self._collection_filter(source_filter, scope)
+
+        notes = []
+        rows = self.conn.execute(
+            "SELECT n.note FROM notes n JOIN collections c ON c.id = n.collection_id"
+            f" WHERE n.source_id = ?{where} ORDER BY c.id, n.id",
+            [source_id] + params,
+        )
+        for (note,) in rows:
+            if note not in notes:
+                notes.append(note)
+
+        relations = []
+        rows = self.conn.execute(
+            "SELECT r.target, r.type, r.note, r.target_start, r.target_end FROM relations r JOIN collections c ON c.id = r.collection_id"
+            f" WHERE r.source_id = ?{where} ORDER BY c.id, r.id",
+            [source_id] + params,
+        )
+        for target, rel_type, note, start, end in rows:
+            rel = {"target": target, "type": rel_type}
+            if note is not None:
+                rel["note"] = note
+            if start is not None:
+                # Parsed on import: only the label is derived, from the ids
+                rel["parsed"] = self._parsed(start, end)
+            relations.append(rel)
+
+        if not notes and not relations:
+            return None
+        return {"notes": notes, "relations": relations}
+
+    def incoming(self, key, source_filter=None, scope='all'):
+        """Relations whose target range contains `key`, as {"source", "target", "type", "note"} dicts."""
+        verse_id = parse_verse_key(key, self.normalizer.book_order)
+        if verse_id is None:
+            return []
+        return [entry for _, entry in self.incoming_range(VerseRange(verse_id, verse_id), source_filter, scope)]
+
+    def incoming_range(self, verse_range, source_filter=None, scope='all'):
+        """(target VerseRange, relation dict as in incoming) of the relations pointing into `verse_range`."""
+        where, params = self._collection_filter(source_filter, scope)
+        # One indexed start interval per span class present: a long target only widens its own
+        mask = 0
+        for (classes,) in self.conn.execute("SELECT span_classes FROM collections"):
+            mask |= classes
+        classes = [k for k in range(mask.bit_length()) if mask >> k & 1]
+        if not classes:
+            return []
+        bounds = " OR ".join(["(r.span_class = ? AND r.target_start BETWEEN ? AND ?)"] * len(classes))
+        bound_params = []
+        for k in classes:
+            bound_params += [k, verse_range.start - ((1 << k) - 1), verse_range.end]
+        rows = self.conn.execute(
+            "SELECT r.source, r.target, r.type, r.note, r.source_id, r.target_start, r.target_end"
+            " FROM relations r JOIN collections c ON c.id = r.collection_id"
+            f" WHERE ({bounds}) AND r.target_end >= ?{where} ORDER BY r.target_start, c.id, r.id",
+            bound_params + [verse_range.start] + params,
+        )
+        return [
+            (VerseRange(start, end),
+             {"source": src, "target": target, "type": rel_type, "note": note, "parsed_source": self._parsed(source_id, source_id)})
+            for src, target, rel_type, note, source_id, start, end in rows
+        ]
+
+    def get_range(self, verse_range, source_filter=None, scope='all'):
+        """(verse id, source key, {"notes", "relations"}) of the source verses inside `verse_range`: two indexed range queries."""
+        where, params = self._collection_filter(source_filter, scope)
+        bounds = [verse_range.start, verse_range.end]
+        found = {}
+        rows = self.conn.execute(
+            "SELECT n.source_id, n.source, n.note FROM notes n JOIN collections c ON c.id = n.collection_id"
+            f" WHERE n.source_id BETWEEN ? AND ?{where} ORDER BY c.id, n.id",
+            bounds + params,
+        )
+        for source_id, source, note in rows:
+            notes = found.setdefault(source_id, (source, {"notes": [], "relations": []}))[1]["notes"]
+            if note not in notes:
+                notes.append(note)
+        rows = self.conn.execute(
+            "SELECT r.source_id, r.source, r.target, r.type, r.note, r.target_start, r.target_end"
+            " FROM relations r JOIN collections c ON c.id = r.collection_id"
+            f" WHERE r.source_id BETWEEN ? AND ?{where} ORDER BY c.id, r.id",
+            bounds + params,
+        )
+        for source_id, source, target, rel_type, note, start, end in rows:
+            rel = {"target": target, "type": rel_type}
+            if note is not None:
+                rel["note"] = note
+            if start is not None:
+                rel["parsed"] = self._parsed(start, end)
+            found.setdefault(source_id, (source, {"notes": [], "relations": []}))[1]["relations"].append(rel)
+        return [(source_id, source, refs) for source_id, (source, refs) in sorted(found.items())]
+
+    def _parsed(self, start, end):
+        return ParsedTarget(VerseRange(start, end), self.normalizer.range_label(VerseRange(start, end)))
+
+    def source_keys(self, source_filter=None, scope='all'):
+        where, params = self._collection_filter(source_filter, scope)
+        rows = self.conn.execute(
+            "SELECT DISTINCT source_id, source FROM ("
+            " SELECT r.source_id, r.source, r.collection_id FROM relations r"
+            " UNION ALL SELECT n.source_id, n.source, n.collection_id FROM notes n"
+            f") s JOIN collections c ON c.id = s.collection_id WHERE 1{where} ORDER BY source_id",
+            params,
+        )
+        return [source for _, source in rows]
+
+    def get_references(self, book_code):
+        ordinal = self.normalizer.book_order.get(book_code)
+        if ordinal is None:
+            return {}
+        # A book is one contiguous id interval
+        bounds = tuple(book_span(ordinal))
+        rows = self.conn.execute(
+            "SELECT source_id, source FROM relations WHERE source_id BETWEEN ? AND ?"
+            " UNION SELECT source_id, source FROM notes WHERE source_id BETWEEN ? AND ?"
+            " ORDER BY source_id",
+            bounds + bounds,
+        )
+        return {key: self.lookup(key) for _, key in rows}
+
+    # --- Import / export ---
+
+    def import_json(self, filenames=None):
+        """
+        Imports references_*.json files (default: all of them in data_dir).
+        A file replaces the collection of the same name. Returns {filename: relations imported}.
+        """
+        if filenames is None:
+            filenames = self._files_for()
+        counts = {}
+        for filename in filenames:
+            path = self._resolve_path(filename) if not os.path.isabs(filename) else filename
+            if not path:
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not load {os.path.basename(path)}: {e}")
+                continue
+            counts[os.path.basename(path)] = self._import_collection(
+                os.path.basename(path), data.get("description"), data.get("cross_references", [])
+            )
+        return counts
+
+    def _import_collection(self, filename, description, entries):
+        book_order = self.normalizer.book_order
+        relation_rows, note_rows, skipped, classes = [], [], 0, 0
+        for entry in entries:
+            src = entry.get("source")
+            source_id = parse_verse_key(src, book_order) if src else None
+            if source_id is None:
+                skipped += 1
+                continue
+            if entry.get("notes"):
+                note_rows.append((source_id, src, entry["notes"]))
+            for rel in entry.get("relations", []):
+                target = rel.get("target")
+                if not target:
+                    continue
+                target_range = parse_target_range(target, book_order) or (None, None)
+                k = span_class(*target_range) if target_range[0] is not None else None
+                if k is not None:
+                    classes |= 1 << k
+                relation_rows.append((source_id, src, target, target_range[0], target_range[1], k, rel.get("type", "other"), rel.get("note")))
+        if skipped:
+            print(f"Warning: {filename}: skipped {skipped} entries with an unknown source reference")
+
+        with self._write_lock, self.conn:
+            self._bump_generation()
+            self.conn.execute("DELETE FROM collections WHERE filename = ?", (filename,))
+            collection_id = self.conn.execute(
+                "INSERT INTO collections (filename, scope, description, span_classes) VALUES (?, ?, ?, ?)",
+                (filename, file_scope(filename), description, classes),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO notes (collection_id, source_id, source, note) VALUES (?, ?, ?, ?)",
+                [(collection_id,) + row for row in note_rows],
+            )
+            self.conn.executemany(
+                "INSERT INTO relations (collection_id, source_id, source, target, target_start, target_end, span_class, type, note)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(collection_id,) + row for row in relation_rows],
+            )
+        return len(relation_rows)
+
+    def collections(self):
+        return [filename for (filename,) in self.conn.execute("SELECT filename FROM collections ORDER BY id")]
+
+    def export_json(self, filename, path=None):
+        """Writes a collection back in the references_*.json format (default: data_dir/filename)."""
+        row = self.conn.execute("SELECT id, description FROM collections WHERE filename = ?", (filename,)).fetchone()
+        if not row:
+            raise ValueError(f"Unknown collection: {filename}")
+        collection_id, description = row
+
+        entries = {}
+        for source, note in self.conn.execute(
+            "SELECT source, note FROM notes WHERE collection_id = ? ORDER BY source_id, id", (collection_id,)
+        ):
+            entries.setdefault(source, {"source": source})["notes"] = note
+        for source, target, rel_type, note in self.conn.execute(
+            "SELECT source, target, type, note FROM relations WHERE collection_id = ? ORDER BY source_id, id", (collection_id,)
+        ):
+            rel = {"target": target, "type": rel_type}
+            if note is not None:
+                rel["note"] = note
+            entries.setdefault(source, {"source": source}).setdefault("relations", []).append(rel)
+
+        data = {"version": "1.0"}
+        if description:
+            data["description"] = description
+        order = self.normalizer.book_order
+        data["cross_references"] = sorted(entries.values(), key=lambda e: parse_verse_key(e["source"], order))
+
+        path = path or os.path.join(self.data_dir, filename)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        return path
+
+    # --- Writes ---
+
+    def add_relation(self, collection_name, source_ref, target_ref, rel_type="other", note=""):
+        """Inserts one relation (no JSON file is rewritten; use export_json for that)."""
+        norm_source = self.normalizer.normalize_reference(source_ref)
+        norm_target = self.normalizer.normalize_reference(target_ref)
+
+        if not norm_source:
+            raise ValueError(f"Invalid source reference: {source_ref}")
+        if not norm_target:
+            raise ValueError(f"Invalid target reference: {target_ref}")
+
+        src_code, src_str, tgt_str = norm_source[0], norm_source[3], norm_target[3]
+        filename = self._collection_filename(collection_name, src_code)
+        book_order = self.normalizer.book_order
+        source_id = parse_verse_key(src_str, book_order)
+        if source_id is None:
+            raise ValueError(f"Invalid source reference: {source_ref}")
+        target_range = parse_target_range(tgt_str, book_order) or (None, None)
+        k = span_class(*target_range) if target_range[0] is not None else None
+
+        with self._write_lock, self.conn:
+            self._bump_generation()
+            row = self.conn.execute("SELECT id FROM collections WHERE filename = ?", (filename,)).fetchone()
+            if row:
+                collection_id = row[0]
+            else:
+                prefix = file_scope(filename)
+                clean_name = filename[len(f"references_{prefix}_"):-len(".json")]
+                collection_id = self.conn.execute(
+                    "INSERT INTO collections (filename, scope, description) VALUES (?, ?, ?)",
+                    (filename, prefix, f"References for {clean_name} ({prefix})"),
+                ).lastrowid
+            self.conn.execute(
+                "INSERT INTO relations (collection_id, source_id, source, target, target_start, target_end, span_class, type, note)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (collection_id, source_id, src_str, tgt_str, target_range[0], target_range[1], k, rel_type, note),
+            )
+            if k is not None:
+                self.conn.execute(
+                    "UPDATE collections SET span_classes = span_classes | ? WHERE id = ?",
+                    (1 << k, collection_id),
+                )
+        return True
+
+
+class SqliteReferenceIndex(Mapping):
+    """Read-only source_key -> {"notes", "relations"} view over a SqliteReferenceDatabase."""
+
+    def __init__(self, db, source_filter=None, scope='all'):
+        self.db = db
+        self.source_filter = source_filter
+        self.scope = scope
+
+    def __getitem__(self, key):
+        refs = self.db.lookup(key, source_filter=self.source_filter, scope=self.scope)
+        if refs is None:
+            raise KeyError(key)
+        return refs
+
+    def get(self, key, default=None):
+        refs = self.db.lookup(key, source_filter=self.source_filter, scope=self.scope)
+        return default if refs is None else refs
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self.db.source_keys(self.source_filter, self.scope))
+
+    def __len__(self):
+        return len(self.db.source_keys(self.source_filter, self.scope))
+
+
+
+class SqliteReverseReferenceIndex:
+    """Read-only target_key -> incoming relations view over a SqliteReferenceDatabase."""
+
+    def __init__(self, db, source_filter=None, scope='all'):
+        self.db = db
+        self.source_filter = source_filter
+        self.scope = scope
+
+    def get(self, key, default=None):
+        return self.db.incoming(key, source_filter=self.source_filter, scope=self.scope) or default
+
+    def overlapping(self, verse_range):
+        return self.db.incoming_range(verse_range, source_filter=self.source_filter, scope=self.scope)
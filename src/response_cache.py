@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Bounded LRU of computed responses.
+#
+# Every entry is stored with the revision of the data it was computed from (loaded
+# datasets, cross-reference files...). A lookup with another revision is a miss and
+# drops the entry, so callers never have to know who changed what: they pass the
+# current revision and stale entries disappear by themselves.
+
+
+class LRUCache:
+    """Thread-safe LRU with a size limit, an optional TTL (seconds) and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (revision, stored at, value), least recently used first
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, revision: Any = None) -> Optional[Any]:
+        """The value stored for `key` at `revision`, or None (expired and stale entries are dropped)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            stored_revision, stored_at, value = entry
+            if stored_revision != revision:
+                del self._entries[key]
+                self.stats["invalidations"] += 1
+                self.stats["misses"] += 1
+                return None
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, revision: Any = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (revision, self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cache_stats(self) -> dict:
+        """Counters plus current size, limit and TTL."""
+        with self._lock:
+            return dict(self.stats, size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl)
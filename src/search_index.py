@@ -0,0 +1,693 @@
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import struct
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from verse_id import encode_verse_id, decode_verse_id
+from search_scope import VerseScope
+
+# Full-text search: one inverted index per version (token -> sorted verse ids, and
+# token -> word positions), written once from the verse texts and memory-mapped afterwards.
+#
+# Words are numbered across the whole version, verse after verse in id order, so a
+# position identifies both a verse and a word within it.
+#
+# Layout of data/search/<VERSION>.idx:
+#   MAGIC (8 bytes) | header length (uint64, little endian) | header JSON | padding
+#   then 8-byte aligned sections:
+#     ids        int32[verse_count]       every verse id of the version, sorted
+#     starts     uint32[verse_count + 1]  position of the first word of each verse (last = word count)
+#   and, for each layer (exact lowercase tokens, then folded tokens, see `fold`):
+#     offsets    uint64[terms + 1]        postings of term i are postings[offsets[i]:offsets[i + 1]]
+#     postings   int32[...]               sorted verse ids
+#     tfs        uint16[...]              occurrences of the term in each verse of its postings
+#     pos_index  uint64[postings + 1]     positions of posting j are gaps[pos_index[j]:pos_index[j + 1]]
+#     pos_base   uint32[postings]         first position of each posting (decodes its gaps alone)
+#     gaps       uint32[...]              delta-encoded sorted positions of each term (first one from 0)
+#
+# The header holds the sorted term list of each layer, so a term lookup is one
+# dict probe and its postings are a slice of the mapped file. Folding is done
+# once, when the index is written. Verse lengths (from `starts`) and term
+# frequencies (`tfs`) are what BM25 ranking needs, so scoring reads no text.
+# Positions are also indexed per posting: a phrase with a rare word decodes the
+# positions of the few verses holding all its words, not a frequent word's everywhere.
+
+MAGIC = b"SASI0005"
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+TF_MAX = 0xFFFF
+LAYERS = ("terms", "folded")
+SEARCH_DIRNAME = "search"
+INDEX_SUFFIX = ".idx"
+
+
+def search_index_dir(data_dir: str) -> str:
+    """data/search, or SCRIPTURES_SEARCH_DIR."""
+    return os.environ.get("SCRIPTURES_SEARCH_DIR", os.path.join(data_dir, SEARCH_DIRNAME))
+
+# Combining marks kept inside tokens: Greek accents (decomposed), Hebrew niqqud and
+# cantillation (not maqaf, paseq or sof pasuq), Arabic tashkeel
+_MARKS = (
+    "\u0300-\u036f"
+    "\u0591-\u05bd\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7"
+    "\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e4\u06e7\u06e8\u06ea-\u06ed"
+)
+TOKEN_RE = re.compile(rf"(?:[^\W_]|[{_MARKS}])+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Verse or query text -> lowercase word tokens."""
+    return TOKEN_RE.findall((text or "").lower())
+
+
+# Marks and letters dropped or replaced by `fold` on top of combining marks
+_FOLD_TABLE = str.maketrans({
+    "\u03c2": "\u03c3",  # final sigma -> sigma
+    "\u0640": None,  # Arabic tatweel
+    "\u0671": "\u0627",  # alef wasla -> alef
+    "\u0649": "\u064a",  # alef maqsura -> yeh
+})
+
+
+def fold(token: str) -> str:
+    """
+    Case- and diacritic-insensitive form of a token: Greek accents and breathings,
+    Hebrew niqqud and cantillation, French accents and Arabic tashkeel are dropped,
+    final sigma becomes sigma ("Λόγος" -> "λογοσ", "Évangile" -> "evangile").
+    """
+    # lower(), not casefold(): casefold spells the Greek iota subscript as a full iota
+    decomposed = unicodedata.normalize("NFD", token.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize("NFC", stripped.translate(_FOLD_TABLE))
+
+
+def _pad(f):
+    remainder = f.tell() % 8
+    if remainder:
+        f.write(b"\0" * (8 - remainder))
+
+
+def write_search_index(path: str, version: str, book_codes: Sequence[str], verses: Iterable[Tuple[str, int, int, str]]) -> int:
+    """
+    Indexes the (book_code, chapter, verse, text) rows of one version into `path`.
+    `book_codes` fixes the book ordinals used in verse ids; verses of unknown books are skipped.
+    Returns the number of verses indexed.
+    """
+    ordinals = {code: i for i, code in enumerate(book_codes)}
+
+    texts: Dict[int, List[str]] = {}
+    for book_code, chapter, verse, text in verses:
+        ordinal = ordinals.get(book_code)
+        if ordinal is None:
+            continue
+        texts[encode_verse_id(ordinal, chapter, verse)] = tokenize(text)
+
+    # term -> (verse ids, occurrences per verse, positions), ascending since verses are numbered in id order
+    postings: Dict[str, Tuple[List[int], List[int], List[int]]] = {}
+    ids = array("i", sorted(texts))
+    starts = array("I", [0])
+    position = 0
+    for verse_id in ids:
+        for token in texts[verse_id]:
+            term_ids, term_tfs, term_positions = postings.setdefault(token, ([], [], []))
+            if term_ids and term_ids[-1] == verse_id:
+                term_tfs[-1] += 1
+            else:
+                term_ids.append(verse_id)
+                term_tfs.append(1)
+            term_positions.append(position)
+            position += 1
+        starts.append(position)
+
+    # Folded layer: union of the postings of every form folding to the same token
+    folded_sets: Dict[str, Tuple[Dict[int, int], set]] = {}
+    for term, (term_ids, term_tfs, term_positions) in postings.items():
+        tf_by_id, positions_set = folded_sets.setdefault(fold(term), ({}, set()))
+        for verse_id, tf in zip(term_ids, term_tfs):
+            tf_by_id[verse_id] = tf_by_id.get(verse_id, 0) + tf
+        positions_set.update(term_positions)
+    folded = {}
+    for term, (tf_by_id, positions_set) in folded_sets.items():
+        term_ids = sorted(tf_by_id)
+        folded[term] = (term_ids, [tf_by_id[i] for i in term_ids], sorted(positions_set))
+
+    header = {
+        "byteorder": sys.byteorder,
+        "version": version.upper(),
+        "books": list(book_codes),
+        "verse_count": len(ids),
+    }
+    sections = [ids, starts]
+    for layer, layer_postings in zip(LAYERS, (postings, folded)):
+        terms = sorted(layer_postings)
+        offsets, flat, tfs = array("Q", [0]), array("i"), array("H")
+        pos_index, pos_base, gaps = array("Q", [0]), array("I"), array("I")
+        for term in terms:
+            term_ids, term_tfs, term_positions = layer_postings[term]
+            flat.extend(term_ids)
+            tfs.extend(min(tf, TF_MAX) for tf in term_tfs)
+            offsets.append(len(flat))
+            first = len(gaps)
+            previous = 0
+            for p in term_positions:
+                gaps.append(p - previous)
+                previous = p
+            # Positions are sorted and verses numbered in id order: each verse's are the next tf
+            k = 0
+            for tf in term_tfs:
+                pos_base.append(term_positions[k])
+                k += tf
+                pos_index.append(first + k)
+        header[layer] = terms
+        sections += [offsets, flat, tfs, pos_index, pos_base, gaps]
+    header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        _pad(f)
+        for section in sections:
+            f.write(section.tobytes())
+            _pad(f)
+    os.replace(tmp_path, path)
+    return len(ids)
+
+
+class SearchIndex:
+    """Read-only, memory-mapped view over a file written by `write_search_index`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a search index: {path}")
+        (header_length,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._mm[start:start + header_length]).decode("utf-8"))
+        if header.get("byteorder") != sys.byteorder:
+            self.close()
+            raise ValueError(f"Search index {path} was written for a {header.get('byteorder')}-endian platform")
+
+        self.version = header["version"]
+        self.books = header["books"]
+        self.verse_count = header["verse_count"]
+
+        def aligned(n):
+            return (n + 7) & ~7
+
+        view = self._view = memoryview(self._mm)
+        pos = aligned(start + header_length)
+        self.ids = view[pos:pos + self.verse_count * 4].cast("i")
+        pos = aligned(pos + self.verse_count * 4)
+        self.starts = view[pos:pos + (self.verse_count + 1) * 4].cast("I")
+        pos = aligned(pos + (self.verse_count + 1) * 4)
+        # layer -> (term -> i, offsets, postings, tfs, pos_index, pos_base, gaps)
+        self._layers = {}
+        for layer in LAYERS:
+            terms = {term: i for i, term in enumerate(header[layer])}
+            offsets = view[pos:pos + (len(terms) + 1) * 8].cast("Q")
+            pos = aligned(pos + (len(terms) + 1) * 8)
+            postings = view[pos:pos + offsets[len(terms)] * 4].cast("i")
+            pos = aligned(pos + offsets[len(terms)] * 4)
+            tfs = view[pos:pos + offsets[len(terms)] * 2].cast("H")
+            pos = aligned(pos + offsets[len(terms)] * 2)
+            posting_count = offsets[len(terms)]
+            pos_index = view[pos:pos + (posting_count + 1) * 8].cast("Q")
+            pos = aligned(pos + (posting_count + 1) * 8)
+            pos_base = view[pos:pos + posting_count * 4].cast("I")
+            pos = aligned(pos + posting_count * 4)
+            gaps = view[pos:pos + pos_index[posting_count] * 4].cast("I")
+            pos = aligned(pos + pos_index[posting_count] * 4)
+            self._layers[layer] = (terms, offsets, postings, tfs, pos_index, pos_base, gaps)
+        # Mean verse length in words, for BM25
+        self.avg_length = self.starts[self.verse_count] / self.verse_count if self.verse_count else 0.0
+
+    def __len__(self):
+        return len(self._layers["terms"][0])
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._layers["terms"][0]
+
+    def postings(self, term: str, folded: bool = False) -> Sequence[int]:
+        """
+        Sorted verse ids containing `term` (empty if none).
+        With `folded`, `term` must be folded and every form folding to it matches.
+        """
+        terms, offsets, postings, _, _, _, _ = self._layers["folded" if folded else "terms"]
+        i = terms.get(term)
+        if i is None:
+            return ()
+        return postings[offsets[i]:offsets[i + 1]]
+
+    def term_frequencies(self, term: str, verse_ids: Sequence[int], folded: bool = False) -> List[int]:
+        """Occurrences of `term` in each of the sorted `verse_ids` (0 where absent)."""
+        terms, offsets, postings, tfs, _, _, _ = self._layers["folded" if folded else "terms"]
+        i = terms.get(term)
+        if i is None:
+            return [0] * len(verse_ids)
+        lo, hi = offsets[i], offsets[i + 1]
+        result = []
+        for verse_id in verse_ids:
+            lo = bisect_left(postings, verse_id, lo, hi)
+            result.append(tfs[lo] if lo < hi and postings[lo] == verse_id else 0)
+        return result
+
+    def lengths(self, verse_ids: Sequence[int]) -> List[int]:
+        """Word counts of the sorted `verse_ids` (which must be in the index)."""
+        result, lo = [], 0
+        for verse_id in verse_ids:
+            lo = bisect_left(self.ids, verse_id, lo)
+            result.append(self.starts[lo + 1] - self.starts[lo])
+        return result
+
+    def positions(self, term: str, folded: bool = False) -> List[int]:
+        """Sorted word positions of `term` (all its gaps decoded), empty if none."""
+        terms, offsets, _, _, pos_index, _, gaps = self._layers["folded" if folded else "terms"]
+        i = terms.get(term)
+        if i is None:
+            return []
+        return list(accumulate(gaps[pos_index[offsets[i]]:pos_index[offsets[i + 1]]]))
+
+    def position_count(self, term: str, folded: bool = False) -> int:
+        """Occurrences of `term` in the whole version."""
+        terms, offsets, _, _, pos_index, _, _ = self._layers["folded" if folded else "terms"]
+        i = terms.get(term)
+        return 0 if i is None else pos_index[offsets[i + 1]] - pos_index[offsets[i]]
+
+    def verse_positions(self, term: str, verse_ids: Sequence[int], folded: bool = False) -> List[List[int]]:
+        """
+        Sorted word positions of `term` in each of the sorted `verse_ids` (empty where absent).
+        Only the gaps of those verses are decoded.
+        """
+        terms, offsets, postings, _, pos_index, pos_base, gaps = self._layers["folded" if folded else "terms"]
+        i = terms.get(term)
+        if i is None:
+            return [[] for _ in verse_ids]
+        lo, hi = offsets[i], offsets[i + 1]
+        result = []
+        for verse_id in verse_ids:
+            lo = bisect_left(postings, verse_id, lo, hi)
+            if lo < hi and postings[lo] == verse_id:
+                # The first gap is relative to the previous verse's last position: start from the base
+                result.append(list(accumulate(gaps[pos_index[lo] + 1:pos_index[lo + 1]], initial=pos_base[lo])))
+            else:
+                result.append([])
+        return result
+
+    def verse_index(self, position: int) -> int:
+        """Index (into `ids`) of the verse holding the word at `position`."""
+        return bisect_right(self.starts, position) - 1
+
+    def close(self):
+        for layer in getattr(self, "_layers", {}).values():
+            for section in layer[1:]:
+                section.release()
+        self._layers = {}
+        for attr in ("ids", "starts", "_view"):
+            section = getattr(self, attr, None)
+            if section is not None:
+                section.release()
+                setattr(self, attr, None)
+        if getattr(self, "_mm", None) is not None and not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+
+def intersect(a: Sequence[int], b: Sequence[int]) -> List[int]:
+    """Intersection of two sorted id lists: walks the shorter one, bisecting into the longer."""
+    if len(a) > len(b):
+        a, b = b, a
+    result, lo, n = [], 0, len(b)
+    for x in a:
+        lo = bisect_left(b, x, lo)
+        if lo == n:
+            break
+        if b[lo] == x:
+            result.append(x)
+    return result
+
+
+def follow(starts: Sequence[int], positions: Sequence[int], offset: int) -> List[int]:
+    """The `starts` x (sorted) such that x + offset is in `positions` (sorted)."""
+    if len(starts) * 16 > len(positions):
+        # Comparable sizes: one hashed pass beats a bisect per start
+        present = set(positions)
+        return [x for x in starts if x + offset in present]
+    result, lo, n = [], 0, len(positions)
+    for x in starts:
+        lo = bisect_left(positions, x + offset, lo)
+        if lo == n:
+            break
+        if positions[lo] == x + offset:
+            result.append(x)
+    return result
+
+
+def union(lists: Iterable[Sequence[int]]) -> List[int]:
+    merged = set()
+    for ids in lists:
+        merged.update(ids)
+    return sorted(merged)
+
+
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+NEAR_RE = re.compile(r"NEAR(?:/(\d+))?$")
+# Words allowed between the two sides of a bare NEAR
+DEFAULT_NEAR_DISTANCE = 10
+# Positions decoded in one C-level pass per position decoded verse by verse (bisects,
+# slices): above this ratio, a phrase decodes its words' whole position lists instead
+VERSE_DECODE_COST = 64
+
+
+class Near(NamedTuple):
+    """Two phrases of the same verse with at most `distance` words between them, in either order."""
+    left: List[str]
+    right: List[str]
+    distance: int
+
+
+Alternative = Union[List[str], Near]
+
+
+def parse_query(query: str) -> List[List[Alternative]]:
+    """
+    'lumière ténèbres OR nuit "fils de l homme"' ->
+        [[["lumière"]], [["ténèbres"], ["nuit"]], [["fils", "de", "l", "homme"]]]
+
+    The result is an AND of clauses; each clause is an OR of alternatives;
+    an alternative is a phrase (one token = a plain word), or two phrases joined
+    by `NEAR/k` ('lumière NEAR/3 ténèbres' -> [[Near(["lumière"], ["ténèbres"], 3)]]).
+    """
+    clauses: List[List[Alternative]] = []
+    join_next = False
+    near_next = None
+    for quoted, word in QUERY_RE.findall(query or ""):
+        if word == "OR":
+            join_next = bool(clauses)
+            continue
+        near = NEAR_RE.match(word) if word else None
+        if near:
+            # Only a plain phrase can be the left side
+            if clauses and not isinstance(clauses[-1][-1], Near):
+                near_next = int(near.group(1)) if near.group(1) else DEFAULT_NEAR_DISTANCE
+            continue
+        tokens = tokenize(quoted if quoted else word)
+        if not tokens:
+            continue
+        # A quoted phrase, or a word ("l'homme" is two words, searched as a phrase)
+        if near_next is not None:
+            clauses[-1][-1] = Near(clauses[-1][-1], tokens, near_next)
+        elif join_next:
+            clauses[-1].append(tokens)
+        else:
+            clauses.append([tokens])
+        join_next = False
+        near_next = None
+    return clauses
+
+
+def query_terms(query: str, exact: bool = False) -> List[str]:
+    """Distinct words of `query` (folded unless `exact`), as matched against the index."""
+    words = []
+    for alternatives in parse_query(query):
+        for alternative in alternatives:
+            words.extend(alternative.left + alternative.right if isinstance(alternative, Near) else alternative)
+    return list(dict.fromkeys(words if exact else (fold(w) for w in words)))
+
+
+def highlight_spans(text: str, terms: Sequence[str], exact: bool = False) -> List[Tuple[int, int]]:
+    """(start, end) character offsets in `text` of the words among `terms` (see query_terms)."""
+    wanted = set(terms)
+    spans = []
+    for match in TOKEN_RE.finditer(text or ""):
+        token = match.group().lower()
+        if (token if exact else fold(token)) in wanted:
+            spans.append(match.span())
+    return spans
+
+
+class FullTextIndex:
+    """
+    The search indexes of every version, under `index_dir`.
+
+    An index is built from `provider.iter_verse_texts(version)` the first time its
+    version is searched, written to `<index_dir>/<VERSION>.idx`, and memory-mapped
+    from then on (`make search-index` rebuilds them all).
+    """
+
+    def __init__(self, index_dir: str, book_codes: Sequence[str], provider):
+        self.index_dir = index_dir
+        self.book_codes = list(book_codes)
+        self.provider = provider
+        self._indexes: Dict[str, SearchIndex] = {}
+        # Held while an index is opened or built, so a version is only built once
+        self._lock = threading.RLock()
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.index_dir, version.upper() + INDEX_SUFFIX)
+
+    def indexed_versions(self) -> List[str]:
+        """Versions with an index on disk."""
+        if not os.path.isdir(self.index_dir):
+            return []
+        return sorted(f[:-len(INDEX_SUFFIX)] for f in os.listdir(self.index_dir) if f.endswith(INDEX_SUFFIX))
+
+    def build(self, version: str) -> int:
+        """(Re)writes the index of `version`. Nothing is written for a version without verses."""
+        version = version.upper()
+        with self._lock:
+            rows = list(self.provider.iter_verse_texts(version) or [])
+            if not rows:
+                return 0
+            old = self._indexes.pop(version, None)
+            if old is not None:
+                old.close()
+            return write_search_index(self.path(version), version, self.book_codes, rows)
+
+    def _open(self, version: str) -> Optional[SearchIndex]:
+        path = self.path(version)
+        if not os.path.exists(path):
+            return None
+        try:
+            index = SearchIndex(path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not open search index {path}: {e}")
+            return None
+        if index.books != self.book_codes:
+            # Written for another book list: its ids would not decode
+            index.close()
+            return None
+        return index
+
+    def get(self, version: str) -> Optional[SearchIndex]:
+        """The index of `version`, built on first use. None if the version has no verses."""
+        version = version.upper()
+        index = self._indexes.get(version)
+        if index is not None:
+            return index
+        with self._lock:
+            if version not in self._indexes:
+                index = self._open(version)
+                if index is None and self.build(version):
+                    index = self._open(version)
+                if index is None:
+                    return None
+                self._indexes[version] = index
+            return self._indexes[version]
+
+    def _verses_with(self, index: SearchIndex, words: List[str], folded: bool) -> List[int]:
+        """Sorted ids of the verses holding every one of `words`: postings intersected, rarest first."""
+        lists = sorted((index.postings(t, folded) for t in set(words)), key=len)
+        ids = list(lists[0])
+        for other in lists[1:]:
+            if not ids:
+                break
+            ids = intersect(ids, other)
+        return ids
+
+    def _candidate_verses(self, index: SearchIndex, words: List[str], folded: bool) -> Optional[List[int]]:
+        """
+        The verses holding every one of `words` when some word is rare enough for decoding their
+        positions verse by verse to be cheaper than decoding every word's whole list, else None.
+        """
+        rarest = min(len(index.postings(t, folded)) for t in words)
+        whole = sum(index.position_count(t, folded) for t in set(words))
+        if rarest * len(words) * VERSE_DECODE_COST >= whole:
+            return None
+        return self._verses_with(index, words, folded)
+
+    def _phrase_starts(self, index: SearchIndex, phrase: List[str], folded: bool, verse_ids: Optional[List[int]] = None) -> List[int]:
+        """
+        Sorted positions where `phrase` starts. With `verse_ids` (see _candidate_verses), only
+        the positions of those verses are decoded; otherwise the rarest word's positions are
+        followed through the others' whole lists.
+        """
+        if verse_ids is None and len(phrase) > 1:
+            verse_ids = self._candidate_verses(index, phrase, folded)
+        if verse_ids is None:
+            return self._phrase_starts_everywhere(index, phrase, folded)
+        # Every word is looked for in the same verse: a phrase never runs over a verse end
+        per_word = [index.verse_positions(t, verse_ids, folded) for t in phrase]
+        if len(phrase) == 1:
+            return [p for verse in per_word[0] for p in verse]
+        starts = []
+        for j, firsts in enumerate(per_word[0]):
+            others = [set(positions[j]) for positions in per_word[1:]]
+            starts.extend(x for x in firsts if all(x + k in present for k, present in enumerate(others, 1)))
+        return starts
+
+    def _phrase_starts_everywhere(self, index: SearchIndex, phrase: List[str], folded: bool) -> List[int]:
+        positions = [index.positions(t, folded) for t in phrase]
+        if len(phrase) == 1:
+            return positions[0]
+        rarest = min(range(len(phrase)), key=lambda i: len(positions[i]))
+        starts = [p - rarest for p in positions[rarest]]
+        for i, term_positions in enumerate(positions):
+            if i != rarest and starts:
+                starts = follow(starts, term_positions, i)
+        # Words are numbered across verses: drop phrases running over a verse end
+        last = len(phrase) - 1
+        verse_starts = index.starts
+        return [x for x in starts if x >= 0 and verse_starts[index.verse_index(x) + 1] > x + last]
+
+    def _ids_at(self, index: SearchIndex, positions: Iterable[int]) -> List[int]:
+        """Ids of the verses holding sorted `positions`, deduplicated."""
+        ids = []
+        for p in positions:
+            verse_id = index.ids[index.verse_index(p)]
+            if not ids or ids[-1] != verse_id:
+                ids.append(verse_id)
+        return ids
+
+    def _near_ids(self, index: SearchIndex, near: Near, folded: bool) -> List[int]:
+        # Only the verses holding every word of both sides can match
+        verse_ids = self._candidate_verses(index, near.left + near.right, folded)
+        lefts = self._phrase_starts(index, near.left, folded, verse_ids)
+        rights = self._phrase_starts(index, near.right, folded, verse_ids)
+        left_len, right_len, k = len(near.left), len(near.right), near.distance
+        # Either order matches: walk the rarer side, bisecting into the other
+        if len(lefts) > len(rights):
+            lefts, rights, left_len, right_len = rights, lefts, right_len, left_len
+        verse_starts = index.starts
+        ids, n, i, verse, verse_end = [], len(rights), 0, 0, -1
+        for x in lefts:
+            if x < verse_end:
+                continue  # this verse already matched
+            # Both walks only move forward: bisect from where the previous left stopped
+            verse = bisect_right(verse_starts, x, verse) - 1
+            first, end = verse_starts[verse], verse_starts[verse + 1]
+            # A right phrase ending at most k words before x, or starting at most k words
+            # after the left one, within the same verse
+            hi = min(end - right_len, x + left_len + k)
+            i = bisect_left(rights, max(first, x - right_len - k), i)
+            if i == n:
+                break
+            if rights[i] <= hi:
+                ids.append(index.ids[verse])
+                verse_end = end
+        return ids
+
+    def _alternative_ids(self, index: SearchIndex, alternative: Alternative, folded: bool, scope: Optional[VerseScope] = None) -> List[int]:
+        if isinstance(alternative, Near):
+            ids = self._near_ids(index, alternative, folded)
+        elif len(alternative) == 1:
+            # Sliced straight out of the mapped postings: out-of-scope ids are never copied
+            postings = index.postings(alternative[0], folded)
+            return scope.restrict(postings) if scope else list(postings)
+        else:
+            ids = self._ids_at(index, self._phrase_starts(index, alternative, folded))
+        return scope.restrict(ids) if scope else ids
+
+    def search(self, query: str, version: str, exact: bool = False, scope: Optional[VerseScope] = None) -> List[int]:
+        """
+        Sorted ids of the verses of `version` matching `query` (see parse_query), within `scope`.
+        Matching ignores case and diacritics, unless `exact` (then only case is ignored).
+        Phrases and NEAR are matched on word positions; verse texts are never read.
+        """
+        version = version.upper()
+        clauses = parse_query(query)
+        index = self.get(version) if clauses else None
+        if index is None:
+            return []
+        folded = not exact
+        if folded:
+            def fold_alternative(alternative):
+                if isinstance(alternative, Near):
+                    return alternative._replace(left=[fold(t) for t in alternative.left], right=[fold(t) for t in alternative.right])
+                return [fold(t) for t in alternative]
+            clauses = [[fold_alternative(alt) for alt in alts] for alts in clauses]
+
+        def first_word(alternative):
+            return alternative.left[0] if isinstance(alternative, Near) else alternative[0]
+
+        result = None
+        # Rarest clauses first, so the running intersection stays small
+        for alternatives in sorted(clauses, key=lambda alts: sum(len(index.postings(first_word(a), folded)) for a in alts)):
+            if result is None:
+                # Only the first clause is scoped: every later one is intersected with it
+                ids = union(self._alternative_ids(index, alternative, folded, scope) for alternative in alternatives)
+            else:
+                ids = union(self._alternative_ids(index, alternative, folded) for alternative in alternatives)
+            result = ids if result is None else intersect(result, ids)
+            if not result:
+                return []
+        return result
+
+    def scores(self, query: str, version: str, verse_ids: Sequence[int], exact: bool = False) -> List[float]:
+        """
+        BM25 score of each of the sorted `verse_ids` for the words of `query`, from the
+        term frequencies and verse lengths stored in the index (no verse is read).
+        """
+        index = self.get(version)
+        if index is None or not verse_ids:
+            return [0.0] * len(verse_ids)
+        folded = not exact
+        n = index.verse_count
+        average = index.avg_length or 1.0
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in index.lengths(verse_ids)]
+        scores = [0.0] * len(verse_ids)
+        for term in query_terms(query, exact):
+            df = len(index.postings(term, folded))
+            if not df:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for k, tf in enumerate(index.term_frequencies(term, verse_ids, folded)):
+                if tf:
+                    scores[k] += idf * tf * (BM25_K1 + 1) / (tf + norms[k])
+        return scores
+
+    def search_verses(self, query: str, version: str, exact: bool = False) -> list:
+        """Verses of `version` matching `query`, in canonical order (BibleProvider.search)."""
+        verses = []
+        for verse_id in self.search(query, version, exact):
+            ordinal, chapter, verse = decode_verse_id(verse_id)
+            v_obj = self.provider.get_verse(self.book_codes[ordinal], chapter, verse, version.upper())
+            if v_obj:
+                verses.append(v_obj)
+        return verses
+
+    def close(self):
+        with self._lock:
+            for index in self._indexes.values():
+                index.close()
+            self._indexes = {}
@@ -0,0 +1,70 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Sequence
+
+from verse_id import VerseRange, book_span, merge_ranges
+
+# Search scopes: the verses a search is restricted to ("NT", "Pentateuch", "Rm 1-8").
+#
+# Canons, books and chapter ranges are contiguous intervals of packed verse ids, so a
+# scope is kept as a few sorted, disjoint id ranges. Restricting a sorted postings list
+# to it is two bisects per range and a slice, never a test per hit.
+
+# Named groups of books, by book code
+NAMED_SCOPES = {
+    "PENTATEUCH": ["GEN", "EXO", "LEV", "NUM", "DEU"],
+    "GOSPELS": ["MAT", "MRK", "LUK", "JHN"],
+}
+SCOPE_ALIASES = {
+    "AT": "OT", "NEWTESTAMENT": "NT", "OLDTESTAMENT": "OT",
+    "TORAH": "PENTATEUCH", "PENTATEUQUE": "PENTATEUCH",
+    "EVANGILES": "GOSPELS",
+    "DEUTEROCANONICAL": "APOCRYPHA", "DEUTEROCANONIQUES": "APOCRYPHA",
+}
+
+
+class VerseScope:
+    """A set of verses as sorted, disjoint VerseRanges of ids."""
+
+    def __init__(self, ranges: Iterable[VerseRange], label: str = ""):
+        self.ranges = merge_ranges(ranges)
+        self.label = label
+        self._starts = [r.start for r in self.ranges]
+
+    def __repr__(self):
+        return f"VerseScope({self.label!r}, {len(self.ranges)} range(s))"
+
+    def __contains__(self, verse_id: int) -> bool:
+        i = bisect_right(self._starts, verse_id) - 1
+        return i >= 0 and verse_id <= self.ranges[i].end
+
+    def restrict(self, ids: Sequence[int]) -> List[int]:
+        """The ids of sorted `ids` inside the scope, in order."""
+        result = []
+        for r in self.ranges:
+            lo = bisect_left(ids, r.start)
+            hi = bisect_right(ids, r.end, lo)
+            result.extend(ids[lo:hi])
+        return result
+
+
+def book_scope(normalizer, book_codes: Iterable[str], label: str = "") -> VerseScope:
+    """Every verse of `book_codes` (codes missing from bible_books.json are ignored)."""
+    ordinals = (normalizer.book_order.get(code) for code in book_codes)
+    return VerseScope([book_span(o) for o in ordinals if o is not None], label)
+
+
+def named_scope(normalizer, name: str) -> Optional[VerseScope]:
+    """
+    'NT', 'OT', 'Apocrypha' (from BookNormalizer's canon sets), 'Pentateuch' or 'Gospels'
+    -> VerseScope, or None if `name` is not a named scope. Case-insensitive.
+    """
+    key = name.strip().upper().replace(" ", "").replace("_", "")
+    key = SCOPE_ALIASES.get(key, key)
+    books = {
+        "NT": normalizer.NT_BOOKS,
+        "OT": normalizer.OT_BOOKS,
+        "APOCRYPHA": normalizer.APOCRYPHA_BOOKS,
+    }.get(key) or NAMED_SCOPES.get(key)
+    if not books:
+        return None
+    return book_scope(normalizer, books, key)
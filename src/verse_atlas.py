@@ -0,0 +1,84 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Tuple
+
+# (book_code, chapter, verse); verse 0 stands for "the whole chapter"
+VerseKey = Tuple[str, int, int]
+
+
+class VerseAtlas:
+    """
+    Which verses exist in one version: book -> chapters -> verse numbers.
+
+    Filled up front from `provider.list_verses(version)` when the provider can
+    enumerate its verses (Text-Fabric section index, verse store). Otherwise
+    chapters are discovered on demand with `get_chapter`.
+    """
+
+    def __init__(self, provider, version: str, normalizer):
+        self.provider = provider
+        self.version = version
+        self.normalizer = normalizer
+        # (book_code, chapter) -> sorted verse numbers
+        self._verses: Dict[Tuple[str, int], List[int]] = {}
+        # book_code -> sorted chapters (only when enumerated)
+        self._chapters: Dict[str, List[int]] = {}
+
+        listed = None
+        list_verses = getattr(provider, "list_verses", None)
+        if callable(list_verses):
+            listed = list_verses(version)
+        for book_code, chapter, verse in listed if isinstance(listed, list) else []:
+            self._verses.setdefault((book_code, chapter), []).append(verse)
+        for (book_code, chapter), verses in self._verses.items():
+            verses.sort()
+            self._chapters.setdefault(book_code, []).append(chapter)
+        for chapters in self._chapters.values():
+            chapters.sort()
+        self.complete = bool(self._verses)
+
+    def verses(self, book_code: str, chapter: int) -> List[int]:
+        key = (book_code, chapter)
+        if key not in self._verses:
+            if self.complete:
+                return []
+            self._verses[key] = [v.verse for v in self.provider.get_chapter(book_code, chapter, self.version)]
+        return self._verses[key]
+
+    def chapters(self, book_code: str, first: int = 1) -> Iterator[int]:
+        """Chapters of a book from `first` on, in order."""
+        if self.complete:
+            chapters = self._chapters.get(book_code, [])
+            yield from chapters[bisect_left(chapters, first):]
+            return
+        chapter = first
+        while self.verses(book_code, chapter):
+            yield chapter
+            chapter += 1
+
+    def iter_range(self, start: VerseKey, end: VerseKey) -> Iterator[VerseKey]:
+        """
+        Lazily yields every verse from `start` to `end` (inclusive) in canonical order,
+        across chapters and books. A verse of 0 in `start` or `end` means the whole chapter.
+        """
+        book_order = self.normalizer.book_order
+        start_book, start_chapter, start_verse = start
+        end_book, end_chapter, end_verse = end
+        first, last = book_order.get(start_book), book_order.get(end_book)
+        if first is None or last is None:
+            return
+
+        for ordinal in range(first, last + 1):
+            book_code = self.normalizer.book_codes[ordinal]
+            from_chapter = start_chapter if ordinal == first else 1
+            for chapter in self.chapters(book_code, from_chapter):
+                if ordinal == last and chapter > end_chapter:
+                    break
+                for verse in self.verses(book_code, chapter):
+                    if (ordinal, chapter) == (first, start_chapter) and verse < start_verse:
+                        continue
+                    if (ordinal, chapter) == (last, end_chapter) and end_verse and verse > end_verse:
+                        break
+                    yield (book_code, chapter, verse)
+
+    def __len__(self):
+        return sum(len(v) for v in self._verses.values())
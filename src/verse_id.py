@@ -0,0 +1,107 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Packed integer verse ids: book ordinal | chapter | verse in one int.
+#
+#   bits 20+    book ordinal (position in bible_books.json, see BookNormalizer.book_order)
+#   bits 10-19  chapter
+#   bits 0-9    verse
+#
+# Ids sort in canonical order (book, chapter, verse), so a chapter or a range
+# is a contiguous id interval.
+
+BOOK_SHIFT = 20
+CHAPTER_SHIFT = 10
+FIELD_MASK = (1 << 10) - 1
+
+
+def encode_verse_id(book_ordinal: int, chapter: int, verse: int) -> int:
+    return (book_ordinal << BOOK_SHIFT) | (chapter << CHAPTER_SHIFT) | verse
+
+
+def decode_verse_id(verse_id: int) -> Tuple[int, int, int]:
+    return verse_id >> BOOK_SHIFT, (verse_id >> CHAPTER_SHIFT) & FIELD_MASK, verse_id & FIELD_MASK
+
+
+class VerseRange(NamedTuple):
+    """Inclusive interval of verse ids. A single verse is VerseRange(id, id)."""
+    start: int
+    end: int
+
+    def __contains__(self, verse_id) -> bool:
+        return self.start <= verse_id <= self.end
+
+    @property
+    def is_single(self) -> bool:
+        return self.start == self.end
+
+    def overlaps(self, other: "VerseRange") -> bool:
+        return self.start <= other.end and other.start <= self.end
+
+
+def chapter_span(book_ordinal: int, chapter: int) -> VerseRange:
+    """Every id a verse of this chapter can have (verse 0 stands for the chapter itself)."""
+    return VerseRange(encode_verse_id(book_ordinal, chapter, 0), encode_verse_id(book_ordinal, chapter, FIELD_MASK))
+
+
+def book_span(book_ordinal: int) -> VerseRange:
+    return VerseRange(encode_verse_id(book_ordinal, 0, 0), encode_verse_id(book_ordinal + 1, 0, 0) - 1)
+
+
+def merge_ranges(ranges: Iterable[VerseRange]) -> List[VerseRange]:
+    """Sorted, non-overlapping union of `ranges` (adjacent ids are merged too)."""
+    merged = []
+    for r in sorted(ranges):
+        if merged and r.start <= merged[-1].end + 1:
+            if r.end > merged[-1].end:
+                merged[-1] = VerseRange(merged[-1].start, r.end)
+        else:
+            merged.append(VerseRange(r.start, r.end))
+    return merged
+
+
+def format_verse_key(verse_id: int, book_codes: Sequence[str]) -> Optional[str]:
+    """Verse id -> 'MRK.1.14'; `book_codes` lists book codes by ordinal."""
+    ordinal, chapter, verse = decode_verse_id(verse_id)
+    if ordinal >= len(book_codes):
+        return None
+    return f"{book_codes[ordinal]}.{chapter}.{verse}"
+
+
+def parse_verse_key(key: str, book_order: Dict[str, int]) -> Optional[int]:
+    """'MRK.1.14' -> verse id, or None if the book is unknown or the key is not BOOK.C.V."""
+    parts = key.strip().split(".")
+    if len(parts) != 3:
+        return None
+    ordinal = book_order.get(parts[0])
+    if ordinal is None or not parts[1].isdigit() or not parts[2].isdigit():
+        return None
+    return encode_verse_id(ordinal, int(parts[1]), int(parts[2]))
+
+
+def parse_target_range(target: str, book_order: Dict[str, int]) -> Optional[VerseRange]:
+    """
+    Cross-reference target -> VerseRange (start id, end id), both inclusive.
+    Handles 'MRK.7.3', 'MRK.7.3-4', 'MRK.7.3-8.1' and 'MRK.7.3-LUK.1.2'.
+    """
+    if "-" not in target:
+        start = parse_verse_key(target, book_order)
+        return VerseRange(start, start) if start is not None else None
+
+    start_s, end_s = target.split("-", 1)
+    start = parse_verse_key(start_s, book_order)
+    if start is None:
+        return None
+    ordinal, chapter, _ = decode_verse_id(start)
+
+    end_parts = end_s.strip().split(".")
+    end = None
+    if len(end_parts) == 1 and end_parts[0].isdigit():
+        end = encode_verse_id(ordinal, chapter, int(end_parts[0]))
+    elif len(end_parts) == 2 and all(p.isdigit() for p in end_parts):
+        end = encode_verse_id(ordinal, int(end_parts[0]), int(end_parts[1]))
+    elif len(end_parts) == 3:
+        end = parse_verse_key(end_s, book_order)
+
+    if end is None or end < start:
+        return None
+    return VerseRange(start, end)
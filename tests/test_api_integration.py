@@ -1,3 +1,4 @@
+import json
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,9 +9,9 @@ import os
 # Ensure src is in path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from api.main import app, get_service
+from api.main import app, get_service, get_adapter
 from application.services import BibleService
-from domain.models import Verse, Language
+from domain.models import Verse, Language, DatasetState, DatasetStatus
 
 # Mock Data
 def create_mock_verse(book, version, text, lang):
@@ -88,6 +89,9 @@ def mock_adapter():
 def mock_ref_db():
     db = MagicMock()
     db.in_memory_refs = {}
+    db.get_index.side_effect = lambda **kwargs: db.in_memory_refs
+    db.reverse_refs = {}
+    db.get_reverse_index.side_effect = lambda **kwargs: db.reverse_refs
     return db
 
 @pytest.fixture
@@ -102,10 +106,42 @@ def client(bible_service):
     app.dependency_overrides[get_service] = lambda: bible_service
     return TestClient(app)
 
-def test_health_check(client):
+@pytest.fixture
+def dataset_states():
+    states = {name: DatasetState(name=name) for name in ["n1904", "lxx", "bhsa", "tob", "bj", "nav"]}
+    adapter = MagicMock()
+    adapter.dataset_states.side_effect = lambda: dict(states)
+    app.dependency_overrides[get_adapter] = lambda: adapter
+    yield states
+    app.dependency_overrides.pop(get_adapter, None)
+
+def test_health_check(client, dataset_states, monkeypatch):
+    monkeypatch.delenv("SCRIPTURES_WARMUP", raising=False)
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["datasets"]["tob"] == {"status": "not_loaded", "load_seconds": None, "error": None}
+
+def test_health_waits_for_warmup(client, dataset_states, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_WARMUP", "N1904,TOB")
+    dataset_states["n1904"] = DatasetState(name="n1904", status=DatasetStatus.READY, load_seconds=2.5)
+    dataset_states["tob"] = DatasetState(name="tob", status=DatasetStatus.LOADING)
+    
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+    assert response.json()["datasets"]["n1904"]["load_seconds"] == 2.5
+    
+    dataset_states["tob"] = DatasetState(name="tob", status=DatasetStatus.READY, load_seconds=1.0)
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    
+    dataset_states["tob"] = DatasetState(name="tob", status=DatasetStatus.FAILED, error="missing")
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "degraded"
 
 def test_search_basic(client):
     # Use NT for English default expectation
@@ -153,6 +189,23 @@ def test_french_version_selection(client, mock_adapter):
     combined_versions = {data["verses"][0]["primary"]["version"]} | {p["version"] for p in data["verses"][0]["parallels"]}
     assert "BJ" in combined_versions
 
+def test_search_range_reads_each_chapter_once(bible_service, mock_adapter):
+    def get_chapter_side_effect(book, chapter, version):
+        lang = Language.FRENCH if version == "TOB" else Language.GREEK
+        return [
+            Verse(book_code=book, chapter=chapter, verse=v, text=f"{version} {v}", language=lang, version=version)
+            for v in range(1, 6)
+        ]
+    mock_adapter.get_chapter.side_effect = get_chapter_side_effect
+    
+    response = bible_service.search("Jn 1:1-3")
+    
+    assert [item.primary.verse for item in response.verses] == [1, 2, 3]
+    assert [p.text for p in response.verses[2].parallels] == ["TOB 3"]
+    # One bulk read per version (N1904 primary, TOB parallel), no point lookups
+    assert sorted(call.args[2] for call in mock_adapter.get_chapter.call_args_list) == ["N1904", "TOB"]
+    mock_adapter.get_verse.assert_not_called()
+
 def test_search_crossref_simple(client, mock_ref_db):
     mock_ref_db.in_memory_refs = {
         "Genesis.1.1": {
@@ -191,15 +244,110 @@ def test_search_crossref_full(client, mock_ref_db, mock_adapter):
     rel = data["cross_references"]["relations"][0]
     assert rel["text"] is not None
 
+def test_search_crossref_direction(client, mock_ref_db):
+    mock_ref_db.in_memory_refs = {
+        "Genesis.1.1": {"relations": [{"target": "Jn 1:1", "type": "parallel"}], "notes": []}
+    }
+    mock_ref_db.reverse_refs = {
+        "Genesis.1.1": [{"source": "Hb 11:3", "target": "Genesis.1.1", "type": "allusion", "note": None}]
+    }
+    
+    data = client.get("/api/v1/search?q=Gn 1:1&crossref=true&direction=incoming").json()
+    relations = data["cross_references"]["relations"]
+    assert [(r["target_ref"], r["direction"]) for r in relations] == [("Hb 11:3", "incoming")]
+    
+    data = client.get("/api/v1/search?q=Gn 1:1&crossref=true&direction=both").json()
+    relations = data["cross_references"]["relations"]
+    assert [r["direction"] for r in relations] == ["outgoing", "incoming"]
+    
+    response = client.get("/api/v1/search?q=Gn 1:1&crossref=true&direction=sideways")
+    assert response.status_code == 422
+
 def test_search_crossref_source_filter(client, bible_service):
-    with patch.object(bible_service.ref_db, 'load_all') as mock_load:
+    with patch.object(bible_service.ref_db, 'get_index', return_value={}) as mock_index:
          client.get("/api/v1/search?q=Gn 1:1&crossref=true&crossref_source=BJ")
-         mock_load.assert_called_with(source_filter="BJ", scope='ot')
+         mock_index.assert_called_with(source_filter="BJ", scope='ot')
+
+def test_crossref_graph(client, bible_service, mock_ref_db, mock_adapter):
+    from reference_graph import ReferenceGraph
+    from book_normalizer import BookNormalizer
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    normalizer = BookNormalizer(os.path.join(project_root, "data"))
+    bible_service.normalizer = normalizer
+    mock_adapter.normalize_reference.side_effect = lambda ref: ("MRK", 1, 1)
+    mock_ref_db.get_graph.side_effect = lambda **kwargs: ReferenceGraph.from_index({
+        "MRK.1.1": {"relations": [{"target": "MRK.1.14", "type": "parallel"}, {"target": "ISA.40.3", "type": "quotation"}]},
+        "MRK.1.14": {"relations": [{"target": "MAT.4.12", "type": "parallel"}]},
+    }, normalizer.book_order)
+    
+    data = client.get("/api/v1/crossref/graph?q=Mc 1:1&depth=2&type=parallel").json()
+    assert data["reference"] == "MRK.1.1"
+    assert [(n["ref"], n["depth"], n["via"]) for n in data["nodes"]] == [("MRK.1.14", 1, "MRK.1.1"), ("MAT.4.12", 2, "MRK.1.14")]
+    
+    assert client.get("/api/v1/crossref/graph?q=Mc 1:1&depth=0").status_code == 422
+
+def test_fulltext_endpoint(client, bible_service):
+    from domain.models import SearchResponse, SearchHit
+    hit = SearchHit(ref="John 1:1", ref_localized="Jean 1:1", verse=MOCK_VERSES["TOB_NT"])
+    bible_service.fulltext = MagicMock(return_value=SearchResponse(query="Verbe", versions=["TOB"], total=7, hits=[hit]))
+    
+    data = client.get("/api/v1/fulltext?q=Verbe&version=TOB&limit=1").json()
+    assert data["total"] == 7
+    assert data["hits"][0]["ref_localized"] == "Jean 1:1"
+    bible_service.fulltext.assert_called_once_with("Verbe", versions=["TOB"], limit=1, exact=False, scope=None, order="relevance", parallels=None, cursor=None)
+    
+    assert client.get("/api/v1/fulltext?q=Verbe&limit=0").status_code == 422
+
+def test_cache_stats_endpoint(client, bible_service):
+    bible_service.ref_db.cache_stats.return_value = {"hits": 0, "misses": 1, "file_reloads": 1}
+    assert client.get("/api/v1/search?q=Jn 1:1").status_code == 200
+    assert client.get("/api/v1/search?q=Jn 1:1").status_code == 200
+    
+    data = client.get("/api/v1/cache").json()
+    assert data["search"]["hits"] == 1
+    assert data["search"]["misses"] == 1
+    assert data["search"]["size"] == 1
+    assert data["references"]["misses"] == 1
+
+def test_search_stream_ndjson(client, mock_adapter):
+    def get_chapter_side_effect(book, chapter, version):
+        return [
+            Verse(book_code=book, chapter=chapter, verse=v, text=f"{version} {chapter}:{v}", language=Language.GREEK, version=version)
+            for v in range(1, 6)
+        ]
+    mock_adapter.get_chapter.side_effect = get_chapter_side_effect
+    
+    response = client.get("/api/v1/search/stream?q=Jn 1:1-2")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["ref"] for line in lines] == ["John 1:1", "John 1:2"]
+    assert lines[1]["primary"]["text"] == "N1904 1:2"
 
 def test_search_invalid_ref(client, mock_adapter):
     mock_adapter.normalize_reference.return_value = None
-    try:
-        response = client.get("/api/v1/search?q=InvalidRef")
-        assert response.status_code in [400, 422, 500]
-    except Exception:
-        pass
+    response = client.get("/api/v1/search?q=InvalidRef")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid reference 'InvalidRef'"
+    assert client.get("/api/v1/search/stream?q=InvalidRef").status_code == 400
+
+def test_service_is_shared_across_requests(monkeypatch):
+    from application.services import ServiceFactory, AdapterFactory
+    monkeypatch.setattr(ServiceFactory, "_service", None)
+    monkeypatch.setattr(AdapterFactory, "get", classmethod(lambda cls: MagicMock(data_dir="/tmp/mock_data")))
+    
+    service = get_service()
+    assert get_service() is service
+    assert service.ref_db is get_service().ref_db
+
+def test_morphology_endpoint(client, bible_service):
+    from domain.models import SearchResponse, SearchHit
+    hit = SearchHit(ref="John 1:1", ref_localized="Jean 1:1", verse=MOCK_VERSES["TOB_NT"], matches=["λόγος"])
+    bible_service.morphology = MagicMock(return_value=SearchResponse(query="λόγος", versions=["N1904"], total=1, hits=[hit]))
+    
+    data = client.get("/api/v1/morphology?q=λόγος case=nominative").json()
+    assert data["hits"][0]["matches"] == ["λόγος"]
+    bible_service.morphology.assert_called_once_with("λόγος case=nominative", version=None, limit=100)
+    
+    bible_service.morphology = MagicMock(side_effect=ValueError("Unknown book 'X'"))
+    assert client.get("/api/v1/morphology?q=book=X").status_code == 400
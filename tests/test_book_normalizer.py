@@ -103,3 +103,10 @@ def test_normalization_spaces_in_book_names(normalizer):
     assert res is not None
     assert res[0] == "1SA"
 
+
+def test_range_label(normalizer):
+    span = lambda target: normalizer.parse_range(target)
+    assert normalizer.range_label(span("MRK.7.3")) == "Marc 7:3"
+    assert normalizer.range_label(span("MRK.7.3-4")) == "Marc 7:3-4"
+    assert normalizer.range_label(span("MRK.7.3-8.1")) == "Marc 7:3-8:1"
+    assert normalizer.range_label(span("MRK.16.8-LUK.1.2")) == "Marc 16:8-Luc 1:2"
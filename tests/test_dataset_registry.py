@@ -0,0 +1,101 @@
+import time
+import threading
+import pytest
+from unittest.mock import MagicMock
+from adapters.dataset_registry import DatasetRegistry, parse_dataset_list, silenced_stdout
+from adapters.text_fabric_adapter import TextFabricAdapter
+from domain.models import DatasetStatus
+
+def run_concurrently(fn, n=8):
+    barrier = threading.Barrier(n)
+    results = []
+    def worker():
+        barrier.wait()
+        results.append(fn())
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return results
+
+def test_single_flight_load():
+    registry = DatasetRegistry(["tob"])
+    calls = []
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+    
+    results = run_concurrently(lambda: registry.load("tob", loader))
+    
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    state = registry.state("tob")
+    assert state.status == DatasetStatus.READY
+    assert state.load_seconds >= 0.05
+
+def test_failed_load_is_recorded_and_retried():
+    registry = DatasetRegistry(["bj"])
+    assert registry.state("bj").status == DatasetStatus.NOT_LOADED
+    
+    def broken():
+        raise RuntimeError("corrupt dataset")
+    assert registry.load("bj", broken) is None
+    state = registry.state("bj")
+    assert state.status == DatasetStatus.FAILED
+    assert state.error == "corrupt dataset"
+    
+    assert registry.load("bj", lambda: None) is None
+    assert registry.state("bj").error == "dataset not available"
+    
+    value = object()
+    assert registry.load("bj", lambda: value) is value
+    assert registry.is_ready("bj")
+
+def test_adapter_loads_each_dataset_once():
+    adapter = TextFabricAdapter(data_dir="/tmp/mock_data")
+    calls = []
+    def provider():
+        calls.append(1)
+        time.sleep(0.05)
+        return MagicMock()
+    adapter._tob_provider = provider
+    
+    results = run_concurrently(lambda: adapter.tob)
+    
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    states = adapter.dataset_states()
+    assert set(states) == {"n1904", "lxx", "bhsa", "tob", "bj", "nav"}
+    assert states["tob"].status == DatasetStatus.READY
+    assert states["n1904"].status == DatasetStatus.NOT_LOADED
+
+def test_parse_dataset_list():
+    assert parse_dataset_list("N1904,BHSA,TOB") == ["n1904", "bhsa", "tob"]
+    assert parse_dataset_list(" n1904_en , N1904, nav, unknown") == ["n1904", "nav"]
+    assert parse_dataset_list("all") == ["n1904", "lxx", "bhsa", "tob", "bj", "nav"]
+    assert parse_dataset_list(None) == []
+
+def test_warm_up_loads_in_parallel():
+    adapter = TextFabricAdapter(data_dir="/tmp/mock_data")
+    barrier = threading.Barrier(2, timeout=5)
+    def provider():
+        # Both loads must be in flight at the same time to pass the barrier
+        barrier.wait()
+        return MagicMock()
+    adapter._tob_provider = provider
+    adapter._bj_provider = provider
+    
+    states = adapter.warm_up(["tob", "bj"])
+    
+    assert {name: s.status for name, s in states.items()} == {"tob": DatasetStatus.READY, "bj": DatasetStatus.READY}
+
+def test_silenced_stdout_is_restored_after_parallel_use():
+    import sys
+    original = sys.stdout
+    def quiet_print():
+        with silenced_stdout():
+            time.sleep(0.01)
+            print("hidden")
+        return sys.stdout
+    run_concurrently(quiet_print)
+    assert sys.stdout is original
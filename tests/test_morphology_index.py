@@ -0,0 +1,140 @@
+import pytest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from domain.models import Verse, Language
+from morphology_index import parse_morph_query, write_morphology_index, MorphologyIndex, MorphologyIndexes
+from search_scope import book_scope
+from application.services import BibleService
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+def word(form, lemma, **features):
+    return dict(form=form, lemma=lemma, **features)
+
+WORDS = {
+    "N1904": [
+        ("MAT", 16, 19, word("λελυμένα", "λύω", sp="verb", tense="perfect", voice="passive", mood="participle")),
+        ("LUK", 13, 16, word("λυθῆναι", "λύω", sp="verb", tense="aorist", voice="passive", mood="infinitive")),
+        ("LUK", 19, 31, word("λύετε", "λύω", sp="verb", tense="present", voice="active", mood="indicative")),
+        ("LUK", 19, 33, word("λυόντων", "λύω", sp="verb", tense="present", voice="active", mood="participle")),
+        ("ACT", 22, 30, word("ἔλυσεν", "λύω", sp="verb", tense="aorist", voice="active", mood="indicative")),
+        ("ACT", 22, 30, word("λυθέντα", "λύω", sp="verb", tense="aorist", voice="passive", mood="participle")),
+        ("ACT", 22, 30, word("λόγος", "λόγος", sp="noun", case="nominative")),
+    ],
+    "BHSA": [
+        ("GEN", 1, 1, word("בָּרָ֣א", "ברא", sp="verb", stem="qal", tense="perf")),
+        ("GEN", 1, 1, word("אֱלֹהִ֑ים", "אלהים", sp="subs")),
+    ],
+}
+
+@pytest.fixture
+def normalizer():
+    return BookNormalizer(DATA_DIR)
+
+@pytest.fixture
+def index_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+def make_provider(normalizer):
+    provider = MagicMock()
+    provider.normalizer = normalizer
+    provider.data_dir = DATA_DIR
+
+    def normalize_reference(ref):
+        res = normalizer.normalize_reference(ref)
+        return res[:3] if res else None
+    provider.normalize_reference.side_effect = normalize_reference
+    provider.iter_words.side_effect = lambda version: iter(WORDS.get(version, []))
+
+    def get_chapter(book, chapter, version):
+        verses = sorted({(b, c, v) for b, c, v, _ in WORDS.get(version, []) if (b, c) == (book, chapter)})
+        return [Verse(book_code=b, chapter=c, verse=v, text=f"{version} {b} {c}:{v}", language=Language.GREEK, version=version)
+                for b, c, v in verses]
+    provider.get_chapter.side_effect = get_chapter
+    provider.get_verse.side_effect = lambda b, c, v, version: next((x for x in get_chapter(b, c, version) if x.verse == v), None)
+    return provider
+
+def test_parse_morph_query():
+    assert parse_morph_query("λύω tense=aorist voice=passive mood=participle book=Lk") == (
+        {"lemma": ["λύω"], "tense": ["aorist"], "voice": ["passive"], "mood": ["participle"]}, "Lk"
+    )
+    assert parse_morph_query("pos=verb,noun") == ({"sp": ["verb", "noun"]}, None)
+    with pytest.raises(ValueError):
+        parse_morph_query("color=red")
+
+def test_index_roundtrip(normalizer, index_dir):
+    path = os.path.join(index_dir, "N1904.morph")
+    assert write_morphology_index(path, "N1904", normalizer.book_codes, WORDS["N1904"]) == 7
+    index = MorphologyIndex(path)
+    try:
+        assert len(index) == 7
+        assert index.value("form", 5) == "λυθέντα"
+        # Lemma lookups ignore accents and case
+        assert index.value_codes("lemma", "ΛΥΩ") == index.value_codes("lemma", "λύω") != []
+        assert index.match({"lemma": ["λυω"], "tense": ["aorist"]}) == [1, 4, 5]
+        assert index.match({"mood": ["participle"]}) == [0, 3, 5]
+        assert index.match({"lemma": ["absent"]}) == []
+    finally:
+        index.close()
+
+def test_books_out_of_canonical_order(normalizer, index_dir):
+    # BHSA stores its books in BHS order (Kings before Isaiah, Ruth among the Writings)
+    words = [
+        ("2KI", 2, 11, word("וַיַּ֣עַל", "עלה", sp="verb")),
+        ("ISA", 6, 1, word("וָאֶרְאֶ֥ה", "ראה", sp="verb")),
+        ("ISA", 6, 1, word("אֲדֹנָ֛י", "אדני", sp="subs")),
+        ("PSA", 23, 1, word("רֹעִ֗י", "רעה", sp="verb")),
+        ("RUT", 1, 16, word("תֵּלְכִ֜י", "הלך", sp="verb")),
+    ]
+    path = os.path.join(index_dir, "BHSA.morph")
+    assert write_morphology_index(path, "BHSA", normalizer.book_codes, words) == 5
+    index = MorphologyIndex(path)
+    try:
+        assert [index.value("form", i) for i in range(len(index))] == [
+            "תֵּלְכִ֜י", "וַיַּ֣עַל", "רֹעִ֗י", "וָאֶרְאֶ֥ה", "אֲדֹנָ֛י"
+        ]
+        assert index.match({"sp": ["verb"]}) == [0, 1, 2, 3]
+        assert index.match({"lemma": ["אדני"]}) == [4]
+    finally:
+        index.close()
+
+def test_search_scoped_to_book(normalizer, index_dir):
+    indexes = MorphologyIndexes(index_dir, normalizer.book_codes, make_provider(normalizer))
+    features, _ = parse_morph_query("λύω voice=passive")
+    keys = lambda hits: [(normalizer.verse_key(i), forms) for i, forms in hits]
+
+    assert keys(indexes.search(features, "N1904")) == [
+        ("MAT.16.19", ["λελυμένα"]), ("LUK.13.16", ["λυθῆναι"]), ("ACT.22.30", ["λυθέντα"])
+    ]
+    assert keys(indexes.search(features, "N1904", book_scope(normalizer, ["LUK"]))) == [("LUK.13.16", ["λυθῆναι"])]
+    assert keys(indexes.search(features, "N1904", book_scope(normalizer, ["ACT", "MAT"]))) == [
+        ("MAT.16.19", ["λελυμένα"]), ("ACT.22.30", ["λυθέντα"])
+    ]
+    # Versions without word features have no index
+    assert indexes.search(features, "TOB") == []
+
+def test_service_morphology(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+
+    response = service.morphology("λύω tense=aorist voice=passive mood=participle book=Ac")
+    assert response.versions == ["N1904"]
+    assert response.total == 1
+    assert response.hits[0].ref == "ACT 22:30"
+    assert response.hits[0].matches == ["λυθέντα"]
+
+    # Old Testament books and Hebrew lemmas default to BHSA
+    assert service.morphology("ברא").hits[0].ref == "GEN 1:1"
+    assert service.morphology("sp=verb book=Gn").versions == ["BHSA"]
+
+    with pytest.raises(ValueError):
+        service.morphology("book=Lk")
+    assert service.morphology("λύω voice=passive scope=Gospels").total == 2
+    with pytest.raises(ValueError):
+        service.morphology("λύω book=Nowhere")
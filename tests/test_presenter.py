@@ -57,3 +57,28 @@ def test_present_verse_parallels_prefixes(presenter, capsys):
     assert "[BJ]" not in captured.out
     
     assert "Hebrew" in captured.out
+
+def test_present_search_hit(presenter, capsys):
+    from domain.models import SearchHit
+    v = Verse(book_code="MRK", chapter=1, verse=1, text="Commencement de l'Évangile", language=Language.FRENCH, version="TOB")
+    presenter.present_search_hit(SearchHit(ref="MRK 1:1", ref_localized="Marc 1:1", verse=v))
+    presenter.present_search_summary("évangile", total=3, shown=1, versions=["TOB"])
+    out = capsys.readouterr().out
+    assert "Marc 1:1 (TOB)" in out
+    assert "Commencement de l'Évangile" in out
+    assert "3 result(s) for 'évangile' in TOB, showing the first 1" in out
+
+def test_present_search_hit_highlights(presenter, capsys):
+    from domain.models import SearchHit, TextSpan
+    v = Verse(book_code="GEN", chapter=1, verse=3, text="Que la lumière soit", language=Language.FRENCH, version="TOB")
+    presenter.present_search_hit(SearchHit(ref="GEN 1:3", verse=v, highlights=[TextSpan(start=7, end=14)]), compact_mode=1)
+    assert "Que la lumière soit" in capsys.readouterr().out
+
+def test_present_search_hit_json(presenter, capsys):
+    import json
+    from domain.models import SearchHit
+    v = Verse(book_code="GEN", chapter=1, verse=3, text="Que la lumière soit", language=Language.FRENCH, version="TOB")
+    presenter.present_search_hit_json(SearchHit(ref="GEN 1:3", verse=v))
+    presenter.present_search_hit_json(SearchHit(ref="GEN 1:5", verse=v))
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["ref"] for line in lines] == ["GEN 1:3", "GEN 1:5"]
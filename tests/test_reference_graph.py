@@ -0,0 +1,71 @@
+import pytest
+import os
+from reference_graph import ReferenceGraph
+from book_normalizer import BookNormalizer
+from verse_id import parse_verse_key
+
+@pytest.fixture
+def book_order():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return BookNormalizer(os.path.join(project_root, 'data')).book_order
+
+@pytest.fixture
+def graph(book_order):
+    index = {
+        "MRK.1.1": {"notes": [], "relations": [
+            {"target": "MRK.1.14", "type": "parallel"},
+            {"target": "ISA.40.3-5", "type": "quotation"},
+        ]},
+        "MRK.1.14": {"notes": [], "relations": [{"target": "MAT.4.12", "type": "parallel"}]},
+        "ISA.40.3": {"notes": [], "relations": [
+            {"target": "JHN.1.23", "type": "quotation"},
+            {"target": "MRK.1.1", "type": "allusion"},
+        ]},
+        "MAT.4.12": {"notes": [], "relations": [{"target": "LUK.4.14", "type": "parallel"}]},
+    }
+    return ReferenceGraph.from_index(index, book_order)
+
+def ids(book_order, *keys):
+    return [parse_verse_key(k, book_order) for k in keys]
+
+def test_csr_layout(graph):
+    assert len(graph) == 6
+    assert graph.edge_count == 6
+    assert len(graph.offsets) == len(graph) + 1
+    assert list(graph.nodes) == sorted(graph.nodes)
+
+def test_traverse_by_depth(graph, book_order):
+    reached, truncated = graph.traverse(parse_verse_key("MRK.1.1", book_order), max_depth=1)
+    assert sorted(r[0] for r in reached) == sorted(ids(book_order, "MRK.1.14", "ISA.40.3"))
+    assert {r[1] for r in reached} == {1}
+    assert not truncated
+
+    reached, _ = graph.traverse(parse_verse_key("MRK.1.1", book_order), max_depth=2)
+    depth_two = {r[0]: r for r in reached if r[1] == 2}
+    assert sorted(depth_two) == sorted(ids(book_order, "MAT.4.12", "JHN.1.23"))
+    # The start verse is never reported, even when a cycle leads back to it
+    assert parse_verse_key("MRK.1.1", book_order) not in [r[0] for r in reached]
+    assert depth_two[parse_verse_key("JHN.1.23", book_order)][2:] == (parse_verse_key("ISA.40.3", book_order), "quotation")
+
+def test_traverse_filters_types_and_limits(graph, book_order):
+    start = parse_verse_key("MRK.1.1", book_order)
+    reached, _ = graph.traverse(start, max_depth=5, rel_types=["parallel"])
+    assert [r[0] for r in reached] == ids(book_order, "MRK.1.14", "MAT.4.12", "LUK.4.14")
+
+    reached, truncated = graph.traverse(start, max_depth=5, max_results=2)
+    assert len(reached) == 2
+    assert truncated
+
+    # Exactly as many verses as the limit: nothing was left out
+    reached, truncated = graph.traverse(start, max_depth=5, max_results=3, rel_types=["parallel"])
+    assert len(reached) == 3
+    assert not truncated
+    reached, truncated = graph.traverse(start, max_depth=1, max_results=2)
+    assert len(reached) == 2
+    assert not truncated
+    # One more would have been found
+    _, truncated = graph.traverse(start, max_depth=2, max_results=3)
+    assert truncated
+
+def test_traverse_unknown_verse(graph, book_order):
+    assert graph.traverse(parse_verse_key("GEN.1.1", book_order)) == ([], False)
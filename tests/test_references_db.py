@@ -3,8 +3,9 @@ import os
 import json
 import shutil
 import tempfile
-from references_db import ReferenceDatabase
+from references_db import ReferenceDatabase, ReverseReferenceIndex
 from book_normalizer import BookNormalizer
+from verse_id import chapter_span, VerseRange
 
 @pytest.fixture
 def temp_data_dir():
@@ -97,3 +98,116 @@ def test_get_references_by_book(db, temp_data_dir):
     mat_refs = db.get_references("MAT")
     assert "MAT.1.1" in mat_refs
     assert "JHN.1.1" not in mat_refs
+
+def test_get_index_is_built_once_per_scope_and_source(db, temp_data_dir):
+    db.add_relation("mine", "Jn 1:1", "Gn 1:1")
+    db.add_relation("mine", "Gn 1:1", "Jn 1:1")
+    
+    nt_index = db.get_index(scope='nt')
+    assert "JHN.1.1" in nt_index
+    assert "GEN.1.1" not in nt_index
+    assert db.get_index(scope='nt') is nt_index
+    assert "GEN.1.1" in db.get_index(scope='ot')
+    assert db.get_index(source_filter='other', scope='nt') == {}
+    
+    # Adding a relation invalidates the shared indexes
+    db.add_relation("mine", "Jn 1:1", "Mt 1:1")
+    refreshed = db.get_index(scope='nt')
+    assert refreshed is not nt_index
+    assert len(refreshed["JHN.1.1"]["relations"]) == 2
+
+def test_get_index_reloads_only_changed_files(db, temp_data_dir):
+    db.add_relation("a", "Jn 1:1", "Gn 1:1")
+    db.add_relation("b", "Jn 1:1", "Mt 1:1")
+    
+    index = db.get_index(scope='nt')
+    assert len(index["JHN.1.1"]["relations"]) == 2
+    assert db.cache_stats() == {"hits": 0, "misses": 1, "file_reloads": 2}
+    
+    db.get_index(scope='nt')
+    assert db.cache_stats()["hits"] == 1
+    
+    # Rewrite one file behind the database's back
+    path = os.path.join(temp_data_dir, "references_nt_b.json")
+    with open(path, "w") as f:
+        json.dump({"cross_references": [{"source": "JHN.1.2", "relations": [{"target": "GEN.1.2", "type": "other"}]}]}, f)
+    
+    index = db.get_index(scope='nt')
+    assert "JHN.1.2" in index
+    assert len(index["JHN.1.1"]["relations"]) == 1
+    assert db.cache_stats() == {"hits": 1, "misses": 2, "file_reloads": 3}
+    
+    # Removed files drop out of the index
+    os.remove(path)
+    assert "JHN.1.2" not in db.get_index(scope='nt')
+
+def test_reverse_index_finds_incoming_relations(db, temp_data_dir):
+    db.add_relation("mine", "Jn 1:1", "Gn 1:1")
+    db.add_relation("mine", "Mt 1:1", "Gn 1:1", "allusion")
+    with open(os.path.join(temp_data_dir, "references_nt_ranges.json"), "w") as f:
+        json.dump({"cross_references": [{"source": "ROM.1.1", "relations": [{"target": "GEN.1.1-3", "type": "parallel"}]}]}, f)
+    
+    incoming = db.get_reverse_index(scope='nt').get("GEN.1.1")
+    assert {r["source"] for r in incoming} == {"JHN.1.1", "MAT.1.1", "ROM.1.1"}
+    
+    # Inside a target range only
+    assert [r["source"] for r in db.get_reverse_index().get("GEN.1.2")] == ["ROM.1.1"]
+    assert db.get_reverse_index().get("GEN.1.4") is None
+
+def test_graph_is_rebuilt_with_the_index(db):
+    db.add_relation("mine", "Jn 1:1", "Gn 1:1")
+    graph = db.get_graph()
+    assert db.get_graph() is graph
+    assert graph.edge_count == 1
+    
+    db.add_relation("mine", "Gn 1:1", "Ps 33:6")
+    assert db.get_graph() is not graph
+    assert db.get_graph().edge_count == 2
+
+def test_revision_changes_with_files(db, temp_data_dir):
+    before = db.revision()
+    db.add_relation("personal", "John 1:1", "Gen 1:1", "parallel")
+    after_add = db.revision()
+    assert after_add != before
+    assert db.revision() == after_add
+    os.remove(os.path.join(temp_data_dir, "references_nt_personal.json"))
+    assert db.revision() != after_add
+
+def test_targets_are_parsed_when_files_are_read(db, temp_data_dir):
+    with open(os.path.join(temp_data_dir, "references_nt_ranges.json"), "w") as f:
+        json.dump({"cross_references": [{"source": "ROM.1.1", "relations": [
+            {"target": "GEN.1.1-3", "type": "parallel"}, {"target": "see below", "type": "other"}
+        ]}]}, f)
+    parsed, unparsed = [r.get("parsed") for r in db.get_index()["ROM.1.1"]["relations"]]
+    assert parsed.range == db.normalizer.parse_range("GEN.1.1-3")
+    assert parsed.label == "Genèse 1:1-3"
+    assert parsed.sort_key == parsed.range.start
+    assert unparsed is None
+    # Incoming relations carry their parsed source
+    assert db.get_reverse_index().get("GEN.1.2")[0]["parsed_source"].label == "Romains 1:1"
+
+def test_get_range_scans_sources_of_a_chapter(db, temp_data_dir):
+    db.add_relation("mine", "Mc 1:3", "Is 40:3", "quotation")
+    db.add_relation("mine", "Mc 1:1", "Gn 1:1")
+    db.add_relation("mine", "Mc 2:1", "Mt 9:1", "parallel")
+    chapter = chapter_span(db.normalizer.book_order["MRK"], 1)
+    found = db.get_range(chapter, scope='nt')
+    assert [key for _, key, _ in found] == ["MRK.1.1", "MRK.1.3"]
+    assert found[1][2]["relations"][0]["target"] == "ISA.40.3"
+    # Incoming relations overlapping the chapter, with their target range
+    assert [(r.start, e["source"]) for r, e in db.get_reverse_index().overlapping(chapter_span(db.normalizer.book_order["ISA"], 40))] == [
+        (db.normalizer.verse_id("ISA", 40, 3), "MRK.1.3")
+    ]
+
+def test_long_target_does_not_widen_incoming_lookups(db):
+    index = {"MRK.1.1": {"notes": [], "relations": [
+        {"target": f"GEN.{c}.{v}", "type": "other"} for c in range(1, 51) for v in range(1, 21)
+    ]}}
+    index["ROM.1.1"] = {"notes": [], "relations": [{"target": "GEN.1.1-REV.22.21", "type": "other"}]}
+    reverse = ReverseReferenceIndex.build(index, db.normalizer.book_order)
+    assert len(reverse) == 1001
+
+    assert [r["source"] for r in reverse.get("GEN.25.10")] == ["ROM.1.1", "MRK.1.1"]
+    # Only the matching short target and the long one are looked at, not every start since GEN.1.1
+    verse_id = db.normalizer.verse_id("GEN", 25, 10)
+    assert sum(hi - lo for _, _, lo, hi in reverse._candidates(VerseRange(verse_id, verse_id))) == 2
@@ -0,0 +1,193 @@
+import pytest
+import os
+import json
+import shutil
+import tempfile
+from references_sqlite import SqliteReferenceDatabase
+from book_normalizer import BookNormalizer
+from verse_id import parse_verse_key, chapter_span
+
+@pytest.fixture
+def temp_data_dir():
+    dir_path = tempfile.mkdtemp()
+    yield dir_path
+    shutil.rmtree(dir_path)
+
+@pytest.fixture
+def normalizer():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return BookNormalizer(os.path.join(project_root, 'data'))
+
+@pytest.fixture
+def db(temp_data_dir, normalizer):
+    db = SqliteReferenceDatabase(temp_data_dir, normalizer)
+    yield db
+    db.close()
+
+def write_refs(temp_data_dir, filename, entries):
+    with open(os.path.join(temp_data_dir, filename), "w") as f:
+        json.dump({"version": "1.0", "description": "Test", "cross_references": entries}, f)
+
+def test_import_and_lookup(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "notes": "Evangile", "relations": [
+            {"target": "MRK.1.14", "type": "parallel", "note": ""},
+            {"target": "ROM.1.1-4", "type": "allusion"},
+        ]},
+    ])
+    write_refs(temp_data_dir, "references_nt_personal.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "GEN.1.1", "type": "other", "note": "Beginning"}]},
+    ])
+    write_refs(temp_data_dir, "references_ot_mine.json", [
+        {"source": "GEN.1.1", "relations": [{"target": "JHN.1.1", "type": "other"}]},
+    ])
+
+    counts = db.import_json()
+    assert counts["references_nt_tob.json"] == 2
+
+    refs = db.get_index(scope='nt').get("MRK.1.1")
+    assert refs["notes"] == ["Evangile"]
+    assert {r["target"] for r in refs["relations"]} == {"MRK.1.14", "ROM.1.1-4", "GEN.1.1"}
+    assert db.get_index(scope='nt').get("GEN.1.1") is None
+    assert "GEN.1.1" in db.get_index(scope='ot')
+
+    filtered = db.get_index(source_filter="personal", scope='nt')["MRK.1.1"]
+    assert [r["target"] for r in filtered["relations"]] == ["GEN.1.1"]
+
+def test_reimport_replaces_collection(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "MRK.1.14", "type": "parallel"}]},
+    ])
+    db.import_json()
+    db.import_json()
+    assert len(db.lookup("MRK.1.1")["relations"]) == 1
+
+def test_add_relation_and_export(db, temp_data_dir):
+    db.add_relation("personal", "John 1:1", "Gen 1:1", "parallel", "Echoes of creation")
+
+    # Nothing written to JSON until exported
+    expected_file = os.path.join(temp_data_dir, "references_nt_personal.json")
+    assert not os.path.exists(expected_file)
+    assert db.lookup("JHN.1.1")["relations"][0]["note"] == "Echoes of creation"
+
+    db.export_json("references_nt_personal.json")
+    with open(expected_file, "r") as f:
+        data = json.load(f)
+    entry = data["cross_references"][0]
+    assert entry["source"] == "JHN.1.1"
+    assert entry["relations"] == [{"target": "GEN.1.1", "type": "parallel", "note": "Echoes of creation"}]
+
+def test_database_uses_wal(db):
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_service_opens_sqlite_store_when_present(temp_data_dir, normalizer, monkeypatch):
+    from application.services import open_reference_database
+    from references_db import ReferenceDatabase
+
+    monkeypatch.delenv("SCRIPTURES_REFERENCES_DB", raising=False)
+    assert type(open_reference_database(temp_data_dir, normalizer)) is ReferenceDatabase
+
+    SqliteReferenceDatabase(temp_data_dir, normalizer).conn  # creates the file
+    assert isinstance(open_reference_database(temp_data_dir, normalizer), SqliteReferenceDatabase)
+
+def test_incoming_relations(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "ISA.53.7", "type": "allusion"}]},
+        {"source": "ACT.8.32", "relations": [{"target": "ISA.53.7-8", "type": "quotation"}]},
+    ])
+    db.import_json()
+    db.add_relation("mine", "Jn 1:29", "Is 53:7")
+
+    incoming = db.get_reverse_index().get("ISA.53.7")
+    assert [r["source"] for r in incoming] == ["MRK.1.1", "ACT.8.32", "JHN.1.29"]
+    assert [r["source"] for r in db.get_reverse_index(source_filter="tob").get("ISA.53.8")] == ["ACT.8.32"]
+    assert db.get_reverse_index().get("ISA.53.9") is None
+
+def test_graph_from_store(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "MRK.1.14", "type": "parallel"}, {"target": "ISA.40.3-5", "type": "quotation"}]},
+    ])
+    db.import_json()
+    graph = db.get_graph()
+    assert graph.edge_count == 2
+    assert db.get_graph() is graph
+
+    db.add_relation("mine", "Mc 1:14", "Mt 4:12", "parallel")
+    graph = db.get_graph()
+    reached, _ = graph.traverse(parse_verse_key("MRK.1.1", db.normalizer.book_order), max_depth=2, rel_types=["parallel"])
+    assert [r[0] for r in reached] == [parse_verse_key(k, db.normalizer.book_order) for k in ("MRK.1.14", "MAT.4.12")]
+
+def test_revision_changes_with_writes(db, temp_data_dir):
+    before = db.revision()
+    assert db.revision() == before
+    db.add_relation("personal", "John 1:1", "Gen 1:1", "parallel")
+    after_add = db.revision()
+    assert after_add != before
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "MRK.1.14", "type": "parallel"}]},
+    ])
+    db.import_json()
+    assert db.revision() != after_add
+
+def test_lookups_carry_parsed_targets(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "ROM.1.1-4", "type": "allusion"}]},
+    ])
+    db.import_json()
+    rel = db.get_index()["MRK.1.1"]["relations"][0]
+    assert rel["parsed"].range == db.normalizer.parse_range("ROM.1.1-4")
+    assert rel["parsed"].label == "Romains 1:1-4"
+    assert db.get_reverse_index().get("ROM.1.2")[0]["parsed_source"].label == "Marc 1:1"
+
+def test_range_lookups(db, temp_data_dir):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "notes": "Evangile", "relations": [{"target": "ISA.40.3-5", "type": "quotation"}]},
+        {"source": "MRK.1.4", "relations": [{"target": "MAT.3.1", "type": "parallel"}]},
+        {"source": "MRK.2.1", "relations": [{"target": "MAT.9.1", "type": "parallel"}]},
+    ])
+    db.import_json()
+    found = db.get_range(chapter_span(db.normalizer.book_order["MRK"], 1))
+    assert [key for _, key, _ in found] == ["MRK.1.1", "MRK.1.4"]
+    assert found[0][2]["notes"] == ["Evangile"]
+    assert found[0][2]["relations"][0]["parsed"].label == "Ésaïe 40:3-5"
+    incoming = db.get_reverse_index().overlapping(db.normalizer.parse_range("ISA.40.4-9"))
+    assert [(r, e["source"]) for r, e in incoming] == [(db.normalizer.parse_range("ISA.40.3-5"), "MRK.1.1")]
+
+def test_revision_sees_reimports_by_another_connection(db, temp_data_dir, normalizer):
+    write_refs(temp_data_dir, "references_nt_tob.json", [
+        {"source": "MRK.1.1", "relations": [{"target": "MRK.1.14", "type": "parallel"}]},
+    ])
+    db.import_json()
+    before = db.revision()
+    graph = db.get_graph()
+
+    # Another process re-imports the collection: same row count, same reused row ids
+    other = SqliteReferenceDatabase(temp_data_dir, normalizer)
+    try:
+        write_refs(temp_data_dir, "references_nt_tob.json", [
+            {"source": "MRK.1.1", "relations": [{"target": "ISA.40.3", "type": "quotation"}]},
+        ])
+        other.import_json()
+    finally:
+        other.close()
+
+    assert db.revision() != before
+    assert db.get_graph() is not graph
+    assert [r["target"] for r in db.get_index()["MRK.1.1"]["relations"]] == ["ISA.40.3"]
+
+def test_long_target_does_not_widen_incoming_lookups(db, temp_data_dir):
+    def lookup_steps(chapters):
+        write_refs(temp_data_dir, "references_ot_mine.json", [
+            {"source": "MRK.1.1", "relations": [{"target": f"GEN.{c}.{v}", "type": "other"} for c in range(1, chapters + 1) for v in range(1, 21)]},
+            {"source": "ROM.1.1", "relations": [{"target": "GEN.1.1-REV.22.21", "type": "other"}]},
+        ])
+        db.import_json()
+        steps = []
+        db.conn.set_progress_handler(lambda: steps.append(1) and 0, 1)
+        incoming = db.incoming("GEN.5.10")
+        db.conn.set_progress_handler(None, 1)
+        assert [r["source"] for r in incoming] == ["ROM.1.1", "MRK.1.1"]
+        return len(steps)
+
+    # Ten times the short targets, about the same work
+    assert lookup_steps(500) < 1.5 * lookup_steps(50)
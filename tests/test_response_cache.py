@@ -0,0 +1,114 @@
+import pytest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from domain.models import Verse, Language, DatasetState, DatasetStatus
+from response_cache import LRUCache
+from application.services import BibleService
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1 # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (3, 1, 1, 2)
+
+def test_ttl_and_revision():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=60, clock=clock)
+    cache.put("k", "v", revision=1)
+    assert cache.get("k", revision=1) == "v"
+    # Another revision drops the entry
+    assert cache.get("k", revision=2) is None
+    assert cache.get("k", revision=1) is None
+
+    cache.put("k", "v")
+    clock.now = 61
+    assert cache.get("k") is None
+    assert cache.cache_stats()["expirations"] == 1
+    assert cache.cache_stats()["invalidations"] == 1
+
+def test_zero_size_disables_the_cache():
+    cache = LRUCache(maxsize=0)
+    cache.put("k", "v")
+    assert cache.get("k") is None and len(cache) == 0
+
+@pytest.fixture
+def temp_data_dir(monkeypatch):
+    path = tempfile.mkdtemp()
+    monkeypatch.setenv("SCRIPTURES_REFERENCES_DB", os.path.join(path, "absent.sqlite"))
+    yield path
+    shutil.rmtree(path)
+
+@pytest.fixture
+def service(temp_data_dir):
+    normalizer = BookNormalizer(DATA_DIR)
+    provider = MagicMock()
+    provider.normalizer = normalizer
+    provider.data_dir = temp_data_dir
+    def normalize_reference(ref):
+        res = normalizer.normalize_reference(ref)
+        return res[:3] if res else None
+    provider.normalize_reference.side_effect = normalize_reference
+    provider.get_verse.side_effect = lambda b, c, v, version: Verse(
+        book_code=b, chapter=c, verse=v, text=f"{version} {b} {c}:{v}", language=Language.GREEK, version=version
+    )
+    provider.dataset_states.return_value = {"n1904": DatasetState(name="n1904", status=DatasetStatus.READY, load_seconds=1.0)}
+    return BibleService(adapter=provider)
+
+def test_search_responses_are_shared_by_equivalent_references(service):
+    first = service.search("Jean 3:16", translations=["gr"])
+    reads = service.adapter.get_verse.call_count
+
+    second = service.search("Jn 3,16", translations=["gr"])
+    assert service.adapter.get_verse.call_count == reads
+    assert second.reference == "Jn 3,16"
+    assert second.verses == first.verses
+    assert service.cache_stats()["search"]["hits"] == 1
+
+    # Other versions read, other entry
+    service.search("Jn 3:16", translations=["gr", "fr"])
+    assert service.adapter.get_verse.call_count > reads
+
+def test_search_cache_follows_datasets_and_references(service):
+    service.search("Jn 3:16", translations=["gr"], show_crossrefs=True)
+    assert service.search("Jn 3:16", translations=["gr"], show_crossrefs=True).cross_references is None
+
+    # A new relation is seen at once
+    service.ref_db.add_relation("personal", "Jn 3:16", "Rm 5:8", "parallel")
+    response = service.search("Jn 3:16", translations=["gr"], show_crossrefs=True)
+    assert [r.target_ref for r in response.cross_references.relations] == ["ROM.5.8"]
+
+    # So is a dataset (re)load
+    reads = service.adapter.get_verse.call_count
+    service.adapter.dataset_states.return_value = {"n1904": DatasetState(name="n1904", status=DatasetStatus.READY, load_seconds=2.0)}
+    service.search("Jn 3:16", translations=["gr"], show_crossrefs=True)
+    assert service.adapter.get_verse.call_count > reads
+
+def test_failed_dataset_retries_do_not_defeat_the_cache(service):
+    retries = iter(range(1, 100))
+    def dataset_states():
+        # A broken dataset is retried, with a new load time, on every access
+        return {
+            "n1904": DatasetState(name="n1904", status=DatasetStatus.READY, load_seconds=1.0),
+            "bhsa": DatasetState(name="bhsa", status=DatasetStatus.FAILED, load_seconds=float(next(retries))),
+        }
+    service.adapter.dataset_states.side_effect = dataset_states
+    service.search("Jn 3:16", translations=["gr"])
+    service.search("Jn 3:16", translations=["gr"])
+    assert service.cache_stats()["search"]["hits"] == 1
@@ -0,0 +1,304 @@
+import pytest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from domain.models import Verse, Language
+from search_index import tokenize, fold, parse_query, write_search_index, SearchIndex, FullTextIndex, intersect, Near, highlight_spans, query_terms
+from application.services import BibleService
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+TEXTS = {
+    "TOB": [
+        ("GEN", 1, 1, "Au commencement, Dieu créa le ciel et la terre."),
+        ("GEN", 1, 3, "Dieu dit: «Que la lumière soit!» Et la lumière fut."),
+        ("GEN", 1, 5, "Dieu appela la lumière «jour» et la ténèbre il l'appela «nuit»."),
+        ("JHN", 1, 1, "Au commencement était le Verbe, et le Verbe était auprès de Dieu."),
+        ("JHN", 1, 5, "la lumière brille dans les ténèbres, et les ténèbres ne l'ont point comprise."),
+    ],
+    "N1904": [
+        ("JHN", 1, 1, "Ἐν ἀρχῇ ἦν ὁ λόγος, καὶ ὁ λόγος ἦν πρὸς τὸν θεόν"),
+    ],
+}
+
+@pytest.fixture
+def normalizer():
+    return BookNormalizer(DATA_DIR)
+
+@pytest.fixture
+def index_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+def make_provider(normalizer):
+    provider = MagicMock()
+    provider.normalizer = normalizer
+    provider.data_dir = DATA_DIR
+
+    def normalize_reference(ref):
+        res = normalizer.normalize_reference(ref)
+        return res[:3] if res else None
+    provider.normalize_reference.side_effect = normalize_reference
+    provider.iter_verse_texts.side_effect = lambda version: iter(TEXTS.get(version, []))
+
+    def get_verse(book, chapter, verse, version):
+        for b, c, v, text in TEXTS.get(version, []):
+            if (b, c, v) == (book, chapter, verse):
+                return Verse(book_code=b, chapter=c, verse=v, text=text, language=Language.FRENCH, version=version)
+        return None
+    provider.get_verse.side_effect = get_verse
+    provider.get_chapter.side_effect = lambda book, chapter, version: [
+        get_verse(b, c, v, version) for b, c, v, _ in TEXTS.get(version, []) if (b, c) == (book, chapter)
+    ]
+    return provider
+
+def test_tokenize_keeps_marks_inside_words():
+    assert tokenize("Dieu dit: «Que la lumière soit!»") == ["dieu", "dit", "que", "la", "lumière", "soit"]
+    assert tokenize("בְּרֵאשִׁ֖ית בָּרָ֣א כָּל־הָאָרֶץ׃") == ["בְּרֵאשִׁ֖ית", "בָּרָ֣א", "כָּל", "הָאָרֶץ"]
+    assert tokenize("Ἐν ἀρχῇ ἦν ὁ λόγος,") == ["ἐν", "ἀρχῇ", "ἦν", "ὁ", "λόγος"]
+
+def test_parse_query():
+    assert parse_query('lumière ténèbres OR nuit "au commencement"') == [
+        [["lumière"]], [["ténèbres"], ["nuit"]], [["au", "commencement"]]
+    ]
+    assert parse_query("OR  ") == []
+    assert parse_query('lumière NEAR/3 "les ténèbres" OR nuit') == [[Near(["lumière"], ["les", "ténèbres"], 3), ["nuit"]]]
+    assert parse_query("NEAR lumière NEAR ténèbres") == [[Near(["lumière"], ["ténèbres"], 10)]]
+
+def test_intersect():
+    assert intersect([1, 3, 5, 7], [2, 3, 4, 7, 9]) == [3, 7]
+    assert intersect([], [1]) == []
+
+def test_index_roundtrip(normalizer, index_dir):
+    path = os.path.join(index_dir, "TOB.idx")
+    assert write_search_index(path, "TOB", normalizer.book_codes, TEXTS["TOB"]) == 5
+    index = SearchIndex(path)
+    try:
+        assert index.verse_count == 5
+        assert "lumière" in index
+        assert [normalizer.verse_key(i) for i in index.postings("lumière")] == ["GEN.1.3", "GEN.1.5", "JHN.1.5"]
+        assert list(index.postings("absent")) == []
+        # Words are numbered across verses: "lumière" is the 5th and 9th word of GEN 1:3
+        assert index.positions("lumière")[:2] == [13, 17]
+        assert [index.verse_index(p) for p in index.positions("lumière")] == [1, 1, 2, 4]
+        assert index.positions("absent") == []
+        # Term frequencies and verse lengths, for BM25
+        ids = [normalizer.verse_id(b, c, v) for b, c, v, _ in TEXTS["TOB"]]
+        assert index.term_frequencies("lumière", ids) == [0, 2, 1, 0, 1]
+        assert index.lengths(ids) == [9, 10, 12, 12, 14]
+    finally:
+        index.close()
+
+def test_queries(normalizer, index_dir):
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, make_provider(normalizer))
+    keys = lambda q, v="TOB": [normalizer.verse_key(i) for i in fulltext.search(q, v)]
+
+    assert keys("lumière ténèbres") == ["JHN.1.5"]
+    assert keys("ténèbre OR ténèbres") == ["GEN.1.5", "JHN.1.5"]
+    assert keys('"au commencement" verbe') == ["JHN.1.1"]
+    assert keys('"commencement au"') == []
+    # A phrase does not run over a verse end ("...la terre." / "Dieu dit")
+    assert keys('"terre dieu"') == []
+    assert keys("lumière NEAR/1 fut") == ["GEN.1.3"]
+    assert keys("fut NEAR/1 lumière") == ["GEN.1.3"]
+    assert keys("dieu NEAR/2 lumière") == ["GEN.1.5"]
+    assert keys("commencement NEAR/2 verbe") == ["JHN.1.1"]
+    assert keys("commencement NEAR/1 verbe") == []
+    assert keys("λόγος", "n1904") == ["JHN.1.1"]
+    # Versions without verses have no index
+    assert keys("lumière", "BJ") == []
+    assert sorted(fulltext.indexed_versions()) == ["N1904", "TOB"]
+
+@pytest.mark.parametrize("verse_decode_cost", [0, 10**9])
+def test_phrases_decoded_per_verse_or_whole(normalizer, index_dir, monkeypatch, verse_decode_cost):
+    # 0: positions always decoded verse by verse; 10**9: always whole lists
+    monkeypatch.setattr("search_index.VERSE_DECODE_COST", verse_decode_cost)
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, make_provider(normalizer))
+    keys = lambda q: [normalizer.verse_key(i) for i in fulltext.search(q, "TOB")]
+    assert keys('"la lumière"') == ["GEN.1.3", "GEN.1.5", "JHN.1.5"]
+    assert keys('"terre dieu"') == []
+    assert keys('"et la lumière fut"') == ["GEN.1.3"]
+    assert keys('"la lumière" NEAR/7 nuit') == ["GEN.1.5"]
+    assert keys("dieu NEAR/2 lumière") == ["GEN.1.5"]
+    index = fulltext.get("TOB")
+    ids = [normalizer.verse_id("GEN", 1, 3), normalizer.verse_id("GEN", 1, 4), normalizer.verse_id("JHN", 1, 5)]
+    assert index.verse_positions("lumière", ids) == [[13, 17], [], [index.positions("lumière")[-1]]]
+    assert index.position_count("lumière") == 4
+
+def test_phrases_do_not_read_verses(normalizer, index_dir):
+    provider = make_provider(normalizer)
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, provider)
+    assert len(fulltext.search('"la lumière" NEAR/7 nuit', "TOB")) == 1
+    assert fulltext.search('"la lumière" NEAR/6 nuit', "TOB") == []
+    provider.get_verse.assert_not_called()
+    provider.get_chapter.assert_not_called()
+
+def test_index_is_built_once_then_mapped(normalizer, index_dir):
+    provider = make_provider(normalizer)
+    FullTextIndex(index_dir, normalizer.book_codes, provider).search("dieu", "TOB")
+
+    # A new process opens the file instead of re-reading every verse
+    provider.iter_verse_texts.reset_mock()
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, provider)
+    assert len(fulltext.search("dieu", "TOB")) == 4
+    provider.iter_verse_texts.assert_not_called()
+
+def test_service_fulltext(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+
+    response = service.fulltext("commencement OR λόγος", versions=["tob", "N1904"], limit=2, order="canonical")
+    assert response.total == 3
+    assert [(h.ref, h.verse.version) for h in response.hits] == [("GEN 1:1", "TOB"), ("JHN 1:1", "TOB")]
+    assert response.hits[0].ref_localized == "Genèse 1:1"
+
+    # Scopes apply to every version searched
+    response = service.fulltext("commencement OR λόγος", versions=["tob", "N1904"], scope="NT", order="canonical")
+    assert [(h.ref, h.verse.version) for h in response.hits] == [("JHN 1:1", "TOB"), ("JHN 1:1", "N1904")]
+    assert service.fulltext("lumière", versions=["TOB"], scope="Gn 1:4-5").total == 1
+    assert service.fulltext('"la lumière"', versions=["TOB"], scope="Jn").total == 1
+
+def test_parallels_are_joined_per_version(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    provider = make_provider(normalizer)
+    service = BibleService(adapter=provider)
+
+    response = service.fulltext("commencement", versions=["TOB"], order="canonical", parallels=["gr", "hb"])
+    # Genesis has no N1904 or BHSA text here; the New Testament has no Hebrew
+    assert [(h.ref, [p.version for p in h.parallels]) for h in response.hits] == [("GEN 1:1", []), ("JHN 1:1", ["N1904"])]
+    assert response.hits[1].parallels[0].text.startswith("Ἐν ἀρχῇ")
+    # A single read per (version, chapter)
+    reads = [(c.args[0], c.args[1], c.kwargs["version"]) for c in provider.get_verse.call_args_list]
+    reads += [c.args for c in provider.get_chapter.call_args_list]
+    assert sorted(reads) == [
+        ("GEN", 1, "BHSA"), ("GEN", 1, "LXX"), ("GEN", 1, "TOB"), ("JHN", 1, "N1904"), ("JHN", 1, "TOB")
+    ]
+
+@pytest.mark.parametrize("order", ["relevance", "canonical"])
+def test_cursor_pagination(normalizer, index_dir, monkeypatch, order):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+    search = lambda **kw: service.fulltext("dieu OR λόγος", versions=["TOB", "N1904"], order=order, **kw)
+    everything = [(h.ref, h.verse.version) for h in search().hits]
+    assert len(everything) == 5
+
+    pages, cursor = [], None
+    while True:
+        response = search(limit=2, cursor=cursor)
+        assert response.total == 5
+        pages.append([(h.ref, h.verse.version) for h in response.hits])
+        cursor = response.next_cursor
+        if cursor is None:
+            break
+    assert [len(p) for p in pages] == [2, 2, 1]
+    assert sum(pages, []) == everything
+
+    with pytest.raises(ValueError):
+        search(cursor="garbage")
+    with pytest.raises(ValueError):
+        search(limit=0)
+
+def test_relevance_pages_reuse_the_ranking(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+    first = service.fulltext("dieu", versions=["TOB"], limit=2)
+    scores = MagicMock(side_effect=AssertionError("rescored"))
+    monkeypatch.setattr(service.fulltext_index, "scores", scores)
+    second = service.fulltext("dieu", versions=["TOB"], limit=2, cursor=first.next_cursor)
+    assert [h.ref for h in second.hits] == [h.ref for h in service.fulltext("dieu", versions=["TOB"]).hits[2:4]]
+    assert service.cache_stats()["ranking"]["hits"] == 2
+
+def test_iter_fulltext_reads_pages(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+    expected = [h.ref for h in service.fulltext("dieu", versions=["TOB"], order="canonical").hits]
+
+    hits = service.iter_fulltext("dieu", versions=["TOB"], order="canonical", page_size=2)
+    assert [h.ref for h in hits] == expected == ["GEN 1:1", "GEN 1:3", "GEN 1:5", "JHN 1:1"]
+    assert [h.ref for h in service.iter_fulltext("dieu", versions=["TOB"], limit=1)] == [service.fulltext("dieu", versions=["TOB"], limit=1).hits[0].ref]
+
+def test_fold():
+    assert fold("Λόγος") == fold("λογος") == fold("ΛΟΓΟΣ")
+    assert fold("ᾠδῇ") == "ωδη"
+    assert fold("Évangile") == "evangile"
+    assert fold("בְּרֵאשִׁ֖ית") == "בראשית"
+    assert fold("الْكَلِمَةُ") == "الكلمة"
+    assert fold("أَمَرَ") == "امر"
+
+def test_folded_queries(normalizer, index_dir):
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, make_provider(normalizer))
+    keys = lambda q, v="TOB", exact=False: [normalizer.verse_key(i) for i in fulltext.search(q, v, exact)]
+
+    assert keys("LUMIERE tenebres") == ["JHN.1.5"]
+    assert keys('"que la lumiere"') == ["GEN.1.3"]
+    assert keys("λογοσ", "N1904") == ["JHN.1.1"]
+    # Exact matching still ignores case, not accents
+    assert keys("LUMIÈRE", exact=True) == ["GEN.1.3", "GEN.1.5", "JHN.1.5"]
+    assert keys("lumiere", exact=True) == []
+
+def test_bm25_ranking_and_highlights(normalizer, index_dir, monkeypatch):
+    monkeypatch.setenv("SCRIPTURES_SEARCH_DIR", index_dir)
+    service = BibleService(adapter=make_provider(normalizer))
+
+    # GEN 1:3 has "lumière" twice; JHN 1:5 is the longest verse
+    response = service.fulltext("lumière", versions=["TOB"])
+    assert [h.ref for h in response.hits] == ["GEN 1:3", "GEN 1:5", "JHN 1:5"]
+    assert response.hits[0].score > response.hits[1].score > response.hits[2].score > 0
+
+    # Offsets point into the verse text, accents and case folded
+    hit = service.fulltext("LUMIERE", versions=["TOB"], limit=1).hits[0]
+    spans = [(s.start, s.end) for s in hit.highlights]
+    assert [hit.verse.text[s:e] for s, e in spans] == ["lumière", "lumière"]
+
+    assert service.fulltext("lumière", versions=["TOB"], order="canonical").hits[0].score is None
+    with pytest.raises(ValueError):
+        service.fulltext("lumière", order="random")
+
+def test_highlight_spans():
+    terms = query_terms('"Au commencement" NEAR/2 verbe')
+    assert terms == ["au", "commencement", "verbe"]
+    text = "Au commencement était le Verbe"
+    assert [text[s:e] for s, e in highlight_spans(text, terms)] == ["Au", "commencement", "Verbe"]
+    assert highlight_spans("ténèbres", query_terms("tenebres", exact=True), exact=True) == []
+
+@pytest.mark.integration
+def test_phrases_of_frequent_words_on_a_bible_sized_index(normalizer, index_dir):
+    import random
+    import time
+    from search_index import SearchIndex as Index
+    # ~31k verses of 25 words: "de", "la" and "et" are in nearly every verse, as in the TOB
+    rng = random.Random(7)
+    common = ["de", "la", "et", "le", "les", "il", "à", "des", "en", "que"]
+    rare = [f"mot{i}" for i in range(20000)]
+    verses = []
+    for n in range(31000):
+        words = [rng.choice(common) if rng.random() < 0.6 else rng.choice(rare) for _ in range(25)]
+        verses.append(("GEN", n // 500 + 1, n % 500 + 1, " ".join(words)))
+    verses.append(("JHN", 1, 1, "au commencement était le verbe de la lumière et la vie"))
+    fulltext = FullTextIndex(index_dir, normalizer.book_codes, MagicMock(iter_verse_texts=lambda v: iter(verses)))
+    index = fulltext.get("TOB")
+
+    decoded = []
+    verse_positions = Index.verse_positions
+    def counting(self, term, verse_ids, folded=False):
+        decoded.append(len(verse_ids))
+        return verse_positions(self, term, verse_ids, folded)
+
+    queries = ['"lumière et la"', '"de la lumière"', 'lumière NEAR/3 vie']
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        assert [normalizer.verse_key(i) for i in fulltext.search(query, "TOB")] == ["JHN.1.1"]
+        timings.append(time.perf_counter() - start)
+    assert max(timings) < 0.05
+
+    # Only the verses holding every word are decoded, not "de" across the corpus
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(Index, "verse_positions", counting)
+        fulltext.search('"de la lumière"', "TOB")
+    assert decoded == [1, 1, 1]
+    assert len(index.postings("de")) > 20000
@@ -0,0 +1,61 @@
+import pytest
+import os
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from search_scope import VerseScope, named_scope, book_scope
+from verse_id import VerseRange
+from application.services import BibleService
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+@pytest.fixture
+def normalizer():
+    return BookNormalizer(DATA_DIR)
+
+@pytest.fixture
+def service(normalizer):
+    adapter = MagicMock()
+    adapter.normalizer = normalizer
+    adapter.data_dir = DATA_DIR
+
+    def normalize_reference(ref):
+        res = normalizer.normalize_reference(ref)
+        return res[:3] if res else None
+    adapter.normalize_reference.side_effect = normalize_reference
+    return BibleService(adapter=adapter)
+
+def test_restrict_slices_sorted_ids():
+    scope = VerseScope([VerseRange(10, 20), VerseRange(30, 30), VerseRange(15, 25)])
+    assert scope.ranges == [VerseRange(10, 25), VerseRange(30, 30)]
+    assert scope.restrict([1, 10, 12, 25, 26, 30, 31]) == [10, 12, 25, 30]
+    assert 30 in scope and 29 not in scope and 9 not in scope
+
+def test_named_scopes(normalizer):
+    nt = named_scope(normalizer, "NT")
+    assert len(nt.ranges) == 1  # the New Testament books are contiguous
+    assert normalizer.verse_id("MRK", 1, 1) in nt
+    assert normalizer.verse_id("MAL", 3, 24) not in nt
+    # Ezekiel, Joel and Nahum are OT under their bible_books.json codes too
+    ot = named_scope(normalizer, "ot")
+    assert all(normalizer.verse_id(b, 1, 1) in ot for b in ["GEN", "EZE", "JOE", "NAH", "MAL"])
+    assert normalizer.verse_id("TOB", 1, 1) in named_scope(normalizer, "Apocrypha")
+    assert named_scope(normalizer, "Torah").ranges == book_scope(normalizer, ["GEN", "DEU", "EXO", "NUM", "LEV"]).ranges
+    assert named_scope(normalizer, "Rm") is None
+
+def test_parse_scope(service, normalizer):
+    vid = normalizer.verse_id
+    romans = service.parse_scope("Rm 1-8")
+    assert vid("ROM", 1, 1) in romans and vid("ROM", 8, 39) in romans
+    assert vid("ROM", 9, 1) not in romans
+
+    verses = service.parse_scope("Gn 1:3-2:4")
+    assert vid("GEN", 1, 2) not in verses and vid("GEN", 2, 4) in verses and vid("GEN", 2, 5) not in verses
+
+    combined = service.parse_scope("Pentateuch, Is, Mc 2")
+    assert all(v in combined for v in [vid("LEV", 4, 1), vid("ISA", 66, 1), vid("MRK", 2, 28)])
+    assert vid("MRK", 3, 1) not in combined
+
+    assert service.parse_scope("") is None
+    with pytest.raises(ValueError):
+        service.parse_scope("Nowhere")
@@ -178,3 +178,57 @@ def test_get_chapter_n1904(adapter):
     assert len(verses) == 2
     assert verses[0].node is not None
     assert verses[1].node is not None
+
+def make_indexed_api(sections, texts):
+    """Mock TF api whose verse nodes can be enumerated: node -> (book, chapter, verse)."""
+    mock_api = MagicMock()
+    mock_api.F.otype.s.side_effect = lambda otype: list(sections) if otype == 'verse' else []
+    mock_api.T.sectionFromNode.side_effect = lambda n: sections[n]
+    mock_api.T.text.side_effect = lambda n: texts[n]
+    return mock_api
+
+def test_section_index_verse_lookup(adapter):
+    adapter.normalizer.code_to_n1904 = {"GEN": "Genesis", "EXO": "Exodus"}
+    mock_api = make_indexed_api(
+        {10: ("GEN", 1, 1), 11: ("GEN", 1, 2), 20: ("EXO", 1, 1)},
+        {10: "Au commencement", 11: "La terre", 20: "Voici les noms"}
+    )
+    adapter._bj_provider = lambda: mock_api
+    
+    verse = adapter.get_verse("GEN", 1, 2, version="bj")
+    assert verse.text == "La terre"
+    assert verse.node == 11
+    assert adapter.get_verse("EXO", 1, 1, version="bj").node == 20
+    assert adapter.get_verse("GEN", 2, 1, version="bj") is None
+    
+    # Lookups are answered by the index, not by section resolution
+    mock_api.T.nodeFromSection.assert_not_called()
+    # Index is built once per dataset
+    assert mock_api.F.otype.s.call_count == 1
+
+def test_section_index_chapter_and_nav_names(adapter):
+    # NAV uses string section values and "1 Samuel"-style names
+    adapter.normalizer.code_to_n1904 = {"1SA": "I_Samuel"}
+    adapter.normalizer.code_to_bhsa = {"1SA": "1_Samuel"}
+    mock_api = make_indexed_api(
+        {30: ("1 Samuel", "3", "1"), 31: ("1 Samuel", "3", "2"), 32: ("1 Samuel", "4", "1")},
+        {30: "v1", 31: "v2", 32: "v3"}
+    )
+    adapter._nav_provider = lambda: mock_api
+    
+    verses = adapter.get_chapter("1SA", 3, version="nav")
+    assert [v.verse for v in verses] == [1, 2]
+    assert [v.text for v in verses] == ["v1", "v2"]
+    assert verses[0].book_code == "1 Samuel"
+    mock_api.T.nodeFromSection.assert_not_called()
+
+def test_iter_verse_texts(adapter):
+    adapter.normalizer.code_to_n1904 = {"GEN": "Genesis", "EXO": "Exodus"}
+    mock_api = make_indexed_api(
+        {10: ("GEN", 1, 1), 11: ("GEN", 1, 2), 20: ("EXO", 1, 1)},
+        {10: "a", 11: "b", 20: "c"}
+    )
+    adapter._bj_provider = lambda: mock_api
+    
+    rows = list(adapter.iter_verse_texts("BJ"))
+    assert rows == [("GEN", 1, 1, "a"), ("GEN", 1, 2, "b"), ("EXO", 1, 1, "c")]
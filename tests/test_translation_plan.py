@@ -0,0 +1,30 @@
+from application.services import compile_translation_plan, translation_version, TranslationPlan
+
+def test_translation_version():
+    assert translation_version("gr", is_nt=True) == "N1904"
+    assert translation_version("GR", is_nt=False) == "LXX"
+    assert translation_version("fr", is_nt=True, french_version="bj") == "BJ"
+    assert translation_version("klingon", is_nt=True) is None
+
+def test_parallels_keep_the_requested_order():
+    plan = compile_translation_plan(("fr", "en", "hb", "gr"), "N1904", None, False)
+    assert plan == TranslationPlan(
+        primary_version="BHSA",
+        parallel_versions=("TOB", "N1904_EN", "LXX"),
+        crossref_versions=("TOB", "N1904_EN", "BHSA", "LXX"),
+    )
+    plan = compile_translation_plan(("en", "fr", "hb", "n1904"), "N1904", "bj", True)
+    assert plan.primary_version == "N1904"
+    assert plan.parallel_versions == ("N1904_EN", "BJ", "BHSA")
+    # No Hebrew New Testament
+    assert plan.crossref_versions == ("N1904_EN", "BJ", "N1904")
+
+def test_defaults():
+    assert compile_translation_plan((), "N1904", None, False) == TranslationPlan("LXX", ("BHSA", "TOB"), ("LXX", "BHSA", "TOB"))
+    assert compile_translation_plan((), "TOB", None, True) == TranslationPlan("TOB", ("N1904",), ("N1904", "TOB"))
+
+def test_plans_are_memoized():
+    compile_translation_plan.cache_clear()
+    first = compile_translation_plan(("gr", "fr"), "N1904", None, True)
+    assert compile_translation_plan(("gr", "fr"), "N1904", None, True) is first
+    assert compile_translation_plan.cache_info().hits == 1
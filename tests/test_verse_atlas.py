@@ -0,0 +1,206 @@
+import pytest
+import os
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from domain.models import Verse, Language
+from verse_atlas import VerseAtlas
+from application.services import BibleService
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# Verses per chapter of a tiny corpus
+CHAPTERS = {
+    ("MAT", 27): 3,
+    ("MAT", 28): 2,
+    ("MRK", 1): 4,
+    ("MRK", 2): 2,
+}
+
+@pytest.fixture
+def normalizer():
+    return BookNormalizer(DATA_DIR)
+
+def make_adapter(normalizer, enumerable):
+    adapter = MagicMock()
+    adapter.normalizer = normalizer
+    adapter.data_dir = DATA_DIR
+
+    def normalize_reference(ref):
+        res = normalizer.normalize_reference(ref)
+        return res[:3] if res else None
+    adapter.normalize_reference.side_effect = normalize_reference
+
+    def get_chapter(book, chapter, version):
+        lang = Language.FRENCH if version == "TOB" else Language.GREEK
+        return [
+            Verse(book_code=book, chapter=chapter, verse=v, text=f"{version} {book} {chapter}:{v}", language=lang, version=version)
+            for v in range(1, CHAPTERS.get((book, chapter), 0) + 1)
+        ]
+    adapter.get_chapter.side_effect = get_chapter
+    adapter.get_verse.side_effect = lambda b, c, v, version: next((x for x in get_chapter(b, c, version) if x.verse == v), None)
+
+    listed = [(b, c, v) for (b, c), n in CHAPTERS.items() for v in range(1, n + 1)]
+    adapter.list_verses.return_value = listed if enumerable else None
+    return adapter
+
+@pytest.mark.parametrize("enumerable", [True, False])
+def test_iter_range_across_chapters_and_books(normalizer, enumerable):
+    atlas = VerseAtlas(make_adapter(normalizer, enumerable), "N1904", normalizer)
+    assert atlas.complete == enumerable
+
+    assert list(atlas.iter_range(("MAT", 27, 3), ("MAT", 28, 1))) == [("MAT", 27, 3), ("MAT", 28, 1)]
+    assert list(atlas.iter_range(("MAT", 28, 2), ("MRK", 1, 2))) == [("MAT", 28, 2), ("MRK", 1, 1), ("MRK", 1, 2)]
+    # Verse 0 = whole chapter, at either end
+    assert len(list(atlas.iter_range(("MRK", 1, 0), ("MRK", 2, 0)))) == 6
+    assert list(atlas.iter_range(("XXX", 1, 1), ("MRK", 1, 1))) == []
+
+def test_iter_range_is_lazy(normalizer):
+    adapter = make_adapter(normalizer, enumerable=False)
+    atlas = VerseAtlas(adapter, "N1904", normalizer)
+
+    verses = atlas.iter_range(("MAT", 27, 1), ("MRK", 2, 0))
+    assert next(verses) == ("MAT", 27, 1)
+    assert adapter.get_chapter.call_count == 1
+
+def test_search_cross_chapter_range(normalizer):
+    service = BibleService(adapter=make_adapter(normalizer, enumerable=True))
+
+    response = service.search("Mt 27:2-28:2", translations=["gr"])
+    assert [item.ref for item in response.verses] == ["MAT 27:2", "MAT 27:3", "MAT 28:1", "MAT 28:2"]
+
+    response = service.search("Mt 28:2-Mc 1:1", translations=["gr", "fr"])
+    assert [item.ref for item in response.verses] == ["MAT 28:2", "MRK 1:1"]
+    assert response.verses[1].parallels[0].text == "TOB MRK 1:1"
+
+    with pytest.raises(ValueError):
+        service.search("Mt 28:2-27:1")
+
+def test_iter_verses_streams_chapter_by_chapter(normalizer):
+    adapter = make_adapter(normalizer, enumerable=True)
+    service = BibleService(adapter=adapter)
+
+    items = service.iter_verses("Mt 27-Mc 2", translations=["gr"])
+    assert adapter.get_chapter.call_count == 0
+    first = next(items)
+    assert first.ref == "MAT 27:1"
+    assert adapter.get_chapter.call_count == 1
+    assert len(list(items)) == 10
+
+def test_crossref_full_multi_chapter_target(normalizer):
+    service = BibleService(adapter=make_adapter(normalizer, enumerable=True))
+    service.ref_db = MagicMock()
+    service.ref_db.get_index.return_value = {
+        "MAT.27.1": {"relations": [{"target": "MAT.27.3-28.1", "type": "parallel"}], "notes": []}
+    }
+
+    response = service.search("Mt 27:1", translations=["gr"], crossref_full=True)
+    rel = response.cross_references.relations[0]
+    assert rel.text == "N1904 MAT 27:3 N1904 MAT 28:1"
+
+def test_crossref_full_reads_each_chapter_once(normalizer):
+    adapter = make_adapter(normalizer, enumerable=True)
+    service = BibleService(adapter=adapter)
+    service.ref_db = MagicMock()
+    # Overlapping targets, all in MRK 1 and MRK 2
+    targets = ["MRK.1.1", "MRK.1.2", "MRK.1.1-3", "MRK.1.2-4", "MRK.1.4-2.1", "MRK.2.2"]
+    service.ref_db.get_index.return_value = {
+        "MAT.27.1": {"relations": [{"target": t, "type": "parallel"} for t in targets], "notes": []}
+    }
+
+    adapter.get_chapter.reset_mock()
+    adapter.get_verse.reset_mock()
+    response = service.search("Mt 27:1", translations=["gr", "fr"], crossref_full=True)
+    texts = {r.target_ref: r.text for r in response.cross_references.relations}
+    assert texts["MRK.1.2-4"] == "N1904 MRK 1:2 N1904 MRK 1:3 N1904 MRK 1:4\nTOB MRK 1:2 TOB MRK 1:3 TOB MRK 1:4"
+    assert texts["MRK.1.4-2.1"] == "N1904 MRK 1:4 N1904 MRK 2:1\nTOB MRK 1:4 TOB MRK 2:1"
+
+    # Besides the verse itself and the atlas: one read per (version, chapter) of the targets
+    reads = [c.args for c in adapter.get_chapter.call_args_list if c.args[0] == "MRK"]
+    assert sorted(reads) == [("MRK", 1, "N1904"), ("MRK", 1, "TOB"), ("MRK", 2, "N1904"), ("MRK", 2, "TOB")]
+    assert not [c for c in adapter.get_verse.call_args_list if c.args[0] == "MRK"]
+
+def test_crossrefs_are_served_without_parsing_targets(normalizer, tmp_path, monkeypatch):
+    import json
+    from references_db import ReferenceDatabase
+    with open(tmp_path / "references_nt_mine.json", "w") as f:
+        json.dump({"cross_references": [{"source": "MAT.27.1", "relations": [
+            {"target": "MRK.2.1", "type": "parallel"}, {"target": "MRK.1.2-4", "type": "parallel"}, {"target": "MAT.28.2-MRK.1.1", "type": "other"}
+        ]}]}, f)
+    adapter = make_adapter(normalizer, enumerable=True)
+    service = BibleService(adapter=adapter)
+    service.ref_db = ReferenceDatabase(str(tmp_path), normalizer)
+    service.ref_db.get_index(scope="nt") # files are read (and targets parsed) here
+
+    def no_parsing(*args):
+        raise AssertionError("target parsed while serving")
+    monkeypatch.setattr("application.services.parse_target_range", no_parsing)
+    adapter.normalize_reference.reset_mock()
+
+    response = service.search("Mt 27:1", translations=["gr"], crossref_full=True)
+    assert adapter.normalize_reference.call_count == 1 # the requested reference only
+    relations = response.cross_references.relations
+    assert [r.target_ref_localized for r in relations] == ["Matthieu 28:2-Marc 1:1", "Marc 1:2-4", "Marc 2:1"]
+    assert relations[0].text == "N1904 MAT 28:2 N1904 MRK 1:1"
+    assert relations[1].text == "N1904 MRK 1:2 N1904 MRK 1:3 N1904 MRK 1:4"
+
+def test_crossrefs_of_a_chapter_are_grouped_per_verse(normalizer, tmp_path):
+    import json
+    from references_db import ReferenceDatabase
+    with open(tmp_path / "references_nt_mine.json", "w") as f:
+        json.dump({"cross_references": [
+            {"source": "MRK.1.1", "relations": [{"target": "MAT.27.1", "type": "parallel"}]},
+            {"source": "MRK.1.4", "notes": "Jean", "relations": [{"target": "MAT.28.1", "type": "parallel"}]},
+            {"source": "MAT.27.3", "relations": [{"target": "MRK.1.2-3", "type": "allusion"}]},
+            {"source": "MRK.2.1", "relations": [{"target": "MAT.28.2", "type": "parallel"}]},
+        ]}, f)
+    adapter = make_adapter(normalizer, enumerable=True)
+    service = BibleService(adapter=adapter)
+    service.ref_db = ReferenceDatabase(str(tmp_path), normalizer)
+
+    response = service.search("Mc 1", translations=["gr"], show_crossrefs=True, crossref_full=True, direction="both")
+    assert response.cross_references is None
+    by_verse = {item.primary.verse: item.cross_references for item in response.verses}
+    assert [r.target_ref for r in by_verse[1].relations] == ["MAT.27.1"]
+    assert by_verse[1].relations[0].text == "N1904 MAT 27:1"
+    # Incoming, on every verse its target range covers
+    assert [r.target_ref for r in by_verse[2].relations] == [r.target_ref for r in by_verse[3].relations] == ["MAT.27.3"]
+    assert by_verse[4].notes == ["Jean"]
+    assert by_verse[4].relations[0].text == "N1904 MAT 28:1"
+
+    # The CLI gets the same groups, a chapter at a time
+    adapter.get_chapter.reset_mock()
+    pairs = service.iter_verses_with_crossrefs("Mc 1-2", translations=["gr"], crossref_full=True, direction="both")
+    item, refs = next(pairs)
+    assert (item.ref, refs) == ("MRK 1:1", by_verse[1])
+    assert ("MRK", 2, "N1904") not in [c.args for c in adapter.get_chapter.call_args_list]
+    rest = list(pairs)
+    assert [refs for _, refs in rest[:3]] == [by_verse[2], by_verse[3], by_verse[4]]
+    assert [r.target_ref for r in rest[-2][1].relations] == ["MAT.28.2"]
+
+@pytest.mark.parametrize("translation, primary_version", [("en", "N1904_EN"), ("ar", "NAV")])
+def test_crossrefs_per_verse_with_display_book_names(normalizer, tmp_path, translation, primary_version):
+    import json
+    from references_db import ReferenceDatabase
+    with open(tmp_path / "references_nt_mine.json", "w") as f:
+        json.dump({"cross_references": [
+            {"source": "MRK.1.2", "relations": [{"target": "MAT.27.1", "type": "parallel"}]},
+        ]}, f)
+    adapter = make_adapter(normalizer, enumerable=True)
+    get_chapter = adapter.get_chapter.side_effect
+    def named_chapter(book, chapter, version):
+        # As TextFabricAdapter: these versions label verses with a book name ("Mark"), not a code
+        name = normalizer.code_to_n1904.get(book, book).replace("_", " ")
+        return [v.model_copy(update={"book_code": name}) for v in get_chapter(book, chapter, version)]
+    adapter.get_chapter.side_effect = named_chapter
+    service = BibleService(adapter=adapter)
+    service.ref_db = ReferenceDatabase(str(tmp_path), normalizer)
+
+    response = service.search("Mc 1:1-3", translations=[translation], show_crossrefs=True)
+    assert [item.primary.version for item in response.verses] == [primary_version] * 3
+    assert response.verses[0].primary.book_code == "Mark"
+    assert [[r.target_ref for r in item.cross_references.relations] if item.cross_references else None for item in response.verses] == [
+        None, ["MAT.27.1"], None
+    ]
+    pairs = list(service.iter_verses_with_crossrefs("Mc 1:1-3", translations=[translation]))
+    assert [refs.relations[0].target_ref if refs else None for _, refs in pairs] == [None, "MAT.27.1", None]
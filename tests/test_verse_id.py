@@ -0,0 +1,58 @@
+import pytest
+import os
+from unittest.mock import MagicMock
+from book_normalizer import BookNormalizer
+from verse_id import (
+    VerseRange, encode_verse_id, decode_verse_id, parse_verse_key, parse_target_range,
+    chapter_span, book_span, merge_ranges, format_verse_key
+)
+
+@pytest.fixture
+def normalizer():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return BookNormalizer(os.path.join(project_root, 'data'))
+
+def test_encode_decode_roundtrip():
+    verse_id = encode_verse_id(40, 16, 20)
+    assert decode_verse_id(verse_id) == (40, 16, 20)
+    # Canonical order is plain integer order
+    assert encode_verse_id(40, 16, 20) < encode_verse_id(40, 17, 1) < encode_verse_id(41, 1, 1)
+
+def test_verse_key_parsing(normalizer):
+    order = normalizer.book_order
+    start = parse_verse_key("MRK.7.3", order)
+    assert decode_verse_id(start) == (order["MRK"], 7, 3)
+    assert parse_verse_key("XXX.1.1", order) is None
+    assert parse_verse_key("MRK.7", order) is None
+    assert format_verse_key(start, normalizer.book_codes) == "MRK.7.3"
+
+def test_target_ranges(normalizer):
+    order = normalizer.book_order
+    start = parse_verse_key("MRK.7.3", order)
+    assert parse_target_range("MRK.7.3-4", order) == VerseRange(start, parse_verse_key("MRK.7.4", order))
+    assert parse_target_range("MRK.7.3-8.1", order).end == parse_verse_key("MRK.8.1", order)
+    assert parse_target_range("MRK.16.8-LUK.1.2", order).end == parse_verse_key("LUK.1.2", order)
+    assert parse_target_range("MRK.7.3", order).is_single
+    assert parse_target_range("MRK.7.3-MRK.7.1", order) is None
+
+def test_range_operations(normalizer):
+    mrk = normalizer.book_order["MRK"]
+    r = normalizer.parse_range("MRK.7.3-8.1")
+    assert normalizer.verse_id("MRK", 7, 30) in r
+    assert normalizer.verse_id("MRK", 8, 2) not in r
+    assert r.overlaps(chapter_span(mrk, 8))
+    assert not r.overlaps(chapter_span(mrk, 9))
+    assert normalizer.verse_id("MRK", 16, 20) in book_span(mrk)
+    assert normalizer.verse_id("LUK", 1, 1) not in book_span(mrk)
+    
+    a, b, c = (normalizer.parse_range(t) for t in ("MRK.1.1-5", "MRK.1.4-8", "MRK.2.1"))
+    assert merge_ranges([c, b, a]) == [VerseRange(a.start, b.end), c]
+
+def test_localize_ref_uses_verse_ids(normalizer):
+    from application.services import BibleService
+    adapter = MagicMock(normalizer=normalizer, data_dir="/tmp/mock_data")
+    service = BibleService(adapter)
+    assert service._localize_ref("MRK.7.3") == "Marc 7:3"
+    assert service._localize_ref("MRK.7.3-4") == "Marc 7:3-4"
+    assert service._localize_ref("MRK.7.3-8.1") == "Marc 7:3-8:1"
+    assert service._localize_ref("MRK.16.8-LUK.1.2") == "Marc 16:8-Luc 1:2"
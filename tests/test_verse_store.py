@@ -0,0 +1,129 @@
+import pytest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+from adapters.verse_store import write_verse_store, VerseStore, VerseStoreAdapter
+from domain.models import Language
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+ROWS = {
+    "TOB": [
+        ("GEN", 1, 2, "La terre était déserte et vide"),
+        ("GEN", 1, 1, "Au commencement, Dieu créa le ciel et la terre."),
+        ("GEN", 2, 1, "Le ciel, la terre et tous leurs éléments furent achevés."),
+        ("MRK", 1, 1, "Commencement de l'Évangile de Jésus Christ"),
+    ],
+    "NAV": [
+        ("1SA", 1, 1, "كَانَ رَجُلٌ"),
+    ],
+}
+
+@pytest.fixture
+def store_path():
+    dir_path = tempfile.mkdtemp()
+    path = os.path.join(dir_path, "verses.bin")
+    write_verse_store(path, ["GEN", "1SA", "MRK"], ROWS)
+    yield path
+    shutil.rmtree(dir_path)
+
+def test_store_roundtrip(store_path):
+    store = VerseStore(store_path)
+    try:
+        assert sorted(store.versions) == ["NAV", "TOB"]
+        assert store.get_text("TOB", "GEN", 1, 1) == "Au commencement, Dieu créa le ciel et la terre."
+        assert store.get_text("tob", "MRK", 1, 1).startswith("Commencement")
+        assert store.get_text("NAV", "1SA", 1, 1) == "كَانَ رَجُلٌ"
+        assert store.get_text("TOB", "GEN", 3, 1) is None
+        assert store.get_text("BJ", "GEN", 1, 1) is None
+        
+        # Chapter comes back in verse order, without spilling into the next chapter
+        assert [v for v, _ in store.get_chapter("TOB", "GEN", 1)] == [1, 2]
+    finally:
+        store.close()
+
+def test_store_rejects_other_files(store_path):
+    with open(store_path, "wb") as f:
+        f.write(b"not a store at all")
+    with pytest.raises(ValueError):
+        VerseStore(store_path)
+
+def test_adapter_serves_store_and_delegates(store_path):
+    fallback = MagicMock()
+    fallback.get_verse.return_value = "fallback verse"
+    adapter = VerseStoreAdapter(store_path, DATA_DIR, fallback_factory=lambda: fallback)
+    
+    verse = adapter.get_verse("GEN", 1, 1, version="tob")
+    assert verse.version == "TOB"
+    assert verse.language == Language.FRENCH
+    assert verse.text.startswith("Au commencement")
+    
+    # NAV keeps the TextFabricAdapter display name convention
+    assert adapter.get_verse("1SA", 1, 1, version="NAV").book_code == "1 Samuel"
+    assert [v.verse for v in adapter.get_chapter("GEN", 1, "TOB")] == [1, 2]
+    
+    # Versions not exported go to Text-Fabric, built only on demand
+    fallback.get_verse.assert_not_called()
+    assert adapter.get_verse("GEN", 1, 1, version="BHSA") == "fallback verse"
+    fallback.get_verse.assert_called_once_with("GEN", 1, 1, "BHSA")
+    
+    assert adapter.normalize_reference("Gn 1:1") == ("GEN", 1, 1)
+
+def test_adapter_dataset_states(store_path):
+    adapter = VerseStoreAdapter(store_path, DATA_DIR)
+    states = adapter.dataset_states()
+    # TOB and NAV are fully exported, the rest would need Text-Fabric
+    assert states["tob"].status.value == "ready"
+    assert states["nav"].status.value == "ready"
+    assert states["bhsa"].status.value == "not_loaded"
+
+def test_list_verses(store_path):
+    store = VerseStore(store_path)
+    try:
+        assert store.list_verses("TOB") == [("GEN", 1, 1), ("GEN", 1, 2), ("GEN", 2, 1), ("MRK", 1, 1)]
+        assert store.list_verses("BJ") == []
+    finally:
+        store.close()
+    
+    fallback = MagicMock()
+    fallback.list_verses.return_value = None
+    adapter = VerseStoreAdapter(store_path, DATA_DIR, fallback_factory=lambda: fallback)
+    assert adapter.list_verses("nav") == [("1SA", 1, 1)]
+    assert adapter.list_verses("BHSA") is None
+
+def test_missing_dataset_is_not_exported(store_path):
+    # What the export does for a dataset that is not installed
+    counts = write_verse_store(store_path, ["GEN", "1SA", "MRK"], dict(ROWS, BJ=iter([])))
+    assert counts["BJ"] == 0
+
+    fallback = MagicMock()
+    fallback.get_verse.return_value = "fallback verse"
+    fallback.dataset_states.return_value = {}
+    adapter = VerseStoreAdapter(store_path, DATA_DIR, fallback_factory=lambda: fallback)
+    assert not adapter.store.has_version("BJ")
+    assert adapter.get_verse("GEN", 1, 1, version="BJ") == "fallback verse"
+    assert adapter.dataset_states()["bj"].status.value == "not_loaded"
+
+def test_fallback_is_built_once_under_concurrency(store_path):
+    calls = []
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return MagicMock()
+    adapter = VerseStoreAdapter(store_path, DATA_DIR, fallback_factory=factory)
+
+    barrier = threading.Barrier(8)
+    results = []
+    def worker():
+        barrier.wait()
+        results.append(adapter.fallback)
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)